@@ -0,0 +1,65 @@
+import numpy as np
+import torch
+from SharedPolicy import SharedPolicy
+
+
+class BatchedPolicy(SharedPolicy):
+    """
+    Runs the actor of a MaskablePPO policy on whole batches of observations
+    (all elevators, optionally of many buildings) in one forward pass.
+    The policy is kept in eval mode, inference runs without autograd and
+    the input tensors are allocated once and reused.
+    predict() is a drop-in replacement for MaskablePPO.predict.
+    """
+
+    def __init__(self, model, env=None, max_batch=64):
+        super().__init__(env)
+        self.policy = model.policy
+        self.policy.set_training_mode(False)
+        self.obs_size = int(np.prod(model.observation_space.shape))
+        self.action_dims = [int(n) for n in model.action_space.nvec]
+        self._obs = None
+        self._masks = None
+        self._allocate(max_batch)
+        # Same constant as MaskableCategorical.apply_masking
+        self._huge_neg = torch.tensor(-1e8, dtype=torch.float32)
+
+    def _allocate(self, batch_size):
+        self._obs = torch.zeros((batch_size, self.obs_size), dtype=torch.float32)
+        self._masks = torch.ones((batch_size, sum(self.action_dims)), dtype=torch.bool)
+
+    def predict(self, observation, action_masks=None, deterministic=True, **kwargs):
+        """
+        observation: (n, obs_size), action_masks: (n, sum(action_dims)) or None.
+        Returns (actions of shape (n, len(action_dims)), None) like MaskablePPO.predict.
+        """
+        observation = np.asarray(observation).reshape(-1, self.obs_size)
+        n = len(observation)
+        if n > len(self._obs):
+            self._allocate(2 * n)
+        obs = self._obs[:n]
+        masks = self._masks[:n]
+        obs.copy_(torch.from_numpy(observation))
+        if action_masks is None:
+            masks.fill_(True)
+        else:
+            masks.copy_(torch.from_numpy(np.asarray(action_masks).reshape(n, -1)))
+
+        with torch.no_grad():
+            features = self.policy.extract_features(obs)
+            if isinstance(features, tuple):
+                features = features[0]
+            logits = self.policy.action_net(
+                self.policy.mlp_extractor.forward_actor(features)
+            )
+            logits = torch.where(masks, logits, self._huge_neg)
+            actions = []
+            for chunk in torch.split(logits, self.action_dims, dim=1):
+                # Categorical normalises the logits, mode is the argmax of probs
+                chunk = chunk - chunk.logsumexp(dim=-1, keepdim=True)
+                probs = torch.softmax(chunk, dim=-1)
+                if deterministic:
+                    actions.append(probs.argmax(dim=1))
+                else:
+                    actions.append(torch.multinomial(probs, 1)[:, 0])
+        return torch.stack(actions, dim=1).numpy(), None
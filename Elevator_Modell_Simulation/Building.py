@@ -4,9 +4,23 @@ import pygame
 import numpy as np
 from Elevator import Elevator
 from Guest import Guest
-import keyboard
+from GuestScheduler import GuestScheduler
+from GuestRegistry import GuestRegistry, WAITING, IN_ELEVATOR, ON_FLOOR
+from ArrivalTrace import open_trace
+from RandomStreams import RandomStreams
+from TripLog import TripLog
+from TripStats import TripStats
 import time
 
+# The observation layout the policies were trained with: the elevator itself,
+# zero-padded slots up to OBS_ELEVATORS (floor, passengers, destination
+# histogram each), then the waiting guests per floor
+OBS_ELEVATORS = 3
+OBS_FLOORS = 10
+ELEVATOR_OBS = 2 + OBS_FLOORS
+WAITING_OBS = OBS_ELEVATORS * ELEVATOR_OBS
+OBS_SIZE = WAITING_OBS + OBS_FLOORS
+
 
 class Building:
 
@@ -30,16 +44,22 @@ class Building:
         no_floor_zero=False,
         spawn_intervall=120,
         modell=None,
+        verbose=True,
+        shared_policy=False,
+        seed=None,
+        trace=None,
+        profile=None,
     ):
         # 1) Normal SimPy environment, not real-time
         self.env = env or simpy.Environment()
         self.no_floor_zero = no_floor_zero
-        # 2) Pygame base config
+        # 2) Pygame base config (screen=None: headless, see evaluate.py)
         self.screen = screen
-        self.clock = pygame.time.Clock()
-        pygame.font.init()
-        self.font = pygame.font.SysFont(None, 24)
         self.model = modell
+        # Print every step and the episode summary
+        self.verbose = verbose
+        # modell is a SharedPolicy shared with other buildings of this env
+        self.shared_policy = shared_policy
         # 3) Parameters
         self.num_floors = num_floors
         self.num_elevators = num_elevators
@@ -55,20 +75,31 @@ class Building:
         self.max_guests = max_guests
         self.working_time = working_time
         self.guests_left_building = 0
+        # Random streams of this run (seed=None: fresh entropy)
+        self.random = RandomStreams(seed)
+        # Replay: guests come from an ArrivalTrace (or its path) instead
+        self.trace = open_trace(trace, num_floors, max_guests)
+        # Time-varying traffic: a TrafficProfile samples the whole day as a trace
+        if profile is not None:
+            if self.trace is not None:
+                raise ValueError("Pass either trace or profile")
+            self.trace = profile.sample(max_guests, num_floors, self.random)
         # 4) Helper structures
         self.floor_counts = [0] * num_floors
-        self.logs = []
+        self.logs = TripLog()
+        # Online wait/travel statistics, fed as guests board and arrive
+        self.trip_stats = TripStats()
         # 5) Geometry
         self.floor_height = building_height / num_floors
         self.building_x = waiting_area_width + 50
         self.building_y = 0
         self.shaft_start_x = self.building_x + 20
         self.waiting_area_x = 10
-        self.waiting_guests = []
-        self.guests_on_floors = []
+        # State of every guest (waiting, in_elevator, on_floor, left)
+        self.guest_registry = GuestRegistry(self.num_floors)
+        # Working-time expiry and floor changes of guests on floors
+        self.guest_scheduler = GuestScheduler(self.num_floors, self.random)
         self.allguests = []
-        self.left_guests = []
-        self.guests_in_elevator = []
         self.episode_steps = 0
         self._next_guest_id = 0
         self.guests_in_building = 0
@@ -76,7 +107,7 @@ class Building:
         self.lam = self.max_guests / self.spawn_intervall
         self.mean_inter = 1 / self.lam
         self._time_since_last_spawn = 0.0
-        self.time_until_next_arrival = np.random.exponential(self.mean_inter)
+        self.time_until_next_arrival = self._next_interarrival()
         self.sim_step_size = 1
         # 6) Colors
         default_colors = {
@@ -110,7 +141,16 @@ class Building:
         # 9) Start processes
         self.env.process(self.step())
 
-        # 10) Load graphics
+        # 10) Graphics & buttons, only with a window
+        self.visualize_every = visualize_every
+        if self.screen is not None:
+            self._setup_graphics()
+
+    def _setup_graphics(self):
+        shaft_width = self.shaft_width
+        self.clock = pygame.time.Clock()
+        pygame.font.init()
+        self.font = pygame.font.SysFont(None, 24)
         self.elevator_img = pygame.transform.scale(
             pygame.image.load("elevator.bmp").convert(),
             (shaft_width, self.floor_height),
@@ -124,9 +164,6 @@ class Building:
             pygame.image.load("stick_1.bmp").convert_alpha(),
             (self.GUEST_SIZE, self.GUEST_SIZE),
         )
-
-        # 11) Visualization interval & buttons
-        self.visualize_every = visualize_every
         self._setup_buttons()
 
     def _setup_buttons(self):
@@ -139,15 +176,9 @@ class Building:
 
     def log(self, time, guest_id, mode, wait_time, travel_time):
         """Writes a log entry."""
-        self.logs.append(
-            {
-                "time": time,
-                "guest_id": guest_id,
-                "mode": mode,  # 'elevator_waiting', 'elevator_drive' or 'stairs'
-                "wait_time": wait_time,  # None if not relevant
-                "travel_time": travel_time,  # None if not relevant
-            }
-        )
+        # mode: 'elevator_waiting', 'elevator_drive' or 'stairs'
+        # wait_time / travel_time: None if not relevant
+        self.logs.append(time, guest_id, mode, wait_time, travel_time)
 
     def _spawn_guest(self, direction="up", floor=None):
         if (self._next_guest_id) >= self.max_guests:
@@ -160,7 +191,15 @@ class Building:
         if direction == "up":
             possible_targets = [f for f in range(0, self.num_floors)]
 
-        target_floor = np.random.choice(possible_targets)
+        plan = None
+        if self.trace is not None:
+            plan = self.trace.guest(self._next_guest_id)
+            start_floor = plan.start_floor
+            target_floor = plan.target
+        else:
+            target_floor = possible_targets[
+                self.random.destination(len(possible_targets))
+            ]
         guest = Guest(
             self,
             guest_id=self._next_guest_id,
@@ -169,17 +208,28 @@ class Building:
             current_floor=start_floor,
             waiting_since=self.episode_steps,
             entered_elevator_step=None,
+            plan=plan,
         )
         self._next_guest_id += 1
         self.guests_in_building += 1
         self.allguests.append(guest)
-        if target_floor == 0:
-            self.guests_on_floors.append(guest)
+        if target_floor == start_floor:
             guest.state = "on_floor"
-            guest.current_floor = 0
+            self.add_guest_on_floor(guest)
             return
 
-        self.waiting_guests.append(guest)
+        self.guest_registry.add(guest, WAITING)
+
+    def _next_interarrival(self):
+        """Time until the next guest arrives: from the trace or drawn."""
+        if self.trace is not None:
+            return self.trace.interarrival(self._next_guest_id)
+        return self.random.interarrival(self.mean_inter)
+
+    def add_guest_on_floor(self, guest):
+        """Registers a guest who starts working on its floor and schedules it."""
+        self.guest_registry.add(guest, ON_FLOOR)
+        self.guest_scheduler.add(guest, self.episode_steps)
 
     def draw(self):
         # 1) Background
@@ -380,28 +430,18 @@ class Building:
 
         return mask
 
-    def _get_obs(self, elevator):
-        obs = []
-        obs.append(elevator.current_floor)
-        obs.append(len(elevator.passengers))
-        passenger_dest_hist = [0] * 10
-        for p in elevator.passengers:
-            passenger_dest_hist[p.target_floor] += 1
-        obs.extend(passenger_dest_hist)
-
-        # Fill missing elevators with zeros
-        for _ in range(2):
-            obs.append(0)  # current_floor
-            obs.append(0)  # len(passengers)
-            obs.extend([0] * 10)  # target histogram
-
+    def _get_obs_batch(self):
+        """Observations of all elevators as one (num_elevators, OBS_SIZE) array."""
+        obs = np.zeros((len(self.elevators), OBS_SIZE), dtype=np.int32)
         # Waiting guests per floor (all elevators)
-        waiting_per_floor = [0] * 10
-        for g in self.waiting_guests:
-            waiting_per_floor[g.current_floor] += 1
-        obs.extend(waiting_per_floor)
-
-        return np.array(obs, dtype=np.int32)
+        for floor in range(self.num_floors):
+            obs[:, WAITING_OBS + floor] = len(self.guest_registry.waiting_at(floor))
+        for i, elevator in enumerate(self.elevators):
+            obs[i, 0] = elevator.current_floor
+            obs[i, 1] = len(elevator.passengers)
+            for p in elevator.passengers:
+                obs[i, 2 + p.target_floor] += 1
+        return obs
 
     def get_action_mask(self):
         # self.elevators: list of Elevator objects
@@ -417,17 +457,23 @@ class Building:
     def step(self):
         while True:
             if len(self.allguests) == self.max_guests == self.guests_left_building:
-                print("Step: ", self.episode_steps)
-                print("Guests_left_building: ", self.guests_left_building)
-                print("Guests_in_building: ", self.guests_in_building)
-                print("Total_reward: ", self.total_reward)
+                if self.verbose:
+                    print("Step: ", self.episode_steps)
+                    print("Guests_left_building: ", self.guests_left_building)
+                    print("Guests_in_building: ", self.guests_in_building)
+                    print("Total_reward: ", self.total_reward)
                 self.stop_event.succeed()
                 break
             reward = 0
             self.episode_steps += 1
-            print(self.episode_steps)
-            for guest in self.guests_on_floors:
-                guest.step(1, False)
+            if self.verbose:
+                print(self.episode_steps)
+            # Only guests whose working time ends or who change floor now
+            for guest, change_floor in self.guest_scheduler.pop_due(self.episode_steps):
+                if change_floor:
+                    guest.change_floor()
+                else:
+                    guest.reset_for_new_trip(direction="down")
 
             # === POISSON GUEST SPAWN ===
             self._time_since_last_spawn += self.sim_step_size
@@ -437,15 +483,17 @@ class Building:
             ):
                 self._spawn_guest(direction="up")
                 self._time_since_last_spawn -= self.time_until_next_arrival
-                self.time_until_next_arrival = np.random.exponential(self.mean_inter)
-            action_maskss = self.get_action_mask()
-            actions = []
-            for i in range(3):
-                obs = self._get_obs(self.elevators[i])
-                action, _ = self.model.predict(
-                    obs, action_masks=action_maskss[i], deterministic=True
+                self.time_until_next_arrival = self._next_interarrival()
+            # One forward pass for all elevators, each seen as a single-elevator building
+            action_masks = self.get_action_mask()
+            if self.shared_policy:
+                # ... and together with the other buildings (see BatchedPolicy)
+                actions = yield self.model.request(self._get_obs_batch(), action_masks)
+            else:
+                actions, _ = self.model.predict(
+                    self._get_obs_batch(), action_masks=action_masks, deterministic=True
                 )
-                actions.append(action)
+            actions = actions[:, 0]
 
             for i, action in enumerate(actions):
                 self.elevators[i].do_action(action)
@@ -461,7 +509,6 @@ class Building:
                                 waited_steps = int(
                                     (self.episode_steps - g.entered_elevator_step) / 60
                                 )
-                                self.guests_in_elevator.remove(g)
                                 h = 20 - waited_steps
                                 reward += max(1, h)
 
@@ -470,12 +517,11 @@ class Building:
                 if elev.busy_time <= 0 and elev.pending_action is not None:
                     if elev.pending_action[0] == "open":
                         boarded_guests = elev.board_guests(
-                            self.waiting_guests,
+                            self.guest_registry.waiting_at(elev.current_floor),
                         )
                         if boarded_guests:
                             for g in boarded_guests:
-                                self.waiting_guests.remove(g)
-                                self.guests_in_elevator.append(g)
+                                self.guest_registry.add(g, IN_ELEVATOR)
                                 waited_steps = int(
                                     (self.episode_steps - g.waiting_since) / 60
                                 )
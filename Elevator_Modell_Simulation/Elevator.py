@@ -1,3 +1,7 @@
+from itertools import islice
+from GuestRegistry import LEFT
+
+
 class Elevator:
     def __init__(
         self,
@@ -31,11 +35,7 @@ class Elevator:
         num_leaving = sum(
             1 for p in self.passengers if p.target_floor == self.current_floor
         )
-        waiting_here = [
-            g
-            for g in self.multielevator.waiting_guests
-            if g.current_floor == self.current_floor
-        ]
+        waiting_here = self.multielevator.guest_registry.waiting_at(self.current_floor)
         num_boarding_possible = max(
             0, self.capacity - (len(self.passengers) - num_leaving)
         )
@@ -83,17 +83,15 @@ class Elevator:
         elif typ == "close":
             self.door_open = False
 
-    def board_guests(self, waiting_guests):
+    def board_guests(self, waiting_here):
         """
-        Boards guests at the current floor.
+        Boards guests waiting at the current floor (longest waiting first).
         Returns the list of guests who entered.
         """
         boarded = []
         if self.door_open:
             free_spots = self.capacity - len(self.passengers)
-            to_board = [
-                g for g in waiting_guests if g.current_floor == self.current_floor
-            ][:free_spots]
+            to_board = list(islice(waiting_here, max(free_spots, 0)))
             for guest in to_board:
                 guest.state = "in_elevator"
                 self.passengers.append(guest)
@@ -108,6 +106,7 @@ class Elevator:
                     wait_time=wt,
                     travel_time=None,
                 )
+                self.multielevator.trip_stats.add_wait(start_waiting, wt)
                 guest.entered_elevator_step = self.multielevator.episode_steps
         return boarded
 
@@ -131,17 +130,18 @@ class Elevator:
                     wait_time=wt,
                     travel_time=travel_time,
                 )
+                self.multielevator.trip_stats.add_ride(g.waiting_since, wt, travel_time)
                 leaving.append(g)
                 if g.working_time_left > 0:
                     elevator_time = self.multielevator.episode_steps - g.waiting_since
                     g.working_time_left -= elevator_time
-                    self.multielevator.guests_on_floors.append(g)
+                    self.multielevator.add_guest_on_floor(g)
                 else:
                     g.state = "left"
                     self.multielevator.guests_left_building += 1
                     self.multielevator.guests_in_building -= 1
                     g.left_building = True
-                    self.multielevator.left_guests.append(g)
+                    self.multielevator.guest_registry.add(g, LEFT)
             else:
                 remaining.append(g)
         self.passengers = remaining
@@ -0,0 +1,63 @@
+WAITING = "waiting"
+IN_ELEVATOR = "in_elevator"
+ON_FLOOR = "on_floor"
+LEFT = "left"
+STATES = (WAITING, IN_ELEVATOR, ON_FLOOR, LEFT)
+
+
+class GuestRegistry:
+    """
+    Which guest is in which state, keyed by guest id. Every state is an
+    insertion-ordered dict, so a transition is O(1) and iterating a state
+    gives its guests in the order they entered it, like the lists it
+    replaces (boarding takes the longest waiting guests first).
+    Waiting guests are also kept per floor.
+    """
+
+    def __init__(self, num_floors):
+        self.num_floors = num_floors
+        self.clear()
+
+    def clear(self):
+        self._states = {state: {} for state in STATES}
+        self._waiting_at = [{} for _ in range(self.num_floors)]
+        # guest id -> (state, floor it waits on or None)
+        self._where = {}
+
+    def __len__(self):
+        return len(self._where)
+
+    def add(self, guest, state):
+        """Moves guest to state, out of the state it was in (if any)."""
+        self.remove(guest)
+        self._states[state][guest.id] = guest
+        floor = None
+        if state == WAITING:
+            floor = guest.current_floor
+            self._waiting_at[floor][guest.id] = guest
+        self._where[guest.id] = (state, floor)
+
+    def remove(self, guest):
+        where = self._where.pop(guest.id, None)
+        if where is None:
+            return
+        state, floor = where
+        del self._states[state][guest.id]
+        if floor is not None:
+            del self._waiting_at[floor][guest.id]
+
+    def state_of(self, guest):
+        where = self._where.get(guest.id)
+        return where[0] if where else None
+
+    def guests(self, state):
+        """Live view of the guests in state, in the order they entered it."""
+        return self._states[state].values()
+
+    def count(self, *states):
+        """Number of guests in any of states."""
+        return sum(len(self._states[state]) for state in states)
+
+    def waiting_at(self, floor):
+        """Live view of the guests waiting on floor, longest waiting first."""
+        return self._waiting_at[floor].values()
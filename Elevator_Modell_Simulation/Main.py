@@ -5,6 +5,7 @@ from Building import Building
 import tkinter as tk
 from tkinter import ttk, messagebox
 from Visualization import (
+    EpisodeAnalytics,
     plot_travel_times_per_hour,
     plot_wait_times_per_hour,
     plot_total_travel_times_per_hour,
@@ -12,7 +13,7 @@ from Visualization import (
     plot_average_total_time_per_hour,
     append_episode_stats,
 )
-from sb3_contrib import MaskablePPO
+from NumpyPolicy import NumpyPolicy
 
 
 def get_simulation_params(param_defs):
@@ -85,7 +86,8 @@ def main():
 
     # 2) Create SimPy environment
     env = simpy.Environment()
-    model = MaskablePPO.load("modell/ppo_elevator_episode_1318.zip")
+    # Exported actor weights (export_policy.py), no torch needed
+    model = NumpyPolicy("modell/ppo_elevator_episode_1318.npz")
     # 3) Create Building instance with popup parameters
     building = Building(
         screen=screen,
@@ -113,12 +115,13 @@ def main():
 
     # Visualization
     ep = 11
-    plot_wait_times_per_hour(building.logs, ep)
-    plot_travel_times_per_hour(building.logs, ep)
-    plot_total_travel_times_per_hour(building.logs, ep)
-    plot_guest_counts_per_hour(building.logs, ep)
-    plot_average_total_time_per_hour(building.logs, ep)
-    append_episode_stats(building.logs, ep)
+    analytics = EpisodeAnalytics(building.logs)
+    plot_wait_times_per_hour(analytics, ep)
+    plot_travel_times_per_hour(analytics, ep)
+    plot_total_travel_times_per_hour(analytics, ep)
+    plot_guest_counts_per_hour(analytics, ep)
+    plot_average_total_time_per_hour(analytics, ep)
+    append_episode_stats(analytics, ep)
     # 5) Cleanup
     pygame.quit()
     sys.exit()
@@ -0,0 +1,56 @@
+import numpy as np
+from SharedPolicy import SharedPolicy
+
+ACTIVATIONS = {
+    "tanh": np.tanh,
+    "relu": lambda x: np.maximum(x, 0),
+}
+
+
+class NumpyPolicy(SharedPolicy):
+    """
+    Actor of an exported MaskablePPO MlpPolicy (see export_policy.py),
+    evaluated with NumPy only. Works in float32 like torch, masks with the
+    same -1e8 constant and takes the argmax of the normalised probabilities,
+    so predict() gives the same actions as MaskablePPO.predict.
+    """
+
+    def __init__(self, path, env=None):
+        super().__init__(env)
+        with np.load(path) as data:
+            layers = int(data["num_layers"])
+            self.weights = [data[f"pi_w{i}"] for i in range(layers)]
+            self.biases = [data[f"pi_b{i}"] for i in range(layers)]
+            self.action_w = data["action_w"]
+            self.action_b = data["action_b"]
+            self.activation = ACTIVATIONS[str(data["activation"])]
+            self.action_dims = [int(n) for n in data["action_dims"]]
+            self.obs_size = int(data["obs_size"])
+        self._splits = np.cumsum(self.action_dims)[:-1]
+
+    def predict(self, observation, action_masks=None, deterministic=True, **kwargs):
+        """
+        observation: (n, obs_size), action_masks: (n, sum(action_dims)) or None.
+        Returns (actions of shape (n, len(action_dims)), None) like MaskablePPO.predict.
+        """
+        x = np.asarray(observation, dtype=np.float32).reshape(-1, self.obs_size)
+        for w, b in zip(self.weights, self.biases):
+            x = self.activation(x @ w + b)
+        logits = x @ self.action_w + self.action_b
+        if action_masks is not None:
+            masks = np.asarray(action_masks, dtype=bool).reshape(len(x), -1)
+            logits = np.where(masks, logits, np.float32(-1e8))
+        actions = []
+        for chunk in np.split(logits, self._splits, axis=1):
+            # Same steps as Categorical(logits).probs, ties resolve identically
+            chunk = chunk - chunk.max(axis=1, keepdims=True)
+            chunk = chunk - np.log(np.exp(chunk).sum(axis=1, keepdims=True))
+            probs = np.exp(chunk)
+            probs /= probs.sum(axis=1, keepdims=True)
+            if deterministic:
+                actions.append(probs.argmax(axis=1))
+            else:
+                cumulative = probs.cumsum(axis=1)
+                draws = np.random.random((len(probs), 1)) * cumulative[:, -1:]
+                actions.append((cumulative < draws).sum(axis=1))
+        return np.stack(actions, axis=1), None
@@ -0,0 +1,44 @@
+from abc import ABC, abstractmethod
+import numpy as np
+
+
+class SharedPolicy(ABC):
+    """
+    Base class for policies with a batched predict(observation, action_masks).
+    request() lets several buildings in one SimPy environment share a
+    forward pass: all requests made at the same simulation time are answered
+    by one predict() call, after every process of that time step has asked.
+    """
+
+    def __init__(self, env=None):
+        self.env = env
+        # Requests collected for the next shared forward pass
+        self._pending = []
+        self._flush_scheduled = False
+
+    @abstractmethod
+    def predict(self, observation, action_masks=None, deterministic=True, **kwargs):
+        """(actions, None) for a batch of observations, like MaskablePPO.predict."""
+
+    def request(self, observation, action_masks):
+        """SimPy event that succeeds with the actions for this observation batch."""
+        event = self.env.event()
+        self._pending.append((np.asarray(observation), np.asarray(action_masks), event))
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            # Scheduled behind the processes already due at this time
+            self.env.timeout(0).callbacks.append(self._flush)
+        return event
+
+    def _flush(self, _):
+        pending, self._pending = self._pending, []
+        self._flush_scheduled = False
+        sizes = [len(obs) for obs, _, _ in pending]
+        actions, _ = self.predict(
+            np.concatenate([obs for obs, _, _ in pending]),
+            np.concatenate([masks.reshape(len(obs), -1) for obs, masks, _ in pending]),
+        )
+        for (_, _, event), part in zip(
+            pending, np.split(actions, np.cumsum(sizes)[:-1])
+        ):
+            event.succeed(part)
@@ -1,6 +1,75 @@
 import os
-import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
+from TripLog import TripLog, to_dataframe
+
+
+class EpisodeAnalytics:
+    """
+    Reads one episode log once and computes every hourly aggregate the plots
+    and append_episode_stats need in a single pass over the columns.
+    The plot functions accept either a log or an EpisodeAnalytics, so
+    building it once and passing it around avoids recomputing.
+    """
+
+    def __init__(self, logs):
+        if isinstance(logs, TripLog):
+            # Column views of the log, no DataFrame
+            columns = logs.columns()
+            waiting = logs.mode_mask("elevator_waiting")
+            drive = logs.mode_mask("elevator_drive")
+        else:
+            df = to_dataframe(logs)
+            columns = {
+                name: df[name].to_numpy(dtype=np.float64)
+                for name in ("time", "wait_time", "travel_time")
+            }
+            waiting = (df["mode"] == "elevator_waiting").to_numpy()
+            drive = (df["mode"] == "elevator_drive").to_numpy()
+        time = columns["time"]
+        wait_time = columns["wait_time"]
+        travel_time = columns["travel_time"]
+
+        # Waiting entries, grouped by the hour the wait started
+        wait = wait_time[waiting]
+        self.wait_per_hour = _hourly_means(_hours(time[waiting]), wait)
+
+        # Rides, grouped by the hour the wait started or the ride started
+        start = time[drive]
+        ride_wait = wait_time[drive]
+        travel = travel_time[drive]
+        total = ride_wait + travel
+        ride_hours = _hours(start + ride_wait)
+        self.travel_per_hour = _hourly_means(ride_hours, travel)
+        self.total_per_hour = _hourly_means(_hours(start), total)
+        self.total_per_ride_hour = _hourly_means(ride_hours, total)
+        self.guests_per_hour = (
+            self.total_per_ride_hour[0],
+            self.total_per_ride_hour[2],
+        )
+
+        # Episode totals and averages
+        self.trips = int(drive.sum())
+        self.avg_wait_time = wait.mean() if wait.size else 0
+        self.avg_travel_time = travel.mean() if travel.size else 0
+        self.avg_total_time = total.mean() if total.size else 0
+
+    @classmethod
+    def of(cls, logs):
+        """logs itself if it already is an EpisodeAnalytics, otherwise a new one."""
+        return logs if isinstance(logs, cls) else cls(logs)
+
+
+def _hours(times):
+    return (times // 3600).astype(np.int64)
+
+
+def _hourly_means(hours, values):
+    """(hours with entries, mean value per hour, entries per hour)"""
+    counts = np.bincount(hours)
+    sums = np.bincount(hours, weights=values)
+    present = np.flatnonzero(counts)
+    return present, sums[present] / counts[present], counts[present]
 
 
 def ensure_vis_dir():
@@ -13,13 +82,10 @@ def ensure_vis_dir():
 def plot_wait_times_per_hour(logs, episode, filename="wait_times_per_hour_bar.png"):
     vis_dir = ensure_vis_dir()
     filename = os.path.join(vis_dir, f"wait_times_per_hour_ep{episode}.png")
-    df = pd.DataFrame(logs)
-    df = df[df["mode"] == "elevator_waiting"].copy()
-    df["hour"] = (df["time"] // 3600).astype(int)
-    hourly = df.groupby("hour")["wait_time"].mean().reset_index()
-    hourly["wait_time"] = hourly["wait_time"].round().astype(int)
+    hours, wait_time, _ = EpisodeAnalytics.of(logs).wait_per_hour
+    wait_time = np.round(wait_time).astype(int)
     fig, ax = plt.subplots()
-    ax.bar(hourly["hour"], hourly["wait_time"])
+    ax.bar(hours, wait_time)
     ax.set_xlabel("Hour (since simulation start)")
     ax.set_ylabel("Average waiting time (seconds)")
     ax.set_title(f"Average waiting time per hour (Episode {episode})")
@@ -31,14 +97,10 @@ def plot_wait_times_per_hour(logs, episode, filename="wait_times_per_hour_bar.pn
 def plot_travel_times_per_hour(logs, episode, filename="travel_times_per_hour_bar.png"):
     vis_dir = ensure_vis_dir()
     filename = os.path.join(vis_dir, f"travel_times_per_hour_ep{episode}.png")
-    df = pd.DataFrame(logs)
-    df = df[df["mode"] == "elevator_drive"].copy()
-    df["start_travel_time"] = df["time"] + df["wait_time"]
-    df["hour"] = (df["start_travel_time"] // 3600).astype(int)
-    hourly = df.groupby("hour")["travel_time"].mean().reset_index()
-    hourly["travel_time"] = hourly["travel_time"].round().astype(int)
+    hours, travel_time, _ = EpisodeAnalytics.of(logs).travel_per_hour
+    travel_time = np.round(travel_time).astype(int)
     fig, ax = plt.subplots()
-    ax.bar(hourly["hour"], hourly["travel_time"])
+    ax.bar(hours, travel_time)
     ax.set_xlabel("Hour")
     ax.set_ylabel("Average travel time (seconds)")
     ax.set_title(f"Average travel time per hour (Episode {episode})")
@@ -52,15 +114,10 @@ def plot_total_travel_times_per_hour(
 ):
     vis_dir = ensure_vis_dir()
     filename = os.path.join(vis_dir, f"total_travel_times_per_hour_ep{episode}.png")
-    df = pd.DataFrame(logs)
-    df = df[df["mode"] == "elevator_drive"].copy()
-    df["total_time"] = df["wait_time"] + df["travel_time"]
-    df["start_travel_time"] = df["time"]
-    df["hour"] = (df["start_travel_time"] // 3600).astype(int)
-    hourly = df.groupby("hour")["total_time"].mean().reset_index()
-    hourly["total_time"] = hourly["total_time"].round().astype(int)
+    hours, total_time, _ = EpisodeAnalytics.of(logs).total_per_hour
+    total_time = np.round(total_time).astype(int)
     fig, ax = plt.subplots()
-    ax.bar(hourly["hour"], hourly["total_time"])
+    ax.bar(hours, total_time)
     ax.set_xlabel("Hour")
     ax.set_ylabel("Average total time (seconds)")
     ax.set_title(f"Average total time per hour (Episode {episode})")
@@ -72,13 +129,9 @@ def plot_total_travel_times_per_hour(
 def plot_guest_counts_per_hour(logs, episode, filename="guest_counts_per_hour.png"):
     vis_dir = ensure_vis_dir()
     filename = os.path.join(vis_dir, f"guest_counts_per_hour_ep{episode}.png")
-    df = pd.DataFrame(logs)
-    df = df[df["mode"] == "elevator_drive"].copy()
-    df["start_travel_time"] = df["time"] + df["wait_time"]
-    df["hour"] = (df["start_travel_time"] // 3600).astype(int)
-    hourly_counts = df.groupby("hour")["guest_id"].count()
+    hours, counts = EpisodeAnalytics.of(logs).guests_per_hour
     fig, ax = plt.subplots()
-    ax.plot(hourly_counts.index, hourly_counts.values, marker="o", label="Elevator")
+    ax.plot(hours, counts, marker="o", label="Elevator")
     ax.set_xlabel("Hour (since simulation start)")
     ax.set_ylabel("Number of guests")
     ax.set_title(f"Guests per hour (Episode {episode})")
@@ -93,17 +146,12 @@ def plot_average_total_time_per_hour(
 ):
     vis_dir = ensure_vis_dir()
     filename = os.path.join(vis_dir, f"avg_total_time_per_hour_ep{episode}.png")
-    df = pd.DataFrame(logs)
-    df = df[df["mode"] == "elevator_drive"].copy()
-    df["total_time"] = df["wait_time"] + df["travel_time"]
-    df["start_travel_time"] = df["time"] + df["wait_time"]
-    df["hour"] = (df["start_travel_time"] // 3600).astype(int)
-    hourly_avg = df.groupby("hour")["total_time"].mean().reset_index()
-    hourly_avg["total_time"] = hourly_avg["total_time"].round().astype(int)
+    hours, total_time, _ = EpisodeAnalytics.of(logs).total_per_ride_hour
+    total_time = np.round(total_time).astype(int)
     fig, ax = plt.subplots()
     ax.plot(
-        hourly_avg["hour"],
-        hourly_avg["total_time"],
+        hours,
+        total_time,
         marker="o",
         label="Ø total time (elevator)",
     )
@@ -116,10 +164,6 @@ def plot_average_total_time_per_hour(
     plt.close(fig)
 
 
-import os
-import pandas as pd
-
-
 def append_episode_stats(logs, episode):
     # Create directory (if you still want this)
     stats_dir = "EpisodeStats"
@@ -127,26 +171,12 @@ def append_episode_stats(logs, episode):
         os.makedirs(stats_dir)
     filename = os.path.join(stats_dir, "all_episode_stats.txt")
 
-    df = pd.DataFrame(logs)
-
-    # Waiting time: all with mode == elevator_waiting
-    wait_df = df[df["mode"] == "elevator_waiting"]
-    avg_wait_time = wait_df["wait_time"].mean() if not wait_df.empty else 0
-
-    # Travel time: all with mode == elevator_drive
-    drive_df = df[df["mode"] == "elevator_drive"]
-    avg_travel_time = drive_df["travel_time"].mean() if not drive_df.empty else 0
-
-    # Total time: all with mode == elevator_drive
-    if not drive_df.empty:
-        avg_total_time = (drive_df["wait_time"] + drive_df["travel_time"]).mean()
-    else:
-        avg_total_time = 0
+    analytics = EpisodeAnalytics.of(logs)
 
-    # Round values
-    avg_wait_time = round(avg_wait_time, 2)
-    avg_travel_time = round(avg_travel_time, 2)
-    avg_total_time = round(avg_total_time, 2)
+    # Round values for saving
+    avg_wait_time = round(float(analytics.avg_wait_time), 2)
+    avg_travel_time = round(float(analytics.avg_travel_time), 2)
+    avg_total_time = round(float(analytics.avg_total_time), 2)
 
     # Prepare line for this episode
     line = (
@@ -0,0 +1,174 @@
+import os
+import sys
+import argparse
+import pandas as pd
+import simpy
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from Building import Building
+from Visualization import EpisodeAnalytics
+
+DEFAULT_MODEL = "modell/ppo_elevator_episode_1318.zip"
+
+# Same defaults as the settings dialog in Main.py (simulation parameters only)
+DEFAULT_PARAMS = {
+    "num_floors": 10,
+    "num_elevators": 3,
+    "max_guests": 200,
+    "working_time": 480,
+    "spawn_intervall": 7200,
+}
+
+# A policy that never serves some guest would otherwise run forever
+DEFAULT_HORIZON = 24 * 3600
+
+
+def load_policy(model_path, env=None):
+    """
+    An .npz export (see export_policy.py) runs as NumpyPolicy without torch,
+    anything else is loaded as a MaskablePPO checkpoint.
+    """
+    if model_path.endswith(".npz"):
+        from NumpyPolicy import NumpyPolicy
+
+        return NumpyPolicy(model_path, env=env)
+
+    from sb3_contrib import MaskablePPO
+    from BatchedPolicy import BatchedPolicy
+
+    # Schedules are only needed for training and may not unpickle across versions
+    model = MaskablePPO.load(
+        model_path,
+        device="cpu",
+        custom_objects={"lr_schedule": 0.0, "clip_range": 0.0},
+    )
+    return BatchedPolicy(model, env=env)
+
+
+def run_episode(model, seed=None, horizon=DEFAULT_HORIZON, **params):
+    """
+    Runs one episode with the model at full speed, without pygame or prints.
+    Returns (building, finished): finished is False if the horizon was hit first.
+    """
+    return run_episodes(model, seed=seed, count=1, horizon=horizon, **params)[0]
+
+
+def run_episodes(policy, seed=None, count=1, horizon=DEFAULT_HORIZON, **params):
+    """
+    Runs count buildings side by side in one SimPy environment. With more
+    than one building, policy must be a SharedPolicy and every second all
+    buildings share one forward pass. Building i is seeded with seed + i,
+    so its episode is the same as a single run with that seed.
+    Returns a list of (building, finished).
+    """
+    params = {**DEFAULT_PARAMS, **params}
+    env = simpy.Environment()
+    if count > 1:
+        policy.env = env
+    buildings = [
+        Building(
+            screen=None,
+            env=env,
+            modell=policy,
+            verbose=False,
+            shared_policy=count > 1,
+            seed=None if seed is None else seed + i,
+            **params,
+        )
+        for i in range(count)
+    ]
+    all_done = env.all_of([building.stop_event for building in buildings])
+    env.run(until=env.any_of([all_done, env.timeout(horizon)]))
+    return [(building, building.stop_event.triggered) for building in buildings]
+
+
+def summarize(logs):
+    """
+    Trips and average waiting, ride and total time like
+    Visualization.append_episode_stats (logs: a log or an EpisodeAnalytics).
+    """
+    analytics = EpisodeAnalytics.of(logs)
+    return {
+        "trips": analytics.trips,
+        "avg_wait_time": float(analytics.avg_wait_time),
+        "avg_travel_time": float(analytics.avg_travel_time),
+        "avg_total_time": float(analytics.avg_total_time),
+    }
+
+
+def evaluate(
+    model_path=DEFAULT_MODEL,
+    episodes=10,
+    seed=0,
+    horizon=DEFAULT_HORIZON,
+    parallel=1,
+    **params,
+):
+    """
+    Loads a checkpoint or .npz export and runs `episodes` seeded episodes (seed, seed + 1, ...),
+    `parallel` of them at a time in one environment.
+    Returns one summary row per episode as a DataFrame.
+    """
+    policy = load_policy(model_path)
+    rows = []
+    for group_seed in range(seed, seed + episodes, parallel):
+        count = min(parallel, seed + episodes - group_seed)
+        results = run_episodes(
+            policy, seed=group_seed, count=count, horizon=horizon, **params
+        )
+        for i, (building, finished) in enumerate(results):
+            rows.append(
+                {
+                    "seed": group_seed + i,
+                    "finished": finished,
+                    "steps": building.episode_steps,
+                    "guests_left_building": building.guests_left_building,
+                    "total_reward": building.total_reward,
+                    **summarize(building.logs),
+                    "p95_wait_time": building.trip_stats.quantile("wait_time", 0.95),
+                    "p99_wait_time": building.trip_stats.quantile("wait_time", 0.99),
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Evaluates a MaskablePPO checkpoint or .npz export headless over seeded episodes."
+    )
+    parser.add_argument("model", nargs="?", default=DEFAULT_MODEL)
+    parser.add_argument("--episodes", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first episode")
+    parser.add_argument("--out", help="CSV file for the per-episode statistics")
+    parser.add_argument("--horizon", type=float, default=DEFAULT_HORIZON)
+    parser.add_argument(
+        "--parallel", type=int, default=1, help="buildings per forward pass"
+    )
+    for name, default in DEFAULT_PARAMS.items():
+        parser.add_argument(f"--{name}", type=type(default), default=default)
+    args = parser.parse_args(argv)
+
+    params = {name: getattr(args, name) for name in DEFAULT_PARAMS}
+    summary = evaluate(
+        args.model,
+        episodes=args.episodes,
+        seed=args.seed,
+        horizon=args.horizon,
+        parallel=args.parallel,
+        **params,
+    )
+    if args.out:
+        summary.to_csv(args.out, index=False)
+    print(summary.to_string(index=False))
+    stats = summary[["avg_wait_time", "avg_travel_time", "avg_total_time"]]
+    print()
+    print(pd.DataFrame({"mean": stats.mean(), "std": stats.std()}).round(2))
+    if not summary["finished"].all():
+        print(
+            f"{(~summary['finished']).sum()} episode(s) hit the horizon",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
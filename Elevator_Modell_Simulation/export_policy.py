@@ -0,0 +1,105 @@
+import sys
+import argparse
+import numpy as np
+
+
+def export_policy(model_path, out_path=None):
+    """
+    Writes the actor of a MaskablePPO MlpPolicy checkpoint to an .npz file
+    that NumpyPolicy can run without torch. Returns the output path.
+    """
+    import torch
+    from sb3_contrib import MaskablePPO
+
+    model = MaskablePPO.load(
+        model_path,
+        device="cpu",
+        custom_objects={"lr_schedule": 0.0, "clip_range": 0.0},
+    )
+    policy = model.policy
+    if type(policy.features_extractor).__name__ != "FlattenExtractor":
+        raise ValueError(
+            "Only MlpPolicy checkpoints (FlattenExtractor) can be exported"
+        )
+    if policy.normalize_images and len(model.observation_space.shape) > 1:
+        raise ValueError("Image observations are not supported")
+
+    arrays = {}
+    activation = None
+    layers = 0
+    for module in policy.mlp_extractor.policy_net:
+        if isinstance(module, torch.nn.Linear):
+            # Stored transposed so the forward pass is x @ w + b
+            arrays[f"pi_w{layers}"] = module.weight.detach().numpy().T.copy()
+            arrays[f"pi_b{layers}"] = module.bias.detach().numpy().copy()
+            layers += 1
+        else:
+            name = type(module).__name__.lower()
+            if activation not in (None, name):
+                raise ValueError("Mixed activation functions are not supported")
+            activation = name
+    arrays["action_w"] = policy.action_net.weight.detach().numpy().T.copy()
+    arrays["action_b"] = policy.action_net.bias.detach().numpy().copy()
+
+    out_path = out_path or model_path.rsplit(".", 1)[0] + ".npz"
+    np.savez(
+        out_path,
+        num_layers=layers,
+        activation=activation or "tanh",
+        action_dims=np.asarray(model.action_space.nvec, dtype=np.int64),
+        obs_size=int(np.prod(model.observation_space.shape)),
+        **arrays,
+    )
+    return out_path
+
+
+def check_export(model_path, npz_path, samples=10000, seed=0):
+    """
+    Compares NumpyPolicy with MaskablePPO.predict(deterministic=True) on random
+    observations and masks. Returns the number of differing actions.
+    """
+    from sb3_contrib import MaskablePPO
+    from NumpyPolicy import NumpyPolicy
+
+    model = MaskablePPO.load(
+        model_path,
+        device="cpu",
+        custom_objects={"lr_schedule": 0.0, "clip_range": 0.0},
+    )
+    policy = NumpyPolicy(npz_path)
+    rng = np.random.default_rng(seed)
+    space = model.observation_space
+    low = np.maximum(space.low, 0)
+    high = np.minimum(space.high, 20)
+    obs = rng.integers(low, high + 1, size=(samples,) + space.shape).astype(space.dtype)
+    masks = rng.random((samples, sum(policy.action_dims))) < 0.7
+    # Every sub-action keeps at least "wait" allowed, like the environment
+    for start in np.cumsum([0] + policy.action_dims[:-1]):
+        masks[:, start] = True
+    expected, _ = model.predict(obs, action_masks=masks, deterministic=True)
+    actions, _ = policy.predict(obs, masks)
+    return int((expected.reshape(actions.shape) != actions).sum())
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Exports a MaskablePPO checkpoint to a NumPy .npz policy."
+    )
+    parser.add_argument("model")
+    parser.add_argument("out", nargs="?", help="defaults to the model path with .npz")
+    parser.add_argument(
+        "--check", type=int, default=10000, help="random samples to compare, 0 skips"
+    )
+    args = parser.parse_args(argv)
+
+    out_path = export_policy(args.model, args.out)
+    print(f"Exported {args.model} -> {out_path}")
+    if args.check:
+        mismatches = check_export(args.model, out_path, samples=args.check)
+        print(f"{mismatches} of {args.check} sampled actions differ from MaskablePPO")
+        if mismatches:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
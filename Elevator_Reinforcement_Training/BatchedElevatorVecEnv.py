@@ -0,0 +1,172 @@
+import numpy as np
+from stable_baselines3.common.vec_env import VecEnv
+from gymnasium import spaces
+from MultiElevatorEnv import MultiElevatorEnv
+from VectorizedElevatorEnv import ElevatorCore
+
+# Attributes with one entry per building; all others are shared by every env
+PER_ENV_ATTRS = ("episodes_so_far", "last_logs", "last_trip_stats")
+
+
+class BatchedElevatorVecEnv(VecEnv):
+    """
+    Stable-Baselines3 VecEnv that simulates num_envs independent buildings
+    in one process. All buildings share one ElevatorCore, so a step is a
+    handful of array operations instead of num_envs env.step() calls
+    (and no pickling/pipes like SubprocVecEnv).
+    Behaves like SubprocVecEnv([ActionMasker(MultiElevatorEnv(...)), ...]),
+    including auto-reset and MaskablePPO action masks.
+
+    fast_forward: every building runs on until its next decision point like
+    MultiElevatorEnv(fast_forward=True); buildings that already reached one
+    stand still meanwhile. info["duration"] gives the seconds per env.
+    keep_direction: see MultiElevatorEnv.
+    """
+
+    def __init__(
+        self,
+        num_envs=12,
+        num_elevators=3,
+        num_floors=10,
+        max_passengers=5,
+        max_guests=200,
+        spawn_intervall=120 * 60,
+        working_time_mean=480 * 60,
+        working_time_std=50 * 60,
+        sim_step_size=1,
+        ride_time=4,
+        door_time=4,
+        episodes_so_far=0,
+        fast_forward=False,
+        keep_direction=False,
+        verbose=1,
+    ):
+        self.num_elevators = num_elevators
+        self.num_floors = num_floors
+        self.max_passengers = max_passengers
+        self.max_guests = max_guests
+        self.fast_forward = fast_forward
+        self.keep_direction = keep_direction
+        self.verbose = verbose
+        self.render_mode = None
+        self.core = ElevatorCore(
+            num_buildings=num_envs,
+            num_elevators=num_elevators,
+            num_floors=num_floors,
+            max_passengers=max_passengers,
+            max_guests=max_guests,
+            spawn_intervall=spawn_intervall,
+            sim_step_size=sim_step_size,
+            ride_time=ride_time,
+            door_time=door_time,
+        )
+        self.episodes_so_far = np.full(num_envs, episodes_so_far, dtype=np.int64)
+        self.last_logs = [None] * num_envs
+        self.last_trip_stats = [None] * num_envs
+        self._actions = None
+        super().__init__(
+            num_envs,
+            MultiElevatorEnv.build_obs_space(
+                self, num_elevators, num_floors, max_passengers, max_guests
+            ),
+            spaces.MultiDiscrete([3] * num_elevators),
+        )
+        self.reset()
+
+    def _reset_buildings(self, buildings, seeds=None):
+        for b in buildings:
+            if self.core.logs[b]:
+                self.last_logs[b] = self.core.logs[b].copy()
+                self.last_trip_stats[b] = self.core.trip_stats[b]
+        self.core.reset(buildings, seeds)
+        self.episodes_so_far[buildings] += 1
+
+    def reset(self):
+        self._reset_buildings(np.arange(self.num_envs), self._seeds)
+        self._reset_seeds()
+        self._reset_options()
+        masks = self.core.action_masks()
+        self.reset_infos = [
+            {"action_mask": masks[i].copy()} for i in range(self.num_envs)
+        ]
+        return self.core.observations().copy()
+
+    def step_async(self, actions):
+        self._actions = np.asarray(actions).reshape(self.num_envs, self.num_elevators)
+
+    def step_wait(self):
+        self.core.new_waiting[:] = 0
+        rewards, dones = self.core.step(self._actions)
+        # Same call as at the end of MultiElevatorEnv.step
+        masks = self.core.action_masks().copy()
+        durations = np.ones(self.num_envs, dtype=np.int64)
+        if self.fast_forward:
+            active = ~dones & ~self.core.needs_decision(self.keep_direction)
+            while active.any():
+                for b in np.flatnonzero(active):
+                    durations[b] += self.core.skip_idle_seconds(b)
+                r, d = self.core.step(
+                    self.core.fast_forward_actions(self.keep_direction), active
+                )
+                rewards += r
+                dones |= d
+                durations += active
+                # Only the first mask after its own step is the one it would see
+                masks[active] = self.core.action_masks()[active]
+                active &= ~d & ~self.core.needs_decision(self.keep_direction)
+        obs = self.core.observations().copy()
+        infos = [
+            {"action_mask": masks[i].copy(), "duration": int(durations[i])}
+            for i in range(self.num_envs)
+        ]
+        done_idx = np.flatnonzero(dones)
+        if done_idx.size:
+            for b in done_idx:
+                infos[b]["terminal_observation"] = obs[b].copy()
+                infos[b]["TimeLimit.truncated"] = False
+                if self.verbose > 0:
+                    print("Step: ", self.core.episode_steps[b])
+                    print("Guests_left_building: ", self.core.guests_left_building[b])
+                    print("Guests_in_building: ", self.core.guests_in_building[b])
+                    print("Total_reward: ", self.core.total_reward[b])
+            # Auto-reset like DummyVecEnv/SubprocVecEnv
+            self._reset_buildings(done_idx)
+            masks = self.core.action_masks()
+            obs[done_idx] = self.core.observations()[done_idx]
+            for b in done_idx:
+                infos[b]["action_mask"] = masks[b].copy()
+        return obs, rewards.astype(np.float32), dones.copy(), infos
+
+    def action_masks(self):
+        """
+        Flattened masks (num_envs, 3 * num_elevators) for MaskablePPO.
+        Recomputed like ActionMasker does with MultiElevatorEnv.get_action_mask.
+        """
+        return self.core.action_masks().reshape(self.num_envs, -1).copy()
+
+    def close(self):
+        pass
+
+    def get_attr(self, attr_name, indices=None):
+        value = getattr(self, attr_name)
+        if attr_name in PER_ENV_ATTRS:
+            return [value[i] for i in self._get_indices(indices)]
+        return [value for _ in self._get_indices(indices)]
+
+    def set_attr(self, attr_name, value, indices=None):
+        """Only PER_ENV_ATTRS can be set; the rest is shared by all buildings."""
+        if attr_name not in PER_ENV_ATTRS:
+            raise ValueError(
+                f"{attr_name} is shared by all envs and cannot be set per env"
+            )
+        per_env = getattr(self, attr_name)
+        for i in self._get_indices(indices):
+            per_env[i] = value
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        """Methods called this way compute all buildings at once and are split per env."""
+        results = getattr(self, method_name)(*method_args, **method_kwargs)
+        return [results[i] for i in self._get_indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._get_indices(indices)]
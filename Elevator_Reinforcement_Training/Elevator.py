@@ -1,3 +1,8 @@
+from itertools import islice
+import numpy as np
+from GuestRegistry import LEFT
+
+
 class Elevator:
     def __init__(
         self,
@@ -22,23 +27,20 @@ class Elevator:
         self.door_open = False
         self.busy_time = 0.0  # Time remaining until new action is possible
         self.pending_action = None  # To be picked up & processed by the environment
+        self.direction = 0  # Last move: 1 = up, -1 = down, 0 = waited since
         self.passengers = []  # List of Guest objects or dicts
+        # Number of passengers per target floor
+        self.dest_counts = np.zeros(max_floor + 1, dtype=np.int32)
 
     def _guests_waiting_or_leaving(self):
         """
         Returns True if guests can board or leave on this floor.
         """
-        # Count passengers who want to leave
-        num_leaving = sum(
-            1 for p in self.passengers if p.target_floor == self.current_floor
-        )
+        # Passengers who want to leave
+        num_leaving = self.dest_counts[self.current_floor]
 
-        # Count guests waiting to board
-        waiting_here = [
-            g
-            for g in self.multielevator.waiting_guests
-            if g.current_floor == self.current_floor
-        ]
+        # Guests waiting to board
+        waiting_here = self.multielevator.waiting_per_floor[self.current_floor]
         num_boarding_possible = max(
             0, self.capacity - (len(self.passengers) - num_leaving)
         )
@@ -48,7 +50,7 @@ class Elevator:
             return True
 
         # Are there guests who can board? (Only if seats are available!)
-        if waiting_here and num_boarding_possible > 0:
+        if waiting_here > 0 and num_boarding_possible > 0:
             return True
 
         return False
@@ -67,6 +69,7 @@ class Elevator:
 
         # Door is closed and elevator is ready for a new action
         if action == 0:  # wait (elevator stays on the floor)
+            self.direction = 0
             # Check if there are guests to board or leave
             if self._guests_waiting_or_leaving():
                 self.busy_time = self.door_time - 1
@@ -78,10 +81,24 @@ class Elevator:
             if self.current_floor < self.max_floor and not self.door_open:
                 self.busy_time = self.ride_time - 1
                 self.pending_action = ("move", 1)
+                self.direction = 1
         elif action == 2:  # down
             if self.current_floor > self.min_floor and not self.door_open:
                 self.busy_time = self.ride_time - 1
                 self.pending_action = ("move", -1)
+                self.direction = -1
+
+    def keeps_direction(self):
+        """
+        True if the elevator is free with closed doors, can go on in its last
+        direction and has no stop here (nobody boards or leaves), so fast
+        forward with keep_direction moves it on instead of asking for an action.
+        """
+        if self.busy_time > 0 or self.door_open or self.direction == 0:
+            return False
+        if not self.min_floor <= self.current_floor + self.direction <= self.max_floor:
+            return False
+        return not self._guests_waiting_or_leaving()
 
     def execute_pending_action(self):
         """Execute action after busy_time is over."""
@@ -95,21 +112,20 @@ class Elevator:
         elif typ == "close":
             self.door_open = False
 
-    def board_guests(self, waiting_guests):
+    def board_guests(self, waiting_here):
         """
-        Boards guests on the current floor.
+        Boards guests waiting on the current floor (longest waiting first).
         Returns: list of boarded guests.
         """
         boarded = []
         if self.door_open:
             free_seats = self.capacity - len(self.passengers)
             # Only allow as many to board as there are free seats
-            to_board = [
-                g for g in waiting_guests if g.current_floor == self.current_floor
-            ][:free_seats]
+            to_board = list(islice(waiting_here, max(free_seats, 0)))
             for guest in to_board:
                 guest.state = "in_elevator"
                 self.passengers.append(guest)
+                self.dest_counts[guest.target_floor] += 1
                 boarded.append(guest)
                 start_waiting = guest.waiting_since
                 end_waiting = self.multielevator.episode_steps
@@ -121,6 +137,7 @@ class Elevator:
                     wait_time=wt,
                     travel_time=None,
                 )
+                self.multielevator.trip_stats.add_wait(start_waiting, wt)
                 guest.entered_elevator_step = self.multielevator.episode_steps
         return boarded
 
@@ -133,6 +150,7 @@ class Elevator:
         remaining = []
         for g in self.passengers:
             if g.target_floor == self.current_floor:
+                self.dest_counts[g.target_floor] -= 1
                 g.state = "on_floor"
                 g.current_floor = g.target_floor
                 wt = g.entered_elevator_step - g.waiting_since
@@ -144,17 +162,18 @@ class Elevator:
                     wait_time=wt,
                     travel_time=travel_time,
                 )
+                self.multielevator.trip_stats.add_ride(g.waiting_since, wt, travel_time)
                 leaving.append(g)
                 if g.working_time_left > 0:
                     elevator_time = self.multielevator.episode_steps - g.waiting_since
                     g.working_time_left -= elevator_time
-                    self.multielevator.guests_on_floors.append(g)
+                    self.multielevator.add_guest_on_floor(g)
                 else:
                     g.state = "left"
                     self.multielevator.guests_left_building += 1
                     self.multielevator.guests_in_building -= 1
                     g.left_building = True
-                    self.multielevator.left_guests.append(g)
+                    self.multielevator.guest_registry.add(g, LEFT)
             else:
                 remaining.append(g)
         self.passengers = remaining
@@ -1,10 +1,24 @@
-import numpy as np
-import random
 import math
+from GuestRegistry import LEFT
 
 
 class Guest:
     StdToleranceWorking = 50
+    # No per-instance __dict__: guests are created (or recycled) by the thousand
+    __slots__ = (
+        "id",
+        "waiting_since",
+        "multielevator",
+        "start_floor",
+        "target_floor",
+        "plan",
+        "working_time_left",
+        "current_floor",
+        "entered_elevator_step",
+        "state",
+        "elevator_id",
+        "left_building",
+    )
 
     def __init__(
         self,
@@ -15,17 +29,45 @@ class Guest:
         current_floor,
         waiting_since,
         entered_elevator_step,
+        plan=None,
     ):
+        self.setup(
+            multielevator,
+            guest_id,
+            start_floor,
+            target_floor,
+            current_floor,
+            waiting_since,
+            entered_elevator_step,
+            plan,
+        )
+
+    def setup(
+        self,
+        multielevator,
+        guest_id,
+        start_floor,
+        target_floor,
+        current_floor,
+        waiting_since,
+        entered_elevator_step,
+        plan=None,
+    ):
+        """(Re)initialises the guest, also used when a GuestPool hands it out again."""
         self.id = guest_id
         self.waiting_since = waiting_since
         self.multielevator = multielevator
         self.start_floor = start_floor
         self.target_floor = target_floor
-        self.working_time_left = random.randint(22800, 34700)
+        # GuestPlan of a replayed trace, None: random draws
+        self.plan = plan
+        if plan is not None:
+            self.working_time_left = plan.working_time
+        else:
+            self.working_time_left = multielevator.random.working_time()
         self.current_floor = current_floor
         self.entered_elevator_step = entered_elevator_step
         self.state = "waiting"  # waiting, in_elevator, on_floor, left, waiting_on_floor
-        self.current_floor = 0
 
         self.elevator_id = None
 
@@ -37,48 +79,55 @@ class Guest:
         if self.current_floor == 0:
             self.state = "left"
             self.left_building = True
-            self.multielevator.guests_on_floors.remove(self)
             self.multielevator.guests_left_building += 1
             self.multielevator.guests_in_building -= 1
-            self.multielevator.left_guests.append(self)
+            self.multielevator.guest_registry.add(self, LEFT)
             return
         self.target_floor = 0
         self.state = "waiting_on_floor"
         self.waiting_since = self.multielevator.episode_steps
         self.entered_elevator_step = None
-        self.multielevator.waiting_guests.append(self)
-        self.multielevator.guests_on_floors.remove(self)
-
-    def step(self, sim_step_size, force_return=False):
-        """
-        Executes a simulation step for this guest.
-        sim_step_size: size of one RL step (e.g., 0.01)
-        force_return: optionally forces guest to return to ground floor
-        """
-        # Guest is on the floor (working)
-        if self.state == "on_floor":
-            self.working_time_left -= sim_step_size
-            # Working time over or forced return
-            if self.working_time_left <= 0 or force_return:
-                self.reset_for_new_trip(direction="down")
-                return
+        self.multielevator.add_waiting_guest(self)
 
-            # 0.0555% chance to change floor
-            if (
-                not force_return
-                and self.multielevator.num_floors > 1
-                and random.random() < 0.000555
-            ):
-                possible = [
-                    i
-                    for i in range(self.multielevator.num_floors)
-                    if i != self.current_floor
+    def change_floor(self):
+        """Guest wants to go to another random floor."""
+        possible = [
+            i for i in range(self.multielevator.num_floors) if i != self.current_floor
+        ]
+        if possible:
+            if self.plan is not None:
+                self.target_floor = self.plan.floor_change_target()
+            else:
+                self.target_floor = possible[
+                    self.multielevator.random.floor_change_target(len(possible))
                 ]
-                if possible:
-                    self.target_floor = int(np.random.choice(possible))
-                    self.start_floor = self.current_floor
-                    self.state = "waiting_on_floor"
-                    self.waiting_since = self.multielevator.episode_steps
-                    self.entered_elevator_step = None
-                    self.multielevator.waiting_guests.append(self)
-                    self.multielevator.guests_on_floors.remove(self)
+            self.start_floor = self.current_floor
+            self.state = "waiting_on_floor"
+            self.waiting_since = self.multielevator.episode_steps
+            self.entered_elevator_step = None
+            self.multielevator.add_waiting_guest(self)
+
+
+class GuestPool:
+    """
+    Recycles Guest objects across episodes: reset() gives back the guests of
+    the last episode and get() hands them out again before allocating new
+    ones, so an env allocates at most max_guests guests over its lifetime.
+    """
+
+    def __init__(self):
+        self._free = []
+
+    def __len__(self):
+        return len(self._free)
+
+    def get(self, *args, **kwargs):
+        if self._free:
+            guest = self._free.pop()
+            guest.setup(*args, **kwargs)
+            return guest
+        return Guest(*args, **kwargs)
+
+    def release(self, guests):
+        """Takes back guests that are no longer referenced by the simulation."""
+        self._free.extend(guests)
@@ -0,0 +1,65 @@
+import heapq
+
+FLOOR_CHANGE_PROBABILITY = 0.000555
+
+
+class GuestScheduler:
+    """
+    Timer heap for guests working on a floor.
+    Guest.step() runs every second: working_time_left -= 1 and a
+    random.random() < 0.000555 draw for a floor change. Here each guest gets
+    one entry instead, at the step its working time runs out or, if earlier,
+    at a geometrically sampled floor change (same distribution).
+    Only guests whose entry is due are touched.
+    """
+
+    def __init__(
+        self, num_floors, random, floor_change_probability=FLOOR_CHANGE_PROBABILITY
+    ):
+        self.num_floors = num_floors
+        # RandomStreams of the simulation
+        self.random = random
+        self.floor_change_probability = floor_change_probability
+        self._heap = []
+        self._counter = 0
+
+    def __len__(self):
+        return len(self._heap)
+
+    def clear(self):
+        self._heap = []
+        self._counter = 0
+
+    def add(self, guest, now):
+        """Schedules a guest who starts working at step now."""
+        # Guest.step leaves on the first step where working_time_left <= 0
+        steps = max(guest.working_time_left, 1)
+        change = False
+        k = None
+        if guest.plan is not None:
+            # Replayed trace: the guest's next floor change
+            k = guest.plan.floor_change_after()
+        elif self.num_floors > 1:
+            # First success of the per-second draw, no draw on the leaving step
+            k = int(self.random.floor_change_after(self.floor_change_probability))
+        if k is not None and k < steps:
+            steps = k
+            change = True
+        # The counter keeps guests due at the same step in arrival order
+        heapq.heappush(self._heap, (now + steps, self._counter, steps, change, guest))
+        self._counter += 1
+
+    def next_due(self):
+        """Step of the next event, or None if nobody is working."""
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now):
+        """
+        Yields (guest, change_floor) for every guest due at step now.
+        working_time_left is updated as if Guest.step had run every second.
+        """
+        heap = self._heap
+        while heap and heap[0][0] <= now:
+            _, _, steps, change, guest = heapq.heappop(heap)
+            guest.working_time_left -= steps
+            yield guest, change
@@ -1,8 +1,16 @@
+import math
 import gymnasium as gym
 from gymnasium import spaces
 import numpy as np
-from Guest import Guest
+from Guest import GuestPool
 from Elevator import Elevator
+from GuestScheduler import GuestScheduler
+from GuestRegistry import GuestRegistry, WAITING, IN_ELEVATOR, ON_FLOOR
+from TripLog import TripLog
+from TripStats import TripStats
+from RandomStreams import RandomStreams
+from ArrivalTrace import open_trace
+from StepProfiler import StepProfiler
 from Visualization import (
     plot_wait_times_per_hour,
     plot_travel_times_per_hour,
@@ -11,6 +19,9 @@ from Visualization import (
     plot_average_total_time_per_hour,
 )
 
+# An episode ends after this many seconds even if guests are left
+MAX_EPISODE_STEPS = 45000
+
 
 class MultiElevatorEnv(gym.Env):
 
@@ -27,6 +38,12 @@ class MultiElevatorEnv(gym.Env):
         ride_time=4,
         door_time=4,
         episodes_so_far=0,
+        fast_forward=False,
+        keep_direction=False,
+        trace=None,
+        profile=None,
+        instrument=False,
+        instrument_dir=None,
     ):
         super().__init__()
         self.num_elevators = num_elevators
@@ -39,20 +56,49 @@ class MultiElevatorEnv(gym.Env):
         self.sim_step_size = sim_step_size
         self.ride_time = ride_time
         self.door_time = door_time
+        # Semi-MDP mode: step() runs on until the next decision point
+        self.fast_forward = fast_forward
+        # Opt-in on top of fast_forward: elevators pass floors without a stop
+        # in their last direction instead of asking (see needs_decision)
+        self.keep_direction = keep_direction
+        # Guests who started waiting during the current step()
+        self.new_waiting = 0
         self.action_space = spaces.MultiDiscrete([3] * self.num_elevators)
-        self.logs = []
+        self.logs = TripLog()
+        # Guests live as long as the env, reset() recycles them
+        self.guest_pool = GuestPool()
         self.allguests = []
-        self.left_guests = []
-        self.guests_in_elevator = []
+        # State of every guest (waiting, in_elevator, on_floor, left)
+        self.guest_registry = GuestRegistry(self.num_floors)
         self.last_logs = None
+        self.trip_stats = TripStats()
+        self.last_trip_stats = None
+        # RandomStreams, (re)created by reset(seed=...)
+        self.random = None
+        # Replay: every episode takes its guests from this ArrivalTrace (or path)
+        self.trace = open_trace(trace, num_floors, max_guests)
+        # Time-varying traffic: a new day of this TrafficProfile every episode
+        if profile is not None and self.trace is not None:
+            raise ValueError("Pass either trace or profile")
+        self.profile = profile
         self.total_reward = 0
         self.episodes_so_far = episodes_so_far
         # Low/High for each elevator
         self.observation_space = self.build_obs_space(
             self.num_elevators, self.num_floors, self.max_passengers, self.max_guests
         )
+        # Observation buffer: 12 entries per elevator (at least 3) + 10 floors
+        self._obs = np.zeros(max(3, self.num_elevators) * 12 + 10, dtype=np.int32)
+        # Per-phase timing of step() (and a cProfile dump per episode with
+        # instrument_dir); None: the plain methods run
+        self.profiler = None
 
         self.reset()
+        # Attached after the first reset, so that only episodes started by
+        # the caller's reset() are timed and dumped
+        if instrument or instrument_dir is not None:
+            self.profiler = StepProfiler(instrument_dir)
+            self.profiler.attach(self)
 
     def build_obs_space(self, num_elevators, num_floors, max_passengers, max_guests):
         # For each elevator:
@@ -75,15 +121,9 @@ class MultiElevatorEnv(gym.Env):
 
     def log(self, time, guest_id, mode, wait_time, travel_time):
         """Writes a log entry."""
-        self.logs.append(
-            {
-                "time": time,
-                "guest_id": guest_id,
-                "mode": mode,  # 'elevator_waiting', 'elevator_drive' or 'stairs'
-                "wait_time": wait_time,  # None if not relevant
-                "travel_time": travel_time,  # None if not relevant
-            }
-        )
+        # mode: 'elevator_waiting', 'elevator_drive' or 'stairs'
+        # wait_time / travel_time: None if not relevant
+        self.logs.append(time, guest_id, mode, wait_time, travel_time)
 
     def get_action_mask_for_elevator(self, elevator, min_floor=0, max_floor=9):
         mask = np.zeros(3, dtype=bool)
@@ -121,6 +161,16 @@ class MultiElevatorEnv(gym.Env):
         return np.array(masks, dtype=bool)
 
     def reset(self, seed=None, options=None):
+        super().reset(seed=seed)
+        if self.profiler is not None:
+            self.profiler.start_episode(self.episodes_so_far + 1)
+        # Without a seed the streams of the previous episode continue
+        if seed is not None or self.random is None:
+            self.random = RandomStreams(seed)
+        if self.profile is not None:
+            self.trace = self.profile.sample(
+                self.max_guests, self.num_floors, self.random
+            )
         self.elevators = []
         self._next_elevator_id = 0
         for _ in range(self.num_elevators):
@@ -129,34 +179,37 @@ class MultiElevatorEnv(gym.Env):
                 id=self._next_elevator_id,
                 min_floor=0,
                 max_floor=self.num_floors - 1,
-                capacity=5,
-                door_time=4,
-                ride_time=4,
-                sim_step_size=1,
+                capacity=self.max_passengers,
+                door_time=self.door_time,
+                ride_time=self.ride_time,
+                sim_step_size=self.sim_step_size,
             )
             self._next_elevator_id += 1
             self.elevators.append(elevator)
         self.guests_in_building = 0
         self.guests_left_building = 0
-        self.max_episode_steps = int(3000 / self.sim_step_size)
         self.episode_steps = 0
         if self.logs:
             self.last_logs = self.logs.copy()
-        self.logs = []
-        self.waiting_guests = []
-        self.guests_on_floors = []
+            self.last_trip_stats = self.trip_stats
+        self.logs.clear()
+        self.trip_stats = TripStats()
+        self.guest_pool.release(self.allguests)
+        self.allguests.clear()
+        self.guest_registry.clear()
+        # Live counters of waiting guests, maintained by add/remove_waiting_guest
+        self.waiting_per_floor = np.zeros(self.num_floors, dtype=np.int32)
+        # Working-time expiry and floor changes of guests on floors
+        self.guest_scheduler = GuestScheduler(self.num_floors, self.random)
         self._next_guest_id = 0
         self.episodes_so_far += 1
         # For Poisson spawning:
         self.lam = self.max_guests / self.spawn_intervall
         self.mean_inter = 1 / self.lam
         self._time_since_last_spawn = 0.0
-        self.time_until_next_arrival = np.random.exponential(self.mean_inter)
+        self.time_until_next_arrival = self._next_interarrival()
         obs = self._get_obs()
         info = {}
-        self.allguests = []
-        self.left_guests = []
-        self.guests_in_elevator = []
         info["action_mask"] = self.get_action_mask()
         self.total_reward = 0
         return obs, info
@@ -172,8 +225,16 @@ class MultiElevatorEnv(gym.Env):
         if direction == "up":
             possible_targets = [f for f in range(0, self.num_floors)]
 
-        target_floor = np.random.choice(possible_targets)
-        guest = Guest(
+        plan = None
+        if self.trace is not None:
+            plan = self.trace.guest(self._next_guest_id)
+            start_floor = plan.start_floor
+            target_floor = plan.target
+        else:
+            target_floor = possible_targets[
+                self.random.destination(len(possible_targets))
+            ]
+        guest = self.guest_pool.get(
             self,
             guest_id=self._next_guest_id,
             start_floor=start_floor,
@@ -181,24 +242,176 @@ class MultiElevatorEnv(gym.Env):
             current_floor=start_floor,
             waiting_since=self.episode_steps,
             entered_elevator_step=None,
+            plan=plan,
         )
         self._next_guest_id += 1
         self.guests_in_building += 1
         self.allguests.append(guest)
-        if target_floor == 0:
-            self.guests_on_floors.append(guest)
+        if target_floor == start_floor:
             guest.state = "on_floor"
-            guest.current_floor = 0
+            self.add_guest_on_floor(guest)
             return
 
-        self.waiting_guests.append(guest)
+        self.add_waiting_guest(guest)
+
+    def _next_interarrival(self):
+        """Time until the next guest arrives: from the trace or drawn."""
+        if self.trace is not None:
+            return self.trace.interarrival(self._next_guest_id)
+        return self.random.interarrival(self.mean_inter)
+
+    def add_guest_on_floor(self, guest):
+        """Registers a guest who starts working on its floor and schedules it."""
+        self.guest_registry.add(guest, ON_FLOOR)
+        self.guest_scheduler.add(guest, self.episode_steps)
+
+    def add_waiting_guest(self, guest):
+        """Registers a guest (target_floor already set) as waiting and counts it."""
+        self.guest_registry.add(guest, WAITING)
+        self.waiting_per_floor[guest.current_floor] += 1
+        self.new_waiting += 1
+
+    def remove_waiting_guest(self, guest):
+        """Takes a guest out of the waiting guests and the per-floor counter."""
+        self.guest_registry.remove(guest)
+        self.waiting_per_floor[guest.current_floor] -= 1
 
     def step(self, actions):
-        reward = 0
+        self.new_waiting = 0
+        reward, done = self._advance(actions)
+        info = {"action_mask": self.get_action_mask()}
+        # Seconds covered by this step (always 1 without fast_forward)
+        duration = 1
+        if self.fast_forward:
+            while not done and not self.needs_decision():
+                duration += self._skip_idle_seconds()
+                r, done = self._advance(self._fast_forward_actions())
+                reward += r
+                duration += 1
+                info["action_mask"] = self.get_action_mask()
+        info["duration"] = duration
+        truncated = False
+        if done:
+            """
+            plot_wait_times_per_hour(self.logs, episode=self.episodes_so_far + 1)
+            plot_travel_times_per_hour(self.logs, episode=self.episodes_so_far + 1)
+            plot_total_travel_times_per_hour(
+                self.logs, episode=self.episodes_so_far + 1
+            )
+            plot_guest_counts_per_hour(self.logs, episode=self.episodes_so_far + 1)
+            plot_average_total_time_per_hour(
+                self.logs, episode=self.episodes_so_far + 1
+            )
+            """
+            print("Step: ", self.episode_steps)
+            print("Guests_left_building: ", self.guests_left_building)
+            print("Guests_in_building: ", self.guests_in_building)
+            print("Total_reward: ", self.total_reward)
+            if self.profiler is not None:
+                info["timing"] = self.profiler.report()
+                self.profiler.end_episode()
+
+        return self._get_obs(), reward, done, truncated, info
+
+    def timing_report(self):
+        """
+        Nanoseconds and calls per phase of the current episode (see
+        StepProfiler.report), None without instrument=True.
+        """
+        if self.profiler is None:
+            return None
+        return self.profiler.report()
+
+    def needs_decision(self):
+        """
+        False while no action can change anything: every elevator is busy,
+        or nobody is waiting or riding (idle elevators just hold position).
+
+        With keep_direction, an elevator that is just passing a floor where
+        it has no stop (see Elevator.keeps_direction) or whose doors are
+        open (they close whatever the action) does not ask either, unless a
+        guest started waiting during this step.
+        """
+        if not self.guest_registry.count(WAITING, IN_ELEVATOR):
+            return False
+        if not self.keep_direction or self.new_waiting:
+            return any(elev.busy_time <= 0 for elev in self.elevators)
+        return any(
+            elev.busy_time <= 0 and not elev.door_open and not elev.keeps_direction()
+            for elev in self.elevators
+        )
+
+    def _fast_forward_actions(self):
+        """
+        Actions for the seconds step() runs on by itself: all elevators wait;
+        with keep_direction, those without a stop on their floor keep their
+        direction while anyone is waiting or riding.
+        """
+        if not self.keep_direction or not self.guest_registry.count(
+            WAITING, IN_ELEVATOR
+        ):
+            return [0] * self.num_elevators
+        return [
+            (1 if elev.direction > 0 else 2) if elev.keeps_direction() else 0
+            for elev in self.elevators
+        ]
+
+    def _skip_idle_seconds(self):
+        """
+        Jumps over the seconds before the next spawn or scheduled guest event
+        if nobody is waiting or riding and all elevators stand with closed
+        doors (nothing happens and the reward is 0). Returns the seconds skipped.
+        """
+        if self.guest_registry.count(WAITING, IN_ELEVATOR):
+            return 0
+        for elev in self.elevators:
+            if elev.busy_time > 0 or elev.door_open:
+                return 0
+        next_step = MAX_EPISODE_STEPS + 1
+        due = self.guest_scheduler.next_due()
+        if due is not None:
+            next_step = min(next_step, due)
+        if self.guests_in_building + self.guests_left_building < self.max_guests:
+            seconds = math.ceil(
+                (self.time_until_next_arrival - self._time_since_last_spawn)
+                / self.sim_step_size
+            )
+            next_step = min(next_step, self.episode_steps + seconds)
+        skip = next_step - self.episode_steps - 1
+        if skip <= 0:
+            return 0
+        self.episode_steps += skip
+        self._time_since_last_spawn += skip * self.sim_step_size
+        return skip
+
+    def _advance(self, actions):
+        """Simulates one second. Returns (reward, done)."""
         self.episode_steps += 1
-        for guest in self.guests_on_floors:
-            guest.step(1, False)
+        # Phases are methods so that StepProfiler can time them
+        self._step_guests()
+        self._spawn_guests()
+        self._apply_actions(actions)
+        reward = self._dropoff()
+        reward += self._board()
+        self._check_consistency()
+        done = (
+            self.guests_left_building >= self.max_guests
+            or self.episode_steps > MAX_EPISODE_STEPS
+        )
+        reward -= 0.1 * self.guest_registry.count(WAITING)
+        reward -= 0.05 * self.guest_registry.count(IN_ELEVATOR)
+        self.total_reward += reward
+        return reward, done
+
+    def _step_guests(self):
+        # Only guests whose working time ends or who change floor now
+        for guest, change_floor in self.guest_scheduler.pop_due(self.episode_steps):
+            if change_floor:
+                guest.change_floor()
+            else:
+                guest.reset_for_new_trip(direction="down")
 
+    def _spawn_guests(self):
         # === POISSON GUEST SPAWN ===
         self._time_since_last_spawn += self.sim_step_size
         while (
@@ -207,12 +420,15 @@ class MultiElevatorEnv(gym.Env):
         ):
             self._spawn_guest(direction="up")
             self._time_since_last_spawn -= self.time_until_next_arrival
-            self.time_until_next_arrival = np.random.exponential(self.mean_inter)
+            self.time_until_next_arrival = self._next_interarrival()
 
+    def _apply_actions(self, actions):
         for i, action in enumerate(actions):
             self.elevators[i].do_action(action)
 
-        # Finish actions + reward for dropoff
+    def _dropoff(self):
+        """Finishes pending actions; returns the reward for drop-offs."""
+        reward = 0
         for elev in self.elevators:
             if elev.busy_time <= 0 and elev.pending_action is not None:
                 elev.execute_pending_action()
@@ -223,83 +439,47 @@ class MultiElevatorEnv(gym.Env):
                             waited_steps = int(
                                 (self.episode_steps - g.entered_elevator_step) / 60
                             )
-                            self.guests_in_elevator.remove(g)
                             h = 20 - waited_steps
                             reward += max(1, h)
+        return reward
 
-        # Finish actions + reward for boarding + reward for dropoff
+    def _board(self):
+        """Boards guests at open doors; returns the reward for boarding."""
+        reward = 0
         for elev in self.elevators:
             if elev.busy_time <= 0 and elev.pending_action is not None:
                 if elev.pending_action[0] == "open":
                     boarded_guests = elev.board_guests(
-                        self.waiting_guests,
+                        self.guest_registry.waiting_at(elev.current_floor),
                     )
                     if boarded_guests:
                         for g in boarded_guests:
-                            self.waiting_guests.remove(g)
-                            self.guests_in_elevator.append(g)
+                            self.remove_waiting_guest(g)
+                            self.guest_registry.add(g, IN_ELEVATOR)
                             waited_steps = int(
                                 (self.episode_steps - g.waiting_since) / 60
                             )
                             h = 10 - waited_steps
                             reward += max(1, h)
+        return reward
 
-        if len(self.left_guests) + len(self.guests_in_elevator) + len(
-            self.guests_on_floors
-        ) + len(self.waiting_guests) != len(self.allguests):
+    def _check_consistency(self):
+        if len(self.guest_registry) != len(self.allguests):
             print("Something is wrong here")
-        done = (
-            self.guests_left_building >= self.max_guests or self.episode_steps > 45000
-        )
-        truncated = False
-        info = {}
-        reward -= 0.1 * len(self.waiting_guests)
-        reward -= 0.05 * len(self.guests_in_elevator)
-        self.total_reward += reward
-        info["action_mask"] = self.get_action_mask()
-        if done:
-            """
-            plot_wait_times_per_hour(self.logs, episode=self.episodes_so_far + 1)
-            plot_travel_times_per_hour(self.logs, episode=self.episodes_so_far + 1)
-            plot_total_travel_times_per_hour(
-                self.logs, episode=self.episodes_so_far + 1
-            )
-            plot_guest_counts_per_hour(self.logs, episode=self.episodes_so_far + 1)
-            plot_average_total_time_per_hour(
-                self.logs, episode=self.episodes_so_far + 1
-            )
-            """
-            print("Step: ", self.episode_steps)
-            print("Guests_left_building: ", self.guests_left_building)
-            print("Guests_in_building: ", self.guests_in_building)
-            print("Total_reward: ", self.total_reward)
-
-        return self._get_obs(), reward, done, truncated, info
 
     def _get_obs(self):
-        obs = []
-        num_elevators = 3  # Or use self.num_elevators
-        num_floors = 10  # Or use self.num_floors
-
-        # Go through all existing elevators
-        for elev in self.elevators:
-            obs.append(elev.current_floor)
-            obs.append(len(elev.passengers))
-            passenger_dest_hist = [0] * 10
-            for p in elev.passengers:
-                passenger_dest_hist[p.target_floor] += 1
-            obs.extend(passenger_dest_hist)
-
-        # Fill missing elevators with zeros
-        for _ in range(num_elevators - len(self.elevators)):
-            obs.append(0)  # current_floor
-            obs.append(0)  # len(passengers)
-            obs.extend([0] * 10)  # Target histogram
-
-        # Waiting guests per floor (all elevators)
-        waiting_per_floor = [0] * 10
-        for g in self.waiting_guests:
-            waiting_per_floor[g.current_floor] += 1
-        obs.extend(waiting_per_floor)
-
-        return np.array(obs, dtype=np.int32)
+        # Reads the live counters, no walk over guests or passengers
+        obs = self._obs
+        num_floors = min(self.num_floors, 10)
+        for i, elev in enumerate(self.elevators):
+            base = i * 12
+            obs[base] = elev.current_floor
+            obs[base + 1] = len(elev.passengers)
+            # Passengers target histogram
+            obs[base + 2 : base + 2 + num_floors] = elev.dest_counts[:num_floors]
+
+        # Missing elevators stay zero. Waiting guests per floor (all elevators)
+        base = len(obs) - 10
+        obs[base : base + num_floors] = self.waiting_per_floor[:num_floors]
+
+        return obs.copy()
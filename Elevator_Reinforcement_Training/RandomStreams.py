@@ -0,0 +1,55 @@
+import numpy as np
+
+# One generator per kind of random decision
+STREAMS = ("arrivals", "destinations", "working_times", "floor_changes", "dispatch")
+
+WORKING_TIME_RANGE = (22800, 34700)
+
+
+class RandomStreams:
+    """
+    Random numbers of one simulation run: a numpy Generator per kind of
+    decision, all derived from one seed (SeedSequence.spawn). Draws of one
+    kind never shift the others, so two strategies run with the same seed see
+    the same arrivals, and runs with different seeds are independent.
+    Integers come from one random() per value, so drawing them one by one or
+    as an array gives the same numbers (the array engine relies on this).
+    """
+
+    def __init__(self, seed=None):
+        self.seed = seed
+        children = np.random.SeedSequence(seed).spawn(len(STREAMS))
+        for name, child in zip(STREAMS, children):
+            setattr(self, name, np.random.default_rng(child))
+
+    def interarrival(self, mean, size=None):
+        """Exponential time until the next guest arrives."""
+        return self.arrivals.exponential(mean, size)
+
+    def destination(self, n, size=None):
+        """Index of the target floor of a new guest among n allowed floors."""
+        return _below(self.destinations, n, size)
+
+    def working_time(self, size=None):
+        """Working time of a new guest in seconds."""
+        low, high = WORKING_TIME_RANGE
+        return low + _below(self.working_times, high - low + 1, size)
+
+    def floor_change_after(self, probability, size=None):
+        """Seconds of work until the first floor change, geometric."""
+        return self.floor_changes.geometric(probability, size)
+
+    def floor_change_target(self, n, size=None):
+        """Index of the new floor among n possible floors."""
+        return _below(self.floor_changes, n, size)
+
+    def elevator(self, n):
+        """Elevator a call is assigned to."""
+        return _below(self.dispatch, n)
+
+
+def _below(rng, n, size=None):
+    """Uniform integer(s) in [0, n)."""
+    if size is None:
+        return int(rng.random() * n)
+    return (rng.random(size) * n).astype(np.int64)
@@ -0,0 +1,116 @@
+import os
+import time
+import cProfile
+
+# Method of MultiElevatorEnv -> phase it is timed as
+PHASES = {
+    "_step_guests": "guest_events",
+    "_spawn_guests": "spawn",
+    "_apply_actions": "actions",
+    "_dropoff": "dropoff",
+    "_board": "boarding",
+    "_check_consistency": "consistency_check",
+    "_skip_idle_seconds": "skip_idle",
+    "_get_obs": "observation",
+    "get_action_mask": "action_mask",
+    "step": "step",
+}
+
+
+class StepProfiler:
+    """
+    Per-phase timing of MultiElevatorEnv.step (MultiElevatorEnv(instrument=True)).
+    attach() replaces the phase methods of one env instance by wrappers that
+    add up nanoseconds and calls per phase; an env without a profiler runs
+    the plain methods, so it costs nothing when switched off. "step" is the
+    whole step including all other phases.
+
+    The counters cover one episode: every reset() of the env sets them to
+    zero (start_episode).
+
+    dump_dir: additionally runs cProfile over every episode (reset to done)
+    and writes it to dump_dir/episode_<n>.prof (pstats format, e.g. for
+    snakeviz or `python -m pstats`).
+    """
+
+    def __init__(self, dump_dir=None):
+        self.dump_dir = dump_dir
+        self.ns = dict.fromkeys(PHASES.values(), 0)
+        self.calls = dict.fromkeys(PHASES.values(), 0)
+        self._cprofile = None
+        self._episode = None
+
+    def attach(self, env):
+        for method, phase in PHASES.items():
+            setattr(env, method, self._timed(getattr(env, method), phase))
+
+    def _timed(self, method, phase):
+        ns, calls = self.ns, self.calls
+        clock = time.perf_counter_ns
+
+        def timed(*args, **kwargs):
+            start = clock()
+            result = method(*args, **kwargs)
+            ns[phase] += clock() - start
+            calls[phase] += 1
+            return result
+
+        return timed
+
+    def reset(self):
+        """Sets all counters back to zero."""
+        for phase in self.ns:
+            self.ns[phase] = 0
+            self.calls[phase] = 0
+
+    def report(self):
+        """
+        {phase: {"calls", "total_ms", "mean_us", "share"}}; share is the
+        fraction of the time spent in step (skip_idle and the others run
+        inside step, action_mask and observation also once per reset).
+        """
+        step_ns = self.ns["step"] or 1
+        return {
+            phase: {
+                "calls": self.calls[phase],
+                "total_ms": self.ns[phase] / 1e6,
+                "mean_us": self.ns[phase] / 1e3 / max(self.calls[phase], 1),
+                "share": self.ns[phase] / step_ns,
+            }
+            for phase in self.ns
+        }
+
+    def format_report(self):
+        lines = [
+            f"{'phase':<18}{'calls':>10}{'total ms':>12}{'mean us':>10}{'share':>8}"
+        ]
+        for phase, row in self.report().items():
+            lines.append(
+                f"{phase:<18}{row['calls']:>10}{row['total_ms']:>12.1f}"
+                f"{row['mean_us']:>10.2f}{row['share']:>8.1%}"
+            )
+        return "\n".join(lines)
+
+    def start_episode(self, episode):
+        """
+        Sets the counters to zero and starts the cProfile run of an episode
+        (ends a running one first).
+        """
+        self.reset()
+        if self.dump_dir is None:
+            return
+        self.end_episode()
+        os.makedirs(self.dump_dir, exist_ok=True)
+        self._episode = episode
+        self._cprofile = cProfile.Profile()
+        self._cprofile.enable()
+
+    def end_episode(self):
+        """Stops the cProfile run and writes its dump; returns the path or None."""
+        if self._cprofile is None:
+            return None
+        self._cprofile.disable()
+        path = os.path.join(self.dump_dir, f"episode_{self._episode}.prof")
+        self._cprofile.dump_stats(path)
+        self._cprofile = None
+        return path
@@ -0,0 +1,656 @@
+import math
+import gymnasium as gym
+from gymnasium import spaces
+import numpy as np
+from MultiElevatorEnv import MultiElevatorEnv, MAX_EPISODE_STEPS
+from GuestScheduler import FLOOR_CHANGE_PROBABILITY
+from TripLog import TripLog
+from TripStats import TripStats
+from RandomStreams import RandomStreams
+
+# Guest states (struct-of-arrays replacement for Guest.state)
+NOT_SPAWNED = 0
+WAITING = 1  # "waiting" and "waiting_on_floor"
+IN_ELEVATOR = 2
+ON_FLOOR = 3
+LEFT = 4
+
+# Pending elevator actions (replacement for Elevator.pending_action)
+NO_ACTION = 0
+OPEN = 1
+CLOSE = 2
+MOVE_UP = 3
+MOVE_DOWN = 4
+
+# The observation layout is fixed, see MultiElevatorEnv._get_obs
+OBS_ELEVATORS = 3
+OBS_FLOORS = 10
+
+
+class ElevatorCore:
+    """
+    Struct-of-arrays simulation of one or more independent buildings.
+    Every guest and elevator attribute is a NumPy array with a leading
+    building axis, so one step() advances all buildings at once.
+    The rules are the same as MultiElevatorEnv + Elevator + Guest.
+    """
+
+    def __init__(
+        self,
+        num_buildings=1,
+        num_elevators=3,
+        num_floors=10,
+        max_passengers=5,
+        max_guests=200,
+        spawn_intervall=120 * 60,
+        sim_step_size=1,
+        ride_time=4,
+        door_time=4,
+    ):
+        self.num_buildings = num_buildings
+        self.num_elevators = num_elevators
+        self.num_floors = num_floors
+        self.capacity = max_passengers
+        self.max_guests = max_guests
+        self.spawn_intervall = spawn_intervall
+        self.sim_step_size = sim_step_size
+        self.ride_time = ride_time
+        self.door_time = door_time
+        # For Poisson spawning:
+        self.lam = self.max_guests / self.spawn_intervall
+        self.mean_inter = 1 / self.lam
+
+        B, G, E, F = num_buildings, max_guests, num_elevators, num_floors
+        # 1) Guests, indexed by guest id
+        self.g_state = np.zeros((B, G), dtype=np.int8)
+        self.g_floor = np.zeros((B, G), dtype=np.int32)
+        self.g_target = np.zeros((B, G), dtype=np.int32)
+        self.g_waiting_since = np.zeros((B, G), dtype=np.int64)
+        self.g_entered = np.zeros((B, G), dtype=np.int64)
+        self.g_working_left = np.zeros((B, G), dtype=np.int64)
+        self.g_elevator = np.zeros((B, G), dtype=np.int32)
+        # Insertion order into the waiting/on-floor/passenger lists
+        self.g_seq = np.zeros((B, G), dtype=np.int64)
+        # GuestScheduler entry of working guests: step and kind of the next event
+        self.g_due = np.zeros((B, G), dtype=np.int64)
+        self.g_change = np.zeros((B, G), dtype=bool)
+        # 2) Elevators
+        self.e_floor = np.zeros((B, E), dtype=np.int32)
+        self.e_door_open = np.zeros((B, E), dtype=bool)
+        self.e_busy = np.zeros((B, E), dtype=np.int32)
+        self.e_pending = np.zeros((B, E), dtype=np.int8)
+        self.e_load = np.zeros((B, E), dtype=np.int32)
+        # Last move: 1 = up, -1 = down, 0 = waited since (Elevator.direction)
+        self.e_direction = np.zeros((B, E), dtype=np.int8)
+        # 3) Live counters for observation and action mask
+        self.waiting_per_floor = np.zeros((B, F), dtype=np.int32)
+        self.dest_per_elevator = np.zeros((B, E, F), dtype=np.int32)
+        # 4) Per building counters
+        self.episode_steps = np.zeros(B, dtype=np.int64)
+        self.spawned = np.zeros(B, dtype=np.int64)
+        self.guests_in_building = np.zeros(B, dtype=np.int64)
+        self.guests_left_building = np.zeros(B, dtype=np.int64)
+        self.next_seq = np.zeros(B, dtype=np.int64)
+        self.next_due = np.full(B, np.iinfo(np.int64).max, dtype=np.int64)
+        self.time_since_last_spawn = np.zeros(B, dtype=np.float64)
+        self.time_until_next_arrival = np.zeros(B, dtype=np.float64)
+        self.total_reward = np.zeros(B, dtype=np.float64)
+        # Guests who started waiting since the env last set this to zero
+        self.new_waiting = np.zeros(B, dtype=np.int64)
+        self.logs = [TripLog() for _ in range(B)]
+        self.trip_stats = [TripStats() for _ in range(B)]
+        # One RandomStreams per building, draws mirror the object model
+        self.random = [RandomStreams() for _ in range(B)]
+        # 5) Output buffers
+        self.obs_elevators = max(OBS_ELEVATORS, E)
+        self.obs_size = self.obs_elevators * (2 + OBS_FLOORS) + OBS_FLOORS
+        self.obs = np.zeros((B, self.obs_size), dtype=np.int32)
+        self.masks = np.zeros((B, E, 3), dtype=bool)
+        self._building_idx = np.arange(B)
+        self._eb, self._ee = np.indices((B, E))
+
+    def log(self, building, time, guest_id, mode, wait_time, travel_time):
+        """Writes a log entry for one building."""
+        self.logs[building].append(time, guest_id, mode, wait_time, travel_time)
+
+    def _log_many(self, b, time, guest_id, mode, wait_time, travel_time):
+        """
+        log() for the entries (b[i], ...) of many buildings, in the given order.
+        Also feeds the trip statistics like Elevator.board_guests / dropoff_guests.
+        """
+        for building in np.unique(b):
+            rows = b == building
+            if mode == "elevator_waiting":
+                self.trip_stats[building].add_waits(time[rows], wait_time[rows])
+            else:
+                self.trip_stats[building].add_rides(
+                    time[rows], wait_time[rows], travel_time[rows]
+                )
+            self.logs[building].extend(
+                time[rows],
+                guest_id[rows],
+                mode,
+                None if wait_time is None else wait_time[rows],
+                None if travel_time is None else travel_time[rows],
+            )
+
+    def reset(self, buildings=None, seeds=None):
+        """
+        Resets the given buildings (default: all) to the start of an episode.
+        seeds (one per building, None entries allowed) re-seed their streams,
+        otherwise the streams of the previous episode continue.
+        """
+        if buildings is None:
+            buildings = self._building_idx
+        buildings = np.asarray(buildings)
+        for arr in (
+            self.g_state,
+            self.g_seq,
+            self.e_floor,
+            self.e_door_open,
+            self.e_busy,
+            self.e_pending,
+            self.e_load,
+            self.e_direction,
+            self.waiting_per_floor,
+            self.dest_per_elevator,
+            self.episode_steps,
+            self.spawned,
+            self.guests_in_building,
+            self.guests_left_building,
+            self.next_seq,
+            self.time_since_last_spawn,
+            self.total_reward,
+            self.new_waiting,
+        ):
+            arr[buildings] = 0
+        self.next_due[buildings] = np.iinfo(np.int64).max
+        for i, b in enumerate(buildings):
+            if seeds is not None and seeds[i] is not None:
+                self.random[b] = RandomStreams(seeds[i])
+            self.time_until_next_arrival[b] = self.random[b].interarrival(
+                self.mean_inter
+            )
+            self.logs[b].clear()
+            self.trip_stats[b] = TripStats()
+
+    def _enqueue(self, b, g):
+        """
+        Gives the guests (b[i], g[i]) the next sequence numbers of their
+        building, in the given order (b must be sorted).
+        Mirrors list.append on the object model.
+        """
+        if b.size == 0:
+            return
+        first = np.searchsorted(b, b, side="left")
+        self.g_seq[b, g] = self.next_seq[b] + (np.arange(b.size) - first)
+        self.next_seq += np.bincount(b, minlength=self.num_buildings)
+
+    def _guests_waiting_or_leaving(self):
+        """(B, E) version of Elevator._guests_waiting_or_leaving."""
+        num_leaving = self.dest_per_elevator[self._eb, self._ee, self.e_floor]
+        waiting_here = self.waiting_per_floor[self._eb, self.e_floor]
+        boarding_possible = self.e_load - num_leaving < self.capacity
+        return (num_leaving > 0) | ((waiting_here > 0) & boarding_possible)
+
+    def _schedule(self, b, g):
+        """
+        GuestScheduler.add for the guests (b[i], g[i]) who start working now,
+        in the given order. g_working_left already holds the value at the event.
+        """
+        if b.size == 0:
+            return
+        steps = np.maximum(self.g_working_left[b, g], 1)
+        change = np.zeros(b.size, dtype=bool)
+        if self.num_floors > 1:
+            k = np.empty(b.size, dtype=np.int64)
+            for building in np.unique(b):
+                rows = b == building
+                k[rows] = self.random[building].floor_change_after(
+                    FLOOR_CHANGE_PROBABILITY, np.count_nonzero(rows)
+                )
+            change = k < steps
+            steps = np.where(change, k, steps)
+        due = self.episode_steps[b] + steps
+        self.g_due[b, g] = due
+        self.g_change[b, g] = change
+        self.g_working_left[b, g] -= steps
+        np.minimum.at(self.next_due, b, due)
+
+    def _step_guests(self):
+        """Working guests whose GuestScheduler entry is due, see MultiElevatorEnv.step."""
+        if not (self.next_due <= self.episode_steps).any():
+            return
+        on_floor = self.g_state == ON_FLOOR
+        moving = on_floor & (self.g_due == self.episode_steps[:, None])
+        expired = moving & ~self.g_change
+        due = np.where(on_floor & ~moving, self.g_due, np.iinfo(np.int64).max)
+        self.next_due = due.min(axis=1)
+        if not moving.any():
+            return
+
+        # Rare path: handle the moving guests in list order
+        b, g = np.nonzero(moving)
+        order = np.lexsort((self.g_seq[b, g], b))
+        b, g = b[order], g[order]
+        changing = ~expired[b, g]
+        floor = self.g_floor[b, g]
+
+        # Working time over on the ground floor: leave the building
+        leaving = ~changing & (floor == 0)
+        self.g_state[b[leaving], g[leaving]] = LEFT
+        left = np.bincount(b[leaving], minlength=self.num_buildings)
+        self.guests_left_building += left
+        self.guests_in_building -= left
+
+        # Working time over elsewhere: go down to floor 0, otherwise a random floor
+        target = np.zeros(b.size, dtype=np.int32)
+        idx = np.empty(np.count_nonzero(changing), dtype=np.int64)
+        changing_b = b[changing]
+        for building in np.unique(changing_b):
+            rows = changing_b == building
+            idx[rows] = self.random[building].floor_change_target(
+                self.num_floors - 1, np.count_nonzero(rows)
+            )
+        target[changing] = idx + (idx >= floor[changing])
+        b, g, floor, target = (
+            b[~leaving],
+            g[~leaving],
+            floor[~leaving],
+            target[~leaving],
+        )
+        self.g_target[b, g] = target
+        self.g_state[b, g] = WAITING
+        self.g_waiting_since[b, g] = self.episode_steps[b]
+        np.add.at(self.waiting_per_floor, (b, floor), 1)
+        np.add.at(self.new_waiting, b, 1)
+        self._enqueue(b, g)
+
+    def _spawn_guests(self, active):
+        """Poisson arrivals, see MultiElevatorEnv._spawn_guest."""
+        self.time_since_last_spawn += self.sim_step_size * active
+        due = self.time_since_last_spawn >= self.time_until_next_arrival
+        if not due.any():
+            return
+        for b in np.flatnonzero(due & (self.spawned < self.max_guests)):
+            while (
+                self.spawned[b] < self.max_guests
+                and self.time_since_last_spawn[b] >= self.time_until_next_arrival[b]
+            ):
+                g = self.spawned[b]
+                target = self.random[b].destination(self.num_floors)
+                self.g_target[b, g] = target
+                self.g_floor[b, g] = 0
+                self.g_working_left[b, g] = self.random[b].working_time()
+                self.g_waiting_since[b, g] = self.episode_steps[b]
+                self.g_seq[b, g] = self.next_seq[b]
+                self.next_seq[b] += 1
+                # Guests for the ground floor go straight to work
+                if target == 0:
+                    self.g_state[b, g] = ON_FLOOR
+                    self._schedule(np.array([b]), np.array([g]))
+                else:
+                    self.g_state[b, g] = WAITING
+                    self.waiting_per_floor[b, 0] += 1
+                    self.new_waiting[b] += 1
+                self.spawned[b] += 1
+                self.guests_in_building[b] += 1
+                self.time_since_last_spawn[b] -= self.time_until_next_arrival[b]
+                self.time_until_next_arrival[b] = self.random[b].interarrival(
+                    self.mean_inter
+                )
+
+    def _do_actions(self, actions, active):
+        """Elevator.do_action for every elevator of the active buildings."""
+        busy = (self.e_busy > 0) & active[:, None]
+        self.e_busy -= busy
+        free = active[:, None] & ~busy
+
+        # Door is open: automatically close after waiting
+        closing = free & self.e_door_open
+        ready = free & ~self.e_door_open
+        wait = ready & (actions == 0)
+        gwl = self._guests_waiting_or_leaving()
+        opening = wait & gwl
+        closing |= wait & ~gwl
+        up = ready & (actions == 1) & (self.e_floor < self.num_floors - 1)
+        down = ready & (actions == 2) & (self.e_floor > 0)
+
+        self.e_busy[opening | (closing & self.e_door_open)] = self.door_time - 1
+        self.e_busy[up | down] = self.ride_time - 1
+        self.e_pending[opening] = OPEN
+        self.e_pending[closing] = CLOSE
+        self.e_pending[up] = MOVE_UP
+        self.e_pending[down] = MOVE_DOWN
+        self.e_direction[wait] = 0
+        self.e_direction[up] = 1
+        self.e_direction[down] = -1
+
+    def _execute_pending(self, active):
+        """Elevator.execute_pending_action, returns the elevators that opened."""
+        ready = (self.e_busy <= 0) & active[:, None]
+        pending = np.where(ready, self.e_pending, NO_ACTION)
+        self.e_floor += pending == MOVE_UP
+        self.e_floor -= pending == MOVE_DOWN
+        opened = pending == OPEN
+        self.e_door_open |= opened
+        self.e_door_open &= pending != CLOSE
+        return opened
+
+    def _dropoff(self, opened, rewards):
+        """Elevator.dropoff_guests for every elevator that just opened."""
+        b, g = np.nonzero(self.g_state == IN_ELEVATOR)
+        e = self.g_elevator[b, g]
+        arriving = opened[b, e] & (self.g_target[b, g] == self.e_floor[b, e])
+        if not arriving.any():
+            return
+        b, g, e = b[arriving], g[arriving], e[arriving]
+        order = np.lexsort((self.g_seq[b, g], e, b))
+        b, g, e = b[order], g[order], e[order]
+        steps = self.episode_steps[b]
+        waiting_since = self.g_waiting_since[b, g]
+        entered = self.g_entered[b, g]
+        target = self.g_target[b, g]
+
+        self.g_floor[b, g] = target
+        np.subtract.at(self.e_load, (b, e), 1)
+        np.subtract.at(self.dest_per_elevator, (b, e, target), 1)
+        self._log_many(
+            b,
+            waiting_since,
+            guest_id=g,
+            mode="elevator_drive",
+            wait_time=entered - waiting_since,
+            travel_time=steps - entered,
+        )
+        h = np.maximum(1, 20 - (steps - entered) // 60)
+        rewards += np.bincount(b, weights=h, minlength=self.num_buildings)
+
+        working = self.g_working_left[b, g] > 0
+        stay_b, stay_g = b[working], g[working]
+        self.g_working_left[stay_b, stay_g] -= steps[working] - waiting_since[working]
+        self.g_state[stay_b, stay_g] = ON_FLOOR
+        self._enqueue(stay_b, stay_g)
+        self._schedule(stay_b, stay_g)
+
+        self.g_state[b[~working], g[~working]] = LEFT
+        left = np.bincount(b[~working], minlength=self.num_buildings)
+        self.guests_left_building += left
+        self.guests_in_building -= left
+
+    def _board(self, opened, rewards):
+        """Elevator.board_guests for every elevator that just opened, in id order."""
+        G = self.max_guests
+        for e in range(self.num_elevators):
+            bs = np.flatnonzero(opened[:, e])
+            if bs.size == 0:
+                continue
+            floor = self.e_floor[bs, e]
+            candidates = (self.g_state[bs] == WAITING) & (
+                self.g_floor[bs] == floor[:, None]
+            )
+            take = np.minimum(self.capacity - self.e_load[bs, e], candidates.sum(1))
+            if not take.any():
+                continue
+            key = np.where(candidates, self.g_seq[bs], np.iinfo(np.int64).max)
+            order = np.argsort(key, axis=1, kind="stable")
+            rows, pos = np.nonzero(np.arange(G) < take[:, None])
+            b, g = bs[rows], order[rows, pos]
+            steps = self.episode_steps[b]
+            waiting_since = self.g_waiting_since[b, g]
+            self.g_state[b, g] = IN_ELEVATOR
+            self.g_elevator[b, g] = e
+            self.g_entered[b, g] = steps
+            self.e_load[bs, e] += take
+            self.waiting_per_floor[bs, floor] -= take
+            np.add.at(self.dest_per_elevator, (b, e, self.g_target[b, g]), 1)
+            self._enqueue(b, g)
+            self._log_many(
+                b,
+                time=waiting_since,
+                guest_id=g,
+                mode="elevator_waiting",
+                wait_time=steps - waiting_since,
+                travel_time=None,
+            )
+            h = np.maximum(1, 10 - (steps - waiting_since) // 60)
+            rewards += np.bincount(b, weights=h, minlength=self.num_buildings)
+
+    def step(self, actions, active=None):
+        """
+        Advances every building (or only those where the (B,) bool array
+        active is True, the others stand still) by one second.
+        actions: (num_buildings, num_elevators) array with 0 = wait, 1 = up, 2 = down
+        Returns (rewards, dones) as arrays of length num_buildings; both are
+        0/False for buildings that stood still.
+        """
+        actions = np.asarray(actions).reshape(self.num_buildings, self.num_elevators)
+        if active is None:
+            active = np.ones(self.num_buildings, dtype=bool)
+        rewards = np.zeros(self.num_buildings, dtype=np.float64)
+        self.episode_steps += active
+        # Guests of a building that stands still are not due again
+        self._step_guests()
+        self._spawn_guests(active)
+        self._do_actions(actions, active)
+        opened = self._execute_pending(active)
+        if opened.any():
+            self._dropoff(opened, rewards)
+            self._board(opened, rewards)
+
+        dones = active & (
+            (self.guests_left_building >= self.max_guests)
+            | (self.episode_steps > MAX_EPISODE_STEPS)
+        )
+        rewards -= 0.1 * self.waiting_per_floor.sum(axis=1) * active
+        rewards -= 0.05 * self.e_load.sum(axis=1) * active
+        self.total_reward += rewards
+        return rewards, dones
+
+    def _occupied(self):
+        """(B,) True if anyone is waiting or riding."""
+        return (self.waiting_per_floor.sum(axis=1) > 0) | (self.e_load.sum(axis=1) > 0)
+
+    def keeps_direction(self):
+        """(B, E) version of Elevator.keeps_direction."""
+        next_floor = self.e_floor + self.e_direction
+        return (
+            (self.e_busy <= 0)
+            & ~self.e_door_open
+            & (self.e_direction != 0)
+            & (next_floor >= 0)
+            & (next_floor < self.num_floors)
+            & ~self._guests_waiting_or_leaving()
+        )
+
+    def needs_decision(self, keep_direction=False):
+        """(B,) version of MultiElevatorEnv.needs_decision."""
+        free = self.e_busy <= 0
+        if keep_direction:
+            asking = free & ~self.e_door_open & ~self.keeps_direction()
+            free = np.where((self.new_waiting > 0)[:, None], free, asking)
+        return self._occupied() & free.any(axis=1)
+
+    def fast_forward_actions(self, keep_direction=False):
+        """(B, E) version of MultiElevatorEnv._fast_forward_actions."""
+        if not keep_direction:
+            return np.zeros((self.num_buildings, self.num_elevators), dtype=np.int64)
+        moving_on = self.keeps_direction() & self._occupied()[:, None]
+        return np.where(moving_on, np.where(self.e_direction > 0, 1, 2), 0)
+
+    def skip_idle_seconds(self, b):
+        """MultiElevatorEnv._skip_idle_seconds for building b."""
+        if self.waiting_per_floor[b].any() or self.e_load[b].any():
+            return 0
+        if (self.e_busy[b] > 0).any() or self.e_door_open[b].any():
+            return 0
+        next_step = min(MAX_EPISODE_STEPS + 1, self.next_due[b])
+        if self.spawned[b] < self.max_guests:
+            seconds = math.ceil(
+                (self.time_until_next_arrival[b] - self.time_since_last_spawn[b])
+                / self.sim_step_size
+            )
+            next_step = min(next_step, self.episode_steps[b] + seconds)
+        skip = int(next_step - self.episode_steps[b] - 1)
+        if skip <= 0:
+            return 0
+        self.episode_steps[b] += skip
+        self.time_since_last_spawn[b] += skip * self.sim_step_size
+        return skip
+
+    def action_masks(self):
+        """
+        (B, E, 3) version of MultiElevatorEnv.get_action_mask, including its
+        side effect of consuming finished pending actions.
+        """
+        busy = self.e_busy > 0
+        was_close = ~busy & (self.e_pending == CLOSE)
+        self.e_pending[~busy] = NO_ACTION
+        closed = ~self.e_door_open
+        self.masks[:, :, 0] = self._guests_waiting_or_leaving() & ~was_close
+        self.masks[:, :, 1] = closed & (self.e_floor < self.num_floors - 1)
+        self.masks[:, :, 2] = closed & (self.e_floor > 0)
+        self.masks[busy] = True
+        return self.masks
+
+    def observations(self):
+        """(B, obs_size) version of MultiElevatorEnv._get_obs."""
+        F = min(self.num_floors, OBS_FLOORS)
+        E = self.num_elevators
+        per_elevator = self.obs[:, : self.obs_elevators * (2 + OBS_FLOORS)].reshape(
+            self.num_buildings, self.obs_elevators, 2 + OBS_FLOORS
+        )
+        per_elevator[:, :E, 0] = self.e_floor
+        per_elevator[:, :E, 1] = self.e_load
+        per_elevator[:, :E, 2 : 2 + F] = self.dest_per_elevator[:, :, :F]
+        self.obs[:, self.obs_size - OBS_FLOORS : self.obs_size - OBS_FLOORS + F] = (
+            self.waiting_per_floor[:, :F]
+        )
+        return self.obs
+
+
+class VectorizedElevatorEnv(gym.Env):
+    """
+    Drop-in replacement for MultiElevatorEnv backed by ElevatorCore.
+    Same constructor, spaces, observations, rewards and action masks.
+    """
+
+    def __init__(
+        self,
+        num_elevators=3,
+        num_floors=10,
+        max_passengers=5,
+        max_guests=200,
+        spawn_intervall=120 * 60,
+        working_time_mean=480 * 60,
+        working_time_std=50 * 60,
+        sim_step_size=1,
+        ride_time=4,
+        door_time=4,
+        episodes_so_far=0,
+        fast_forward=False,
+        keep_direction=False,
+    ):
+        super().__init__()
+        self.num_elevators = num_elevators
+        self.num_floors = num_floors
+        self.max_passengers = max_passengers
+        self.max_guests = max_guests
+        self.spawn_intervall = spawn_intervall
+        self.working_time_mean = working_time_mean
+        self.working_time_std = working_time_std
+        self.sim_step_size = sim_step_size
+        self.ride_time = ride_time
+        self.door_time = door_time
+        self.fast_forward = fast_forward
+        self.keep_direction = keep_direction
+        self.action_space = spaces.MultiDiscrete([3] * self.num_elevators)
+        self.observation_space = MultiElevatorEnv.build_obs_space(
+            self,
+            self.num_elevators,
+            self.num_floors,
+            self.max_passengers,
+            self.max_guests,
+        )
+        self.core = ElevatorCore(
+            num_buildings=1,
+            num_elevators=num_elevators,
+            num_floors=num_floors,
+            max_passengers=max_passengers,
+            max_guests=max_guests,
+            spawn_intervall=spawn_intervall,
+            sim_step_size=sim_step_size,
+            ride_time=ride_time,
+            door_time=door_time,
+        )
+        self.last_logs = None
+        self.last_trip_stats = None
+        self.episodes_so_far = episodes_so_far
+
+        self.reset()
+
+    @property
+    def logs(self):
+        return self.core.logs[0]
+
+    @property
+    def trip_stats(self):
+        return self.core.trip_stats[0]
+
+    @property
+    def episode_steps(self):
+        return int(self.core.episode_steps[0])
+
+    @property
+    def guests_in_building(self):
+        return int(self.core.guests_in_building[0])
+
+    @property
+    def guests_left_building(self):
+        return int(self.core.guests_left_building[0])
+
+    @property
+    def total_reward(self):
+        return float(self.core.total_reward[0])
+
+    def get_action_mask(self):
+        # Result shape is (num_elevators, 3)
+        return self.core.action_masks()[0].copy()
+
+    def reset(self, seed=None, options=None):
+        if self.logs:
+            self.last_logs = self.logs.copy()
+            self.last_trip_stats = self.trip_stats
+        super().reset(seed=seed)
+        self.core.reset(seeds=[seed])
+        self.episodes_so_far += 1
+        info = {"action_mask": self.get_action_mask()}
+        return self._get_obs(), info
+
+    def step(self, actions):
+        self.core.new_waiting[:] = 0
+        rewards, dones = self.core.step(np.asarray(actions)[None, :])
+        reward = float(rewards[0])
+        done = bool(dones[0])
+        info = {"action_mask": self.get_action_mask()}
+        duration = 1
+        if self.fast_forward:
+            while not done and not self.core.needs_decision(self.keep_direction)[0]:
+                duration += self.core.skip_idle_seconds(0)
+                rewards, dones = self.core.step(
+                    self.core.fast_forward_actions(self.keep_direction)
+                )
+                reward += float(rewards[0])
+                done = bool(dones[0])
+                duration += 1
+                info["action_mask"] = self.get_action_mask()
+        info["duration"] = duration
+        if done:
+            print("Step: ", self.episode_steps)
+            print("Guests_left_building: ", self.guests_left_building)
+            print("Guests_in_building: ", self.guests_in_building)
+            print("Total_reward: ", self.total_reward)
+        return self._get_obs(), reward, done, False, info
+
+    def _get_obs(self):
+        return self.core.observations()[0].copy()
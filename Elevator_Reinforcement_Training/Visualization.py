@@ -1,6 +1,75 @@
 import os
-import pandas as pd
+import numpy as np
 import matplotlib.pyplot as plt
+from TripLog import TripLog, to_dataframe
+
+
+class EpisodeAnalytics:
+    """
+    Reads one episode log once and computes every hourly aggregate the plots
+    need in a single pass over the columns.
+    The plot functions accept either a log or an EpisodeAnalytics, so
+    building it once and passing it around avoids recomputing.
+    """
+
+    def __init__(self, logs):
+        if isinstance(logs, TripLog):
+            # Column views of the log, no DataFrame
+            columns = logs.columns()
+            waiting = logs.mode_mask("elevator_waiting")
+            drive = logs.mode_mask("elevator_drive")
+        else:
+            df = to_dataframe(logs)
+            columns = {
+                name: df[name].to_numpy(dtype=np.float64)
+                for name in ("time", "wait_time", "travel_time")
+            }
+            waiting = (df["mode"] == "elevator_waiting").to_numpy()
+            drive = (df["mode"] == "elevator_drive").to_numpy()
+        time = columns["time"]
+        wait_time = columns["wait_time"]
+        travel_time = columns["travel_time"]
+
+        # Waiting entries, grouped by the hour the wait started
+        wait = wait_time[waiting]
+        self.wait_per_hour = _hourly_means(_hours(time[waiting]), wait)
+
+        # Rides, grouped by the hour the wait started or the ride started
+        start = time[drive]
+        ride_wait = wait_time[drive]
+        travel = travel_time[drive]
+        total = ride_wait + travel
+        ride_hours = _hours(start + ride_wait)
+        self.travel_per_hour = _hourly_means(ride_hours, travel)
+        self.total_per_hour = _hourly_means(_hours(start), total)
+        self.total_per_ride_hour = _hourly_means(ride_hours, total)
+        self.guests_per_hour = (
+            self.total_per_ride_hour[0],
+            self.total_per_ride_hour[2],
+        )
+
+        # Episode totals and averages
+        self.trips = int(drive.sum())
+        self.avg_wait_time = wait.mean() if wait.size else 0
+        self.avg_travel_time = travel.mean() if travel.size else 0
+        self.avg_total_time = total.mean() if total.size else 0
+
+    @classmethod
+    def of(cls, logs):
+        """logs itself if it already is an EpisodeAnalytics, otherwise a new one."""
+        return logs if isinstance(logs, cls) else cls(logs)
+
+
+def _hours(times):
+    return (times // 3600).astype(np.int64)
+
+
+def _hourly_means(hours, values):
+    """(hours with entries, mean value per hour, entries per hour)"""
+    counts = np.bincount(hours)
+    sums = np.bincount(hours, weights=values)
+    present = np.flatnonzero(counts)
+    return present, sums[present] / counts[present], counts[present]
 
 
 def ensure_vis_dir():
@@ -15,13 +84,10 @@ def plot_wait_times_per_hour(logs, episode, filename="wait_times_per_hour_bar.pn
     # Plot average waiting time per hour
     vis_dir = ensure_vis_dir()
     filename = os.path.join(vis_dir, f"wait_times_per_hour_ep{episode}.png")
-    df = pd.DataFrame(logs)
-    df = df[df["mode"] == "elevator_waiting"].copy()
-    df["hour"] = (df["time"] // 3600).astype(int)
-    hourly = df.groupby("hour")["wait_time"].mean().reset_index()
-    hourly["wait_time"] = hourly["wait_time"].round().astype(int)
+    hours, wait_time, _ = EpisodeAnalytics.of(logs).wait_per_hour
+    wait_time = np.round(wait_time).astype(int)
     fig, ax = plt.subplots()
-    ax.bar(hourly["hour"], hourly["wait_time"])
+    ax.bar(hours, wait_time)
     ax.set_xlabel("Hour (since simulation start)")
     ax.set_ylabel("Average waiting time (seconds)")
     ax.set_title(f"Average waiting time per hour (Episode {episode})")
@@ -34,14 +100,10 @@ def plot_travel_times_per_hour(logs, episode, filename="travel_times_per_hour_ba
     # Plot average travel time per hour
     vis_dir = ensure_vis_dir()
     filename = os.path.join(vis_dir, f"travel_times_per_hour_ep{episode}.png")
-    df = pd.DataFrame(logs)
-    df = df[df["mode"] == "elevator_drive"].copy()
-    df["start_travel_time"] = df["time"] + df["wait_time"]
-    df["hour"] = (df["start_travel_time"] // 3600).astype(int)
-    hourly = df.groupby("hour")["travel_time"].mean().reset_index()
-    hourly["travel_time"] = hourly["travel_time"].round().astype(int)
+    hours, travel_time, _ = EpisodeAnalytics.of(logs).travel_per_hour
+    travel_time = np.round(travel_time).astype(int)
     fig, ax = plt.subplots()
-    ax.bar(hourly["hour"], hourly["travel_time"])
+    ax.bar(hours, travel_time)
     ax.set_xlabel("Hour")
     ax.set_ylabel("Average travel time (seconds)")
     ax.set_title(f"Average travel time per hour (Episode {episode})")
@@ -56,15 +118,10 @@ def plot_total_travel_times_per_hour(
     # Plot average total time per hour (waiting + travel)
     vis_dir = ensure_vis_dir()
     filename = os.path.join(vis_dir, f"total_travel_times_per_hour_ep{episode}.png")
-    df = pd.DataFrame(logs)
-    df = df[df["mode"] == "elevator_drive"].copy()
-    df["total_time"] = df["wait_time"] + df["travel_time"]
-    df["start_travel_time"] = df["time"]
-    df["hour"] = (df["start_travel_time"] // 3600).astype(int)
-    hourly = df.groupby("hour")["total_time"].mean().reset_index()
-    hourly["total_time"] = hourly["total_time"].round().astype(int)
+    hours, total_time, _ = EpisodeAnalytics.of(logs).total_per_hour
+    total_time = np.round(total_time).astype(int)
     fig, ax = plt.subplots()
-    ax.bar(hourly["hour"], hourly["total_time"])
+    ax.bar(hours, total_time)
     ax.set_xlabel("Hour")
     ax.set_ylabel("Average total time (seconds)")
     ax.set_title(f"Average total time per hour (Episode {episode})")
@@ -77,13 +134,9 @@ def plot_guest_counts_per_hour(logs, episode, filename="guest_counts_per_hour.pn
     # Plot guest count per hour
     vis_dir = ensure_vis_dir()
     filename = os.path.join(vis_dir, f"guest_counts_per_hour_ep{episode}.png")
-    df = pd.DataFrame(logs)
-    df = df[df["mode"] == "elevator_drive"].copy()
-    df["start_travel_time"] = df["time"] + df["wait_time"]
-    df["hour"] = (df["start_travel_time"] // 3600).astype(int)
-    hourly_counts = df.groupby("hour")["guest_id"].count()
+    hours, counts = EpisodeAnalytics.of(logs).guests_per_hour
     fig, ax = plt.subplots()
-    ax.plot(hourly_counts.index, hourly_counts.values, marker="o", label="Elevator")
+    ax.plot(hours, counts, marker="o", label="Elevator")
     ax.set_xlabel("Hour (since simulation start)")
     ax.set_ylabel("Number of guests")
     ax.set_title(f"Guests per hour (Episode {episode})")
@@ -99,17 +152,12 @@ def plot_average_total_time_per_hour(
     # Plot average total time per hour (line plot)
     vis_dir = ensure_vis_dir()
     filename = os.path.join(vis_dir, f"avg_total_time_per_hour_ep{episode}.png")
-    df = pd.DataFrame(logs)
-    df = df[df["mode"] == "elevator_drive"].copy()
-    df["total_time"] = df["wait_time"] + df["travel_time"]
-    df["start_travel_time"] = df["time"] + df["wait_time"]
-    df["hour"] = (df["start_travel_time"] // 3600).astype(int)
-    hourly_avg = df.groupby("hour")["total_time"].mean().reset_index()
-    hourly_avg["total_time"] = hourly_avg["total_time"].round().astype(int)
+    hours, total_time, _ = EpisodeAnalytics.of(logs).total_per_ride_hour
+    total_time = np.round(total_time).astype(int)
     fig, ax = plt.subplots()
     ax.plot(
-        hourly_avg["hour"],
-        hourly_avg["total_time"],
+        hours,
+        total_time,
         marker="o",
         label="Ø Total time (Elevator)",
     )
@@ -0,0 +1,81 @@
+import numpy as np
+from MultiElevatorEnv import MultiElevatorEnv
+from VectorizedElevatorEnv import VectorizedElevatorEnv
+
+
+def run_episode(env_class, seed, env_kwargs, num_steps, actions=None, policy_seed=0):
+    """
+    Runs one seeded episode and records everything the agent can see.
+    If actions is None, random valid actions are drawn from the action mask
+    (with a separate generator so the simulation streams are not touched).
+    """
+    env = env_class(**env_kwargs)
+    obs, info = env.reset(seed=seed)
+    policy = np.random.default_rng(policy_seed)
+    record = {
+        "obs": [obs],
+        "masks": [np.asarray(info["action_mask"], dtype=bool)],
+        "rewards": [],
+        "dones": [],
+        "actions": [],
+    }
+    for t in range(num_steps):
+        if actions is None:
+            action = []
+            for row in record["masks"][-1]:
+                allowed = np.flatnonzero(row)
+                action.append(int(policy.choice(allowed)) if allowed.size else 0)
+        else:
+            action = actions[t]
+        obs, reward, done, _, info = env.step(action)
+        record["actions"].append(action)
+        record["obs"].append(obs)
+        record["masks"].append(np.asarray(info["action_mask"], dtype=bool))
+        record["rewards"].append(reward)
+        record["dones"].append(done)
+        if done:
+            break
+    record["logs"] = list(env.logs)
+    return record
+
+
+def check_parity(seed=0, num_steps=45001, **env_kwargs):
+    """
+    Runs MultiElevatorEnv and VectorizedElevatorEnv with the same seed and
+    actions. Returns None on parity, otherwise a description of the first
+    difference.
+    """
+    reference = run_episode(MultiElevatorEnv, seed, env_kwargs, num_steps)
+    candidate = run_episode(
+        VectorizedElevatorEnv, seed, env_kwargs, num_steps, reference["actions"]
+    )
+    for t in range(len(reference["obs"])):
+        if not np.array_equal(reference["obs"][t], candidate["obs"][t]):
+            return f"observation differs at step {t}"
+        if not np.array_equal(reference["masks"][t], candidate["masks"][t]):
+            return f"action mask differs at step {t}"
+        if t > 0 and reference["rewards"][t - 1] != candidate["rewards"][t - 1]:
+            return f"reward differs at step {t}"
+        if t > 0 and reference["dones"][t - 1] != candidate["dones"][t - 1]:
+            return f"done differs at step {t}"
+    if reference["logs"] != candidate["logs"]:
+        return "logs differ"
+    return None
+
+
+if __name__ == "__main__":
+    configs = [
+        dict(num_elevators=3, max_guests=200, spawn_intervall=120 * 60),
+        dict(num_elevators=1, num_floors=6, max_guests=50, spawn_intervall=10 * 60),
+        dict(num_elevators=3, max_guests=200, spawn_intervall=10 * 60),
+        dict(num_elevators=3, max_guests=200, fast_forward=True),
+        dict(num_elevators=3, max_guests=200, fast_forward=True, keep_direction=True),
+    ]
+    failed = False
+    for seed in range(3):
+        for kwargs in configs:
+            result = check_parity(seed=seed, **kwargs)
+            print(f"seed={seed} {kwargs}: {result or 'OK'}")
+            failed |= result is not None
+    if failed:
+        raise SystemExit(1)
@@ -1,33 +1,46 @@
 from sb3_contrib import MaskablePPO
 from sb3_contrib.common.wrappers import ActionMasker
 from stable_baselines3.common.vec_env import SubprocVecEnv
+from BatchedElevatorVecEnv import BatchedElevatorVecEnv
 from MultiElevatorEnv import MultiElevatorEnv
 from episode_callback import StopTrainingOnEpisodes
 from episodecheckpointcallback import EpisodeCheckpointCallback
 from stable_baselines3.common.callbacks import CallbackList
 
+ENV_KWARGS = dict(
+    num_elevators=1,
+    num_floors=10,
+    max_passengers=5,
+    max_guests=80,
+    spawn_intervall=120 * 60,
+    working_time_mean=480 * 60,
+    working_time_std=50 * 60,
+    sim_step_size=1,
+    ride_time=4,
+    door_time=4,
+    # One action per second, the mode the checkpoints up to episode 1318 were
+    # trained in; do not switch to fast_forward when resuming them
+    fast_forward=False,
+)
+NUM_ENVS = 12
+# True: all buildings in this process (BatchedElevatorVecEnv)
+# False: one SubprocVecEnv worker per building
+USE_BATCHED_ENV = True
+
 
 def make_env():
     def _init():
-        env = MultiElevatorEnv(
-            num_elevators=1,
-            num_floors=10,
-            max_passengers=5,
-            max_guests=80,
-            spawn_intervall=120 * 60,
-            working_time_mean=480 * 60,
-            working_time_std=50 * 60,
-            sim_step_size=1,
-            ride_time=4,
-            door_time=4,
-        )
+        env = MultiElevatorEnv(**ENV_KWARGS)
         return ActionMasker(env, action_mask_fn=MultiElevatorEnv.get_action_mask)
 
     return _init
 
 
 if __name__ == "__main__":
-    env = SubprocVecEnv([make_env() for _ in range(12)])
+    if USE_BATCHED_ENV:
+        env = BatchedElevatorVecEnv(num_envs=NUM_ENVS, **ENV_KWARGS)
+    else:
+        env = SubprocVecEnv([make_env() for _ in range(NUM_ENVS)])
 
     # <-- Load model from last checkpoint here!
     last_checkpoint = "./checkpoints_episode/ppo_elevator_episode_1268.zip"
@@ -4,26 +4,36 @@ from sb3_contrib.common.wrappers import ActionMasker
 from stable_baselines3.common.vec_env import SubprocVecEnv  # <- IMPORTANT!
 from stable_baselines3.common.callbacks import CallbackList
 from MultiElevatorEnv import MultiElevatorEnv
+from BatchedElevatorVecEnv import BatchedElevatorVecEnv
 from episode_callback import StopTrainingOnEpisodes
 from episodecheckpointcallback import EpisodeCheckpointCallback
 
+ENV_KWARGS = dict(
+    num_elevators=1,
+    num_floors=6,
+    max_passengers=5,
+    max_guests=50,
+    spawn_intervall=10 * 60,
+    working_time_mean=480 * 60,
+    working_time_std=50 * 60,
+    sim_step_size=1,
+    ride_time=4,
+    door_time=4,
+    episodes_so_far=0,
+    # One action per second; True only asks the policy at decision points
+    # (opt-in, keep_direction=True also lets elevators pass floors on their own)
+    fast_forward=False,
+)
+NUM_ENVS = 12
+# True: all buildings in this process (BatchedElevatorVecEnv)
+# False: one SubprocVecEnv worker per building
+USE_BATCHED_ENV = True
+
 
 def make_env():
     # This function MUST be top-level, NO lambda!
     def _init():
-        env = MultiElevatorEnv(
-            num_elevators=1,
-            num_floors=6,
-            max_passengers=5,
-            max_guests=50,
-            spawn_intervall=10 * 60,
-            working_time_mean=480 * 60,
-            working_time_std=50 * 60,
-            sim_step_size=1,
-            ride_time=4,
-            door_time=4,
-            episodes_so_far=0,
-        )
+        env = MultiElevatorEnv(**ENV_KWARGS)
         # ActionMasker wrapping HERE!
         return ActionMasker(env, action_mask_fn=MultiElevatorEnv.get_action_mask)
 
@@ -31,8 +41,12 @@ def make_env():
 
 
 if __name__ == "__main__":
-    # List of top-level initializers:
-    env = SubprocVecEnv([make_env() for _ in range(12)])
+    if USE_BATCHED_ENV:
+        # Steps all buildings together, no IPC; NUM_ENVS can go to the hundreds
+        env = BatchedElevatorVecEnv(num_envs=NUM_ENVS, **ENV_KWARGS)
+    else:
+        # List of top-level initializers:
+        env = SubprocVecEnv([make_env() for _ in range(NUM_ENVS)])
 
     model = MaskablePPO(
         "MlpPolicy",
@@ -0,0 +1,283 @@
+import os
+import sys
+import json
+import argparse
+import numpy as np
+from RandomStreams import RandomStreams
+
+FLOOR_CHANGE_PROBABILITY = 0.000555
+
+# Column -> dtype; the per-guest columns have one row per guest,
+# change_offset one more, the change columns one row per floor change
+GUEST_COLUMNS = {
+    "arrival_time": np.float64,
+    "start_floor": np.int32,
+    "target": np.int32,
+    "working_time": np.int64,
+}
+CHANGE_COLUMNS = {
+    "change_after": np.int64,
+    "change_target": np.int32,
+}
+COLUMNS = {**GUEST_COLUMNS, "change_offset": np.int64, **CHANGE_COLUMNS}
+
+# floor_change_after() once a guest has no floor changes left
+NO_CHANGE = sys.maxsize
+
+
+class ArrivalTrace:
+    """
+    Pre-generated guests of one run, saved as a directory with one .npy file
+    per column and a meta.json. load() memory-maps the columns, so a replay
+    only reads the rows of the guests that actually arrive.
+
+    Per guest (sorted by arrival): arrival_time in seconds since the start,
+    start_floor, target and working_time. The floor changes of all guests
+    are stored back to back: change_after (seconds of work before the change)
+    and change_target; guest i owns rows change_offset[i]:change_offset[i + 1].
+    """
+
+    def __init__(self, num_floors, **columns):
+        self.num_floors = num_floors
+        for name in COLUMNS:
+            setattr(self, name, columns[name])
+
+    @classmethod
+    def from_arrays(
+        cls,
+        num_floors,
+        arrival_time,
+        target,
+        working_time,
+        start_floor=None,
+        change_offset=None,
+        change_after=None,
+        change_target=None,
+    ):
+        """
+        Builds a trace from arrays, e.g. traffic recorded elsewhere.
+        Without start_floor all guests start on the ground floor, without
+        change_offset nobody changes floors.
+        """
+        n = len(arrival_time)
+        if start_floor is None:
+            start_floor = np.zeros(n)
+        if change_offset is None:
+            change_offset = np.zeros(n + 1)
+            change_after = change_target = np.zeros(0)
+        columns = {
+            "arrival_time": arrival_time,
+            "start_floor": start_floor,
+            "target": target,
+            "working_time": working_time,
+            "change_offset": change_offset,
+            "change_after": change_after,
+            "change_target": change_target,
+        }
+        columns = {
+            name: np.ascontiguousarray(values, dtype=COLUMNS[name])
+            for name, values in columns.items()
+        }
+        trace = cls(num_floors, **columns)
+        trace.validate()
+        return trace
+
+    def validate(self):
+        """Raises ValueError if the columns do not describe a valid trace."""
+        n = len(self.arrival_time)
+        for name in GUEST_COLUMNS:
+            if len(getattr(self, name)) != n:
+                raise ValueError(f"{name} has {len(getattr(self, name))} rows, not {n}")
+        offsets = self.change_offset
+        if len(offsets) != n + 1 or offsets[0] != 0 or np.any(np.diff(offsets) < 0):
+            raise ValueError("change_offset must start at 0 and not decrease")
+        for name in CHANGE_COLUMNS:
+            if len(getattr(self, name)) != offsets[-1]:
+                raise ValueError(f"{name} must have change_offset[-1] rows")
+        if n and (self.arrival_time[0] < 0 or np.any(np.diff(self.arrival_time) < 0)):
+            raise ValueError("arrival_time must be sorted and not negative")
+        for name in ("start_floor", "target", "change_target"):
+            floors = getattr(self, name)
+            if len(floors) and (floors.min() < 0 or floors.max() >= self.num_floors):
+                raise ValueError(f"{name} outside of 0..{self.num_floors - 1}")
+        # Every change goes to another floor than the one the guest is on
+        owner = np.repeat(np.arange(n), np.diff(offsets))
+        first = np.zeros(len(owner), dtype=bool)
+        first[offsets[:-1][np.diff(offsets) > 0]] = True
+        previous = np.where(first, self.target[owner], np.roll(self.change_target, 1))
+        if np.any(previous == self.change_target):
+            raise ValueError("a floor change must go to another floor")
+
+    def __len__(self):
+        return len(self.arrival_time)
+
+    def save(self, path):
+        os.makedirs(path, exist_ok=True)
+        for name in COLUMNS:
+            np.save(os.path.join(path, f"{name}.npy"), getattr(self, name))
+        with open(os.path.join(path, "meta.json"), "w") as f:
+            json.dump({"num_floors": self.num_floors, "guests": len(self)}, f)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        with open(os.path.join(path, "meta.json")) as f:
+            meta = json.load(f)
+        columns = {
+            name: np.load(
+                os.path.join(path, f"{name}.npy"), mmap_mode="r" if mmap else None
+            )
+            for name in COLUMNS
+        }
+        return cls(meta["num_floors"], **columns)
+
+    def interarrival(self, i):
+        """Time between the arrivals of guest i - 1 and guest i (inf after the last)."""
+        if i >= len(self):
+            return float("inf")
+        if i == 0:
+            return float(self.arrival_time[0])
+        return float(self.arrival_time[i] - self.arrival_time[i - 1])
+
+    def guest(self, i):
+        return GuestPlan(self, i)
+
+
+class GuestPlan:
+    """
+    Trace row of one guest. Replaces the random draws for this guest;
+    the floor changes are handed out in order.
+    """
+
+    def __init__(self, trace, i):
+        self.start_floor = int(trace.start_floor[i])
+        self.target = int(trace.target[i])
+        self.working_time = int(trace.working_time[i])
+        low, high = int(trace.change_offset[i]), int(trace.change_offset[i + 1])
+        self._after = trace.change_after[low:high].tolist()
+        self._targets = trace.change_target[low:high].tolist()
+        self._next = 0
+
+    def floor_change_after(self):
+        """Seconds of work until the next floor change, NO_CHANGE if there is none."""
+        if self._next < len(self._after):
+            return self._after[self._next]
+        return NO_CHANGE
+
+    def floor_change_target(self):
+        """Floor of the next floor change."""
+        target = self._targets[self._next]
+        self._next += 1
+        return target
+
+
+def open_trace(trace, num_floors, max_guests):
+    """
+    trace as given to a simulator: None, an ArrivalTrace or the path of a
+    saved one. Checks that it fits the building.
+    """
+    if trace is None:
+        return None
+    if isinstance(trace, (str, os.PathLike)):
+        trace = ArrivalTrace.load(trace)
+    if trace.num_floors > num_floors:
+        raise ValueError(
+            f"trace needs {trace.num_floors} floors, the building has {num_floors}"
+        )
+    if len(trace) < max_guests:
+        raise ValueError(f"trace has {len(trace)} guests, max_guests is {max_guests}")
+    return trace
+
+
+def generate_trace(
+    num_guests,
+    num_floors,
+    spawn_intervall,
+    seed=None,
+    no_floor_zero=False,
+    floor_change_probability=FLOOR_CHANGE_PROBABILITY,
+):
+    """
+    Draws a whole day at once with the distributions of the live simulators:
+    Poisson arrivals (num_guests per spawn_intervall on average), uniform
+    targets, uniform working times and geometric floor changes to a uniform
+    other floor. Only time on a floor counts as work here; the simulators
+    also count the trips, so a replayed guest may run out of working time
+    before its last floor changes.
+    """
+    random = RandomStreams(seed)
+    arrival_time = np.cumsum(
+        random.interarrival(spawn_intervall / num_guests, num_guests)
+    )
+    floors = np.arange(1 if no_floor_zero else 0, num_floors)
+    target = floors[random.destination(len(floors), num_guests)]
+    working_time = random.working_time(num_guests)
+
+    # One round per floor change: the next change of every guest still working
+    guests, afters, targets = [], [], []
+    remaining = working_time.copy()
+    floor = target.copy()
+    active = np.arange(num_guests) if len(floors) > 1 else np.zeros(0, dtype=np.int64)
+    while active.size:
+        after = random.floor_change_after(floor_change_probability, active.size)
+        changing = after < np.maximum(remaining[active], 1)
+        active, after = active[changing], after[changing]
+        idx = random.floor_change_target(len(floors) - 1, active.size)
+        position = floor[active] - floors[0]
+        new_floor = floors[idx + (idx >= position)]
+        remaining[active] -= after
+        floor[active] = new_floor
+        guests.append(active)
+        afters.append(after)
+        targets.append(new_floor)
+
+    guests = np.concatenate(guests) if guests else np.zeros(0, dtype=np.int64)
+    # Stable sort keeps the rounds of every guest in order
+    order = np.argsort(guests, kind="stable")
+    counts = np.bincount(guests, minlength=num_guests)
+    return ArrivalTrace.from_arrays(
+        num_floors,
+        arrival_time,
+        target,
+        working_time,
+        change_offset=np.concatenate([[0], np.cumsum(counts)]),
+        change_after=np.concatenate(afters)[order] if afters else np.zeros(0),
+        change_target=np.concatenate(targets)[order] if targets else np.zeros(0),
+    )
+
+
+def generate_traces(out_dir, seeds, **params):
+    """Writes one trace per seed to out_dir/seed_<seed>; returns the paths."""
+    paths = []
+    for seed in seeds:
+        path = os.path.join(out_dir, f"seed_{seed}")
+        generate_trace(seed=seed, **params).save(path)
+        paths.append(path)
+    return paths
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Writes arrival traces for replay (Building(trace=...))."
+    )
+    parser.add_argument("out_dir")
+    parser.add_argument("--seeds", type=int, default=10, help="number of traces")
+    parser.add_argument("--first_seed", type=int, default=0)
+    parser.add_argument("--num_guests", type=int, default=200)
+    parser.add_argument("--num_floors", type=int, default=10)
+    parser.add_argument("--spawn_intervall", type=float, default=7200)
+    parser.add_argument("--no_floor_zero", action="store_true")
+    args = parser.parse_args(argv)
+
+    paths = generate_traces(
+        args.out_dir,
+        range(args.first_seed, args.first_seed + args.seeds),
+        num_guests=args.num_guests,
+        num_floors=args.num_floors,
+        spawn_intervall=args.spawn_intervall,
+        no_floor_zero=args.no_floor_zero,
+    )
+    print(f"{len(paths)} traces written to {args.out_dir}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,8 +4,12 @@ import pygame
 import numpy as np
 import Dispatcher
 import Elevator
+from HallCalls import HallCalls
 from Guest import Guest
-import keyboard
+from ArrivalTrace import open_trace
+from RandomStreams import RandomStreams
+from TripLog import TripLog
+from TripStats import TripStats
 import time
 
 
@@ -31,15 +35,16 @@ class Building:
         no_floor_zero=False,
         spawn_intervall=120,
         stair_speed=3,
+        seed=None,
+        trace=None,
+        profile=None,
+        dispatch="random",
     ):
         # 1) Regular SimPy environment, not real-time
         self.env = env or simpy.Environment()
         self.no_floor_zero = no_floor_zero
-        # 2) Pygame base configuration
+        # 2) Pygame base configuration (screen=None: headless, see batch_run.py)
         self.screen = screen
-        self.clock = pygame.time.Clock()
-        pygame.font.init()
-        self.font = pygame.font.SysFont(None, 24)
 
         # 3) Parameters
         self.num_floors = num_floors
@@ -55,10 +60,23 @@ class Building:
         self.max_guests = max_guests
         self.working_time = working_time
         self.people_left_building = 0
+        # Random streams of this run (seed=None: fresh entropy)
+        self.random = RandomStreams(seed)
+        # Replay: guests come from an ArrivalTrace (or its path) instead
+        self.trace = open_trace(trace, num_floors, max_guests)
+        # Time-varying traffic: a TrafficProfile samples the whole day as a trace
+        if profile is not None:
+            if self.trace is not None:
+                raise ValueError("Pass either trace or profile")
+            self.trace = profile.sample(
+                max_guests, num_floors, self.random, no_floor_zero != "False"
+            )
         # 4) Helper structures
         self.floor_counts = [0] * num_floors
         self.riders = []
-        self.logs = []
+        self.logs = TripLog()
+        # Online wait/travel statistics, fed as guests board and arrive
+        self.trip_stats = TripStats()
         # 5) Geometry
         self.floor_height = building_height / num_floors
         self.building_x = waiting_area_width + 50
@@ -80,8 +98,8 @@ class Building:
         # 7) Queues
         self.dispatcher_queue = simpy.Store(self.env)
         self.elevator_queues = [simpy.Store(self.env) for _ in range(num_elevators)]
-        self.pickup_queue = []
-        self.mutex = simpy.Resource(env, capacity=1)
+        # Open ride requests of all elevators per floor and direction
+        self.hall_calls = HallCalls(self.num_floors)
         # 8) Elevators & Dispatcher
         self.elevators = []
         for idx, q in enumerate(self.elevator_queues):
@@ -91,20 +109,29 @@ class Building:
                 capacity=elevator_capacity,
                 door_time=door_time,
                 id=idx,
-                pickup_queue=self.pickup_queue,
-                mutex=self.mutex,
+                hall_calls=self.hall_calls,
                 max_floor=self.num_floors - 1,
             )
             self.elevators.append(elev)
-        self.dispatcher = Dispatcher.Dispatcher(
-            self.env, self.dispatcher_queue, self.elevator_queues
+        # Dispatch strategy, see Dispatcher.DISPATCHERS
+        self.dispatcher = Dispatcher.create_dispatcher(
+            dispatch, self.env, self.dispatcher_queue, self.elevators, self.random
         )
         self.stop_event = self.env.event()
         # 9) Start processes
         self.env.process(self.guest_spawner())
         self.env.process(self.dispatcher.run())
 
-        # 10) Load graphics
+        # 10) Graphics & buttons, only with a window
+        self.visualize_every = visualize_every
+        if self.screen is not None:
+            self._setup_graphics()
+
+    def _setup_graphics(self):
+        shaft_width = self.shaft_width
+        self.clock = pygame.time.Clock()
+        pygame.font.init()
+        self.font = pygame.font.SysFont(None, 24)
         self.elevator_img = pygame.transform.scale(
             pygame.image.load("elevator.bmp").convert(),
             (shaft_width, self.floor_height),
@@ -118,9 +145,6 @@ class Building:
             pygame.image.load("stick_1.bmp").convert_alpha(),
             (self.GUEST_SIZE, self.GUEST_SIZE),
         )
-
-        # 11) Visualization interval & buttons
-        self.visualize_every = visualize_every
         self._setup_buttons()
 
     def _setup_buttons(self):
@@ -133,15 +157,14 @@ class Building:
 
     def log(self, time, guest_id, mode, wait_time, travel_time):
         """Writes a log entry."""
-        self.logs.append(
-            {
-                "time": time,
-                "guest_id": guest_id,
-                "mode": mode,  # 'elevator_waiting', 'elevator_drive' or 'stairs'
-                "wait_time": wait_time,  # None if not relevant
-                "travel_time": travel_time,  # None if not relevant
-            }
-        )
+        # mode: 'elevator_waiting', 'elevator_drive' or 'stairs'
+        # wait_time / travel_time: None if not relevant
+        self.logs.append(time, guest_id, mode, wait_time, travel_time)
+
+    @property
+    def capacity_exceeded(self):
+        """Hall calls that full elevators left waiting at their stops (all elevators)."""
+        return sum(elevator.capacity_exceeded for elevator in self.elevators)
 
     def guest_spawner(self):
         gid = 0
@@ -155,14 +178,22 @@ class Building:
                 continue
 
             # Exponential interval
-            lam = self.max_guests / self.spawn_intervall
-            mean_inter = 1 / lam
-            inter = np.random.exponential(mean_inter)
+            if self.trace is not None:
+                inter = self.trace.interarrival(gid)
+            else:
+                lam = self.max_guests / self.spawn_intervall
+                mean_inter = 1 / lam
+                inter = self.random.interarrival(mean_inter)
             yield self.env.timeout(inter)
 
             # Create guest
             g = Guest(
-                self.env, gid, self, self.no_floor_zero, working_time=self.working_time
+                self.env,
+                gid,
+                self,
+                self.no_floor_zero,
+                working_time=self.working_time,
+                plan=None if self.trace is None else self.trace.guest(gid),
             )
             self.riders.append(g)
             gid += 1
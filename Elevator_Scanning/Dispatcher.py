@@ -1,27 +1,51 @@
 import simpy
-import random
 import RideRequest, DestinationRequest
 
 
 class Dispatcher:
+    """
+    Assigns every hall call (RideRequest) to an elevator and forwards
+    destination requests to the elevator the guest rides in.
+    The base class assigns at random; the subclasses below choose the
+    elevator with the lowest cost(elevator, floor, direction, target).
+
+    Besides the live elevator state (current_floor, direction, riders,
+    pickups) the dispatcher keeps its own per-elevator model, updated
+    incrementally by callbacks on the request events:
+    assigned[e]: hall calls given to e that nobody answered yet (including
+    those still in e's queue, which e.pickups does not show yet);
+    destinations[e][f]: guests in e that ride to floor f.
+    A choice therefore costs O(elevators).
+    """
 
     def __init__(
         self,
         env: simpy.Environment,
         dispatcher_queue: simpy.Store,
         elevator_queues: list,
+        random=None,
+        elevators=None,
     ):
         """
         :param env: SimPy environment
         :param dispatcher_queue: Store where Guests place their requests
         :param elevator_queues: List of Stores, one per elevator
+        :param random: RandomStreams of the building
+        :param elevators: Elevator objects (needed by all but the random strategy)
         """
         self.env = env
         self.dispatcher_queue = dispatcher_queue
         self.elevator_queues = elevator_queues
-        # Elevator instances are ideally managed externally
-        # Here we only need their queues
+        self.elevators = elevators
         self.num_elevators = len(elevator_queues)
+        self.random = random
+        self.assigned = [0] * self.num_elevators
+        self.destinations = None
+        if elevators:
+            num_floors = elevators[0].max_floor + 1
+            self.destinations = [[0] * num_floors for _ in elevators]
+        # Hall calls assigned per elevator over the whole run
+        self.assignments = [0] * self.num_elevators
 
     def run(self):
         """Main process of the dispatcher."""
@@ -30,22 +54,193 @@ class Dispatcher:
 
             # 1) First elevator call
             if isinstance(req, RideRequest.RideRequest):
-                # Choose a random elevator
-                eid = random.randrange(self.num_elevators)
-                # Remember which elevator the guest will use
-                req.guest.elevator_id = eid
+                eid = self.choose_elevator(req)
+                self._assign(req, eid)
                 # Put the request in the corresponding elevator queue
                 yield self.elevator_queues[eid].put(req)
 
             # 2) Destination floor notification
             elif isinstance(req, DestinationRequest.DestinationRequest):
-                # We assume the guest has already set req.guest.elevator_id
+                # The elevator that boarded the guest set req.guest.elevator_id
                 eid = req.guest.elevator_id
                 # Optionally check if eid is valid
                 if 0 <= eid < self.num_elevators:
+                    self._track_destination(req, eid)
                     yield self.elevator_queues[eid].put(req)
 
             else:
                 # Unknown request type
                 print(f"{self.env.now}: Dispatcher received unknown request {req}")
                 continue
+
+    def choose_elevator(self, req):
+        """Random elevator; subclasses pick the cheapest one."""
+        return self.random.elevator(self.num_elevators)
+
+    def _assign(self, req, eid):
+        # Remember which elevator the guest will use
+        req.guest.elevator_id = eid
+        self.assignments[eid] += 1
+        self.assigned[eid] += 1
+
+        def answered(event):
+            self.assigned[eid] -= 1
+
+        # Boarded, by any elevator (a full one leaves the call registered)
+        req.boarded_event.callbacks.append(answered)
+
+    def _track_destination(self, req, eid):
+        if self.destinations is None:
+            return
+        destinations = self.destinations[eid]
+        floor = req.target_floor
+        destinations[floor] += 1
+
+        def arrived(event):
+            destinations[floor] -= 1
+
+        req.arrived_event.callbacks.append(arrived)
+
+    # Helpers for the cost functions
+
+    def load(self, eid):
+        """Guests in elevator eid plus hall calls it still has to answer."""
+        return len(self.elevators[eid].riders) + self.assigned[eid]
+
+    def is_idle(self, eid):
+        elevator = self.elevators[eid]
+        return not elevator.riders and not elevator.pickups and not self.assigned[eid]
+
+    def path_floors(self, eid, floor, direction):
+        """
+        Floors elevator eid travels on its SCAN path until it is at floor
+        heading in direction. Reversals are assumed at the top and bottom
+        floor, so this is an upper bound.
+        """
+        elevator = self.elevators[eid]
+        current = elevator.current_floor
+        if self.is_idle(eid):
+            return abs(floor - current)
+        top, bottom = elevator.max_floor, elevator.min_floor
+        if elevator.direction == 1:
+            if direction == 1 and floor >= current:
+                return floor - current
+            if direction == -1:
+                return (top - current) + (top - floor)
+            return (top - current) + (top - bottom) + (floor - bottom)
+        if direction == -1 and floor <= current:
+            return current - floor
+        if direction == 1:
+            return (current - bottom) + (floor - bottom)
+        return (current - bottom) + (top - bottom) + (top - floor)
+
+
+class CostDispatcher(Dispatcher):
+    """
+    Base of the strategies that assign a call to its cheapest elevator.
+    Subclasses define cost(eid, floor, direction, target), any comparable
+    value (lower is better).
+    """
+
+    def choose_elevator(self, req):
+        guest = req.guest
+        floor = guest.current_floor
+        direction = 1 if guest.target_floor > floor else -1
+        # Ties: fewer guests to serve, then the lower id
+        return min(
+            range(self.num_elevators),
+            key=lambda eid: (
+                self.cost(eid, floor, direction, guest.target_floor),
+                self.load(eid),
+                eid,
+            ),
+        )
+
+
+class NearestCarDispatcher(CostDispatcher):
+    """
+    Nearest car by figure of suitability (N = floors - 1, d = distance):
+    N + 2 - d for a car moving towards the call in the call's direction,
+    N + 1 - d for a car moving towards it in the other direction or idle,
+    1 for a car moving away. The highest figure wins.
+    """
+
+    def cost(self, eid, floor, direction, target):
+        elevator = self.elevators[eid]
+        n = elevator.max_floor - elevator.min_floor
+        distance = abs(floor - elevator.current_floor)
+        if self.is_idle(eid):
+            return -(n + 1 - distance)
+        towards = (floor - elevator.current_floor) * elevator.direction >= 0
+        if not towards:
+            return -1
+        if elevator.direction == direction:
+            return -(n + 2 - distance)
+        return -(n + 1 - distance)
+
+
+class CollectiveDispatcher(CostDispatcher):
+    """
+    Directional collective control: a car that sweeps past the floor in the
+    call's direction and has room collects the call on its way, else an
+    idle car comes, else the car that gets there first on its SCAN path.
+    """
+
+    def cost(self, eid, floor, direction, target):
+        elevator = self.elevators[eid]
+        distance = abs(floor - elevator.current_floor)
+        if self.is_idle(eid):
+            return (1, distance)
+        on_its_way = (
+            elevator.direction == direction
+            and (floor - elevator.current_floor) * direction >= 0
+        )
+        if on_its_way and self.load(eid) < elevator.capacity:
+            return (0, distance)
+        return (2, self.path_floors(eid, floor, direction))
+
+
+class EtaDispatcher(CostDispatcher):
+    """
+    Estimated time of arrival with the destination known at the call
+    (destination dispatch): seconds of SCAN travel to the call plus one stop
+    per guest the car still has to pick up or drop off, plus the delay the
+    new stops add for everybody on board. Guests riding to the same target
+    share its stop, so calls with a common destination end up in one car.
+    A car without room is charged a full round trip.
+    """
+
+    def cost(self, eid, floor, direction, target):
+        elevator = self.elevators[eid]
+        stop_time = 2 * elevator.door_time
+        eta = self.path_floors(eid, floor, direction) * elevator.floor_time
+        eta += stop_time * self.load(eid)
+        new_stops = 1 + (self.destinations[eid][target] == 0)
+        delay = stop_time * new_stops * len(elevator.riders)
+        if self.load(eid) >= elevator.capacity:
+            round_trip = 2 * (elevator.max_floor - elevator.min_floor)
+            eta += round_trip * elevator.floor_time
+        return eta + delay
+
+
+DISPATCHERS = {
+    "random": Dispatcher,
+    "nearest": NearestCarDispatcher,
+    "collective": CollectiveDispatcher,
+    "eta": EtaDispatcher,
+}
+
+
+def create_dispatcher(name, env, dispatcher_queue, elevators, random):
+    """Dispatcher of strategy name (see DISPATCHERS) for the elevators."""
+    if name not in DISPATCHERS:
+        raise ValueError(
+            f"Unknown dispatch strategy {name!r}, use one of {list(DISPATCHERS)}"
+        )
+    return DISPATCHERS[name](
+        env,
+        dispatcher_queue,
+        [elevator.queue for elevator in elevators],
+        random,
+        elevators=elevators,
+    )
@@ -1,7 +1,5 @@
 import simpy
 import RideRequest, DestinationRequest
-from ElevatorException import ElevatorFull
-import copy
 
 
 class Elevator:
@@ -10,10 +8,10 @@ class Elevator:
         self,
         env: simpy.Environment,
         queue: simpy.Store,
-        pickup_queue,
-        mutex: simpy.Resource,
+        hall_calls,
         capacity: int = 5,
         door_time: float = 0.08,
+        floor_time: float = 4,
         id: int = 0,
         min_floor: int = 0,
         max_floor: int = 9,
@@ -22,17 +20,22 @@ class Elevator:
         self.queue = queue
         self.capacity = capacity
         self.door_time = door_time
+        self.floor_time = floor_time  # seconds per floor
         self.current_floor = min_floor
         self.min_floor = min_floor
         self.max_floor = max_floor
         self.direction = 1  # 1 = up, -1 = down
         self.id = id
         self.riders = []  # guests in the elevator
-        self.pickups = []  # RideRequest objects
-        self.dropoffs = []  # DestinationRequest objects
+        # Ordered sets (dict keys) of RideRequest and DestinationRequest objects;
+        # pickups: calls this elevator was assigned and has not seen answered
+        self.pickups = {}
+        self.dropoffs = {}
         self.door = False
-        self.pickup_queue = pickup_queue
-        self.mutex = mutex
+        # Hall calls this elevator left waiting because it was full (per stop)
+        self.capacity_exceeded = 0
+        # HallCalls shared by all elevators of the building
+        self.hall_calls = hall_calls
         # Start elevator process
         env.process(self.run_elevator())
 
@@ -56,14 +59,14 @@ class Elevator:
         while self.queue.items:
             req = yield self.queue.get()
             if isinstance(req, RideRequest.RideRequest):
-                req.floor = req.guest.current_floor
-                self.pickups.append(req)
-                req_event = self.mutex.request()
-                yield req_event
-                self.pickup_queue.append(req)
-                yield self.mutex.release(req_event)
+                guest = req.guest
+                req.floor = guest.current_floor
+                req.direction = 1 if guest.target_floor > req.floor else -1
+                req.elevator = self
+                self.pickups[req] = None
+                self.hall_calls.add(req)
             elif isinstance(req, DestinationRequest.DestinationRequest):
-                self.dropoffs.append(req)
+                self.dropoffs[req] = None
 
     def _should_stop_here(self) -> bool:
         """Returns True if the elevator should open doors at the current floor."""
@@ -108,76 +111,24 @@ class Elevator:
         # Guests exit
         for req in list(self.dropoffs):
             if req.target_floor == self.current_floor:
-                self.dropoffs.remove(req)
+                del self.dropoffs[req]
                 req.arrived_event.succeed()
                 if req.guest in self.riders:
                     self.riders.remove(req.guest)
 
-        req_event = self.mutex.request()
-        print("ElevatorRequestsID " + str(self.id))
-        yield req_event
-        que = copy.copy(self.pickup_queue)
-
-        print("Elevator has mutex: " + str(self.id))
-        for req in que:
-            direction = 1 if req.guest.target_floor > self.current_floor else -1
-            if req.floor == self.current_floor and direction == self.direction:
-                if (
-                    len(self.riders) < self.capacity
-                    and (req.guest.current_floor == self.current_floor)
-                    and (
-                        req.guest.state == "waiting"
-                        or req.guest.state == "waiting_on_floor"
-                    )
-                ):
-                    self.pickup_queue.remove(req)
-                    self.riders.append(req.guest)
-                    req.guest.elevator_id = self.id
-                    print("Elevator: " + str(self.id) + "Request: " + str(req))
-                    req.boarded_event.succeed()
-                    if req in self.pickups:
-                        self.pickups.remove(req)
-                elif (
-                    req.guest.state == "waiting"
-                    or req.guest.state == "waiting_on_floor"
-                ):
-                    self.pickup_queue.remove(req)
-                    if req in self.pickups:
-                        self.pickups.remove(req)
-                    req.boarded_event.fail(
-                        ElevatorFull(f"Elevator {self.id} is full ({self.capacity})")
-                    )
-
-        # Boarding
-        for req in list(self.pickups):
-            direction = 1 if req.guest.target_floor > self.current_floor else -1
-            if req.floor == self.current_floor and direction == self.direction:
-                self.pickups.remove(req)
-                if req not in self.pickup_queue:
-                    continue
-                elif (
-                    (len(self.riders) < self.capacity)
-                    and (req.guest.current_floor == self.current_floor)
-                    and (
-                        req.guest.state == "waiting"
-                        or req.guest.state == "waiting_on_floor"
-                    )
-                ):
-                    self.riders.append(req.guest)
-                    req.guest.elevator_id = self.id
-                    req.boarded_event.succeed()
-                    self.pickup_queue.remove(req)
-                elif (
-                    req.guest.state != "waiting"
-                    and req.guest.state != "waiting_on_floor"
-                ):
-                    self.pickup_queue.remove(req)
-                else:
-                    self.pickup_queue.remove(req)
-                    req.boarded_event.fail(
-                        ElevatorFull(f"Elevator {self.id} is full ({self.capacity})")
-                    )
-        self.mutex.release(req_event)
+        # Hall calls on this floor in travel direction, of any elevator:
+        # the oldest board while there is room
+        free = self.capacity - len(self.riders)
+        for req in self.hall_calls.claim(self.current_floor, self.direction, free):
+            req.elevator.pickups.pop(req, None)
+            self.riders.append(req.guest)
+            req.guest.elevator_id = self.id
+            req.boarded_event.succeed()
+        # The others stay registered on the floor (and with the elevator that
+        # collected them) until a car with room comes by
+        self.capacity_exceeded += self.hall_calls.waiting(
+            self.current_floor, self.direction
+        )
 
         # Doors close
         yield self.env.timeout(self.door_time)
@@ -196,11 +147,10 @@ class Elevator:
 
             if next_floor == self.max_floor or next_floor == self.min_floor:
                 self.direction *= -1
-            # Travel time: exactly 1 second per floor
             if next_floor < self.min_floor:
                 next_floor = self.min_floor
                 self.direction == 1
 
             # Update current floor
             self.current_floor = next_floor
-            yield self.env.timeout(4)
+            yield self.env.timeout(self.floor_time)
@@ -1,2 +0,0 @@
-class ElevatorFull(Exception):
-    pass
\ No newline at end of file
@@ -1,16 +1,34 @@
 import simpy
-import numpy as np
-from ElevatorException import ElevatorFull
 import RideRequest
 import DestinationRequest
 import Wait
 import math
-import random
 
 
 class Guest:
     StdToleranceRequest = 5.0
     StdToleranceWorking = 50
+    # Chance per second of work to change floors
+    FloorChangeProbability = 0.000555
+    # True: old loop with one timeout per second (reference for benchmark_guest_events.py)
+    PerSecondWork = False
+    # No per-instance __dict__: a day creates thousands of guests
+    __slots__ = (
+        "env",
+        "id",
+        "building",
+        "plan",
+        "state",
+        "current_floor",
+        "no_floor_zero",
+        "target_floor",
+        "waiting_index",
+        "floor_index",
+        "elevator_id",
+        "remaining_time",
+        "working_time",
+        "process",
+    )
 
     def __init__(
         self,
@@ -19,15 +37,39 @@ class Guest:
         building,
         no_floor_zero=False,
         working_time=5,
+        plan=None,
     ):
         self.env = env
         self.id = guest_id
         self.building = building
+        # GuestPlan of a replayed trace, None: random draws
+        self.plan = plan
 
         self.state = "None"  # possible values: waiting, in_elevator, on_floor, left, waiting_on_floor
         self.current_floor = 0
         self.no_floor_zero = no_floor_zero
 
+        if plan is not None:
+            self.current_floor = plan.start_floor
+            self.target_floor = plan.target
+            self.remaining_time = plan.working_time
+        else:
+            self.target_floor = self._random_target()
+            self.remaining_time = building.random.working_time()
+        building.floor_counts[self.target_floor] += 1
+
+        # Graphics-related indices
+        self.waiting_index = len(building.riders)
+        self.floor_index = None
+        self.elevator_id = None
+        # Parameters
+        self.working_time = working_time  # time to spend on the floor
+
+        # Start the guest process
+        self.process = env.process(self.run())
+
+    def _random_target(self):
+        building = self.building
         if self.no_floor_zero != "False":
             # Calculate maximum number of people allowed per floor (without floor zero)
             max_val = math.ceil(building.max_guests / (building.num_floors - 1))
@@ -47,35 +89,40 @@ class Guest:
                     all_possible_indices.append(i)
 
         # Randomly select a target floor from possible indices
-        self.target_floor = int(np.random.choice(all_possible_indices))
-        building.floor_counts[self.target_floor] += 1
+        return all_possible_indices[
+            building.random.destination(len(all_possible_indices))
+        ]
 
-        # Graphics-related indices
-        self.waiting_index = len(building.riders)
-        self.floor_index = None
-        self.elevator_id = None
-        self.remaining_time = random.randint(22800, 34700)
-        # Parameters
-        self.working_time = working_time  # time to spend on the floor
+    def _random_change_target(self):
+        if self.no_floor_zero != "False":
+            # Find all possible floor indices (excluding zero)
+            all_possible_indices = []
+            for i in range(1, self.building.num_floors):
+                all_possible_indices.append(i)
+        else:
+            # Find all possible floor indices (including zero)
+            all_possible_indices = []
+            for i in range(self.building.num_floors):
+                all_possible_indices.append(i)
 
-        # Start the guest process
-        self.process = env.process(self.run())
+        # Move to another floor (excluding the current one)
+        all_possible_indices.remove(self.current_floor)
+        return all_possible_indices[
+            self.building.random.floor_change_target(len(all_possible_indices))
+        ]
 
     def call_elevator(self, waiting_state="waiting"):
         """
-        Requests the elevator and waits until the guest can board.
+        Requests the elevator and waits until the guest can board. A full
+        elevator leaves the call registered on the floor (see HallCalls),
+        so one request per trip is enough.
         Returns (start_waiting, end_waiting).
         """
         start_waiting = self.env.now
-        while True:
-            try:
-                self.state = waiting_state
-                req = RideRequest.RideRequest(self)
-                yield self.building.dispatcher_queue.put(req)
-                yield req.boarded_event
-                break
-            except ElevatorFull:
-                continue
+        self.state = waiting_state
+        req = RideRequest.RideRequest(self)
+        yield self.building.dispatcher_queue.put(req)
+        yield req.boarded_event
         end_waiting = self.env.now
         return start_waiting, end_waiting
 
@@ -95,55 +142,76 @@ class Guest:
             wait_time=wt,
             travel_time=travel_time,
         )
+        self.building.trip_stats.add_wait(start_waiting, wt)
+        self.building.trip_stats.add_ride(start_waiting, wt, travel_time)
         self.current_floor = target_floor
         self.state = "on_floor"
 
     def work_and_maybe_move(self):
         # Guest works on the floor and may decide to change floors
+        if self.PerSecondWork and self.plan is None:
+            yield from self._work_per_second()
+            return
+        while self.remaining_time > 0:
+            # The per-second loop ends after ceil(remaining_time) timeouts,
+            # its first floor change is geometrically distributed: one timeout
+            # for whichever comes first
+            work_left = math.ceil(self.remaining_time)
+            change_after = work_left + 1
+            if self.plan is not None:
+                change_after = self.plan.floor_change_after()
+            elif self.building.num_floors > 1:
+                change_after = int(
+                    self.building.random.floor_change_after(self.FloorChangeProbability)
+                )
+            if change_after > work_left:
+                yield self.env.timeout(work_left)
+                self.remaining_time -= work_left
+                break
+            yield self.env.timeout(change_after)
+            self.remaining_time -= change_after
+            yield from self._change_floor()
+
+    def _work_per_second(self):
         while self.remaining_time > 0:
             yield self.env.timeout(1)
             self.remaining_time -= 1
 
             # With small probability, guest decides to change floors (if more than 1 floor)
-            if self.building.num_floors > 1 and random.random() < 0.000555:
-                if self.no_floor_zero != "False":
-                    # Find all possible floor indices (excluding zero)
-                    all_possible_indices = []
-                    for i in range(1, self.building.num_floors):
-                        all_possible_indices.append(i)
-                else:
-                    # Find all possible floor indices (including zero)
-                    all_possible_indices = []
-                    for i in range(self.building.num_floors):
-                        all_possible_indices.append(i)
-
-                # Move to another floor (excluding the current one)
-                all_possible_indices.remove(self.current_floor)
-                self.target_floor = int(np.random.choice(all_possible_indices))
-                self.building.floor_counts[self.target_floor] += 1
-                self.building.floor_counts[self.current_floor] -= 1
-                self.state = "waiting_on_floor"
-                start_waiting, end_waiting = yield from self.call_elevator(
-                    "waiting_on_floor"
-                )
-                wt = end_waiting - start_waiting
-
-                self.building.log(
-                    time=start_waiting,
-                    guest_id=self.id,
-                    mode="elevator_waiting",
-                    wait_time=wt,
-                    travel_time=None,
-                )
+            if (
+                self.building.num_floors > 1
+                and self.building.random.floor_changes.random()
+                < self.FloorChangeProbability
+            ):
+                yield from self._change_floor()
+
+    def _change_floor(self):
+        if self.plan is not None:
+            self.target_floor = self.plan.floor_change_target()
+        else:
+            self.target_floor = self._random_change_target()
+        self.building.floor_counts[self.target_floor] += 1
+        self.building.floor_counts[self.current_floor] -= 1
+        self.state = "waiting_on_floor"
+        start_waiting, end_waiting = yield from self.call_elevator("waiting_on_floor")
+        wt = end_waiting - start_waiting
+
+        self.building.log(
+            time=start_waiting,
+            guest_id=self.id,
+            mode="elevator_waiting",
+            wait_time=wt,
+            travel_time=None,
+        )
 
-                yield from self.ride_elevator(self.target_floor, start_waiting, wt)
-                total_traveltime = self.env.now - start_waiting
-                self.remaining_time -= total_traveltime
+        yield from self.ride_elevator(self.target_floor, start_waiting, wt)
+        total_traveltime = self.env.now - start_waiting
+        self.remaining_time -= total_traveltime
 
     def run(self):
         # Main process for a guest
         self.state = "waiting"
-        if self.target_floor == 0:
+        if self.target_floor == self.current_floor:
             self.state = "on_floor"
         else:
             # Initial ride to the target floor
@@ -0,0 +1,44 @@
+from itertools import islice
+
+UP = 1
+DOWN = -1
+
+
+class HallCalls:
+    """
+    Open hall calls (RideRequest objects) of all elevators, indexed by
+    floor and direction, oldest first (dicts as ordered sets).
+    SimPy runs one process at a time and nothing here yields, so claiming
+    needs no lock: the first elevator that claims a call has it.
+    """
+
+    def __init__(self, num_floors):
+        self._calls = [{UP: {}, DOWN: {}} for _ in range(num_floors)]
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def add(self, req):
+        """Registers req on req.floor in req.direction (both set by the elevator)."""
+        calls = self._calls[req.floor][req.direction]
+        if req not in calls:
+            calls[req] = None
+            self._count += 1
+
+    def waiting(self, floor, direction):
+        """Number of open calls on floor in direction."""
+        return len(self._calls[floor][direction])
+
+    def claim(self, floor, direction, n=None):
+        """Takes up to n (default: all) calls on floor in direction, oldest first."""
+        calls = self._calls[floor][direction]
+        if n is None or n >= len(calls):
+            claimed = list(calls)
+            calls.clear()
+        else:
+            claimed = list(islice(calls, max(n, 0)))
+            for req in claimed:
+                del calls[req]
+        self._count -= len(claimed)
+        return claimed
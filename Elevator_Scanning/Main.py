@@ -5,6 +5,7 @@ from Building import Building
 import tkinter as tk
 from tkinter import ttk, messagebox
 from Visualization import (
+    EpisodeAnalytics,
     plot_travel_times_per_hour,
     plot_wait_times_per_hour,
     plot_total_travel_times_per_hour,
@@ -75,6 +76,7 @@ def main():
         "screen_height": (int, 800),
         "no_floor_zero": (str, "False"),
         "spawn_intervall": (int, 7200),
+        "dispatch": (str, "random"),
     }
     params = get_simulation_params(parameter_definitions)
 
@@ -105,6 +107,7 @@ def main():
         working_time=params["working_time"],
         no_floor_zero=params["no_floor_zero"],
         spawn_intervall=params["spawn_intervall"],
+        dispatch=params["dispatch"],
     )
 
     # 4) Run simulation until stop_event
@@ -113,12 +116,13 @@ def main():
 
     # Visualization of results
     ep = 11
-    plot_wait_times_per_hour(building.logs, ep)
-    plot_travel_times_per_hour(building.logs, ep)
-    plot_total_travel_times_per_hour(building.logs, ep)
-    plot_guest_counts_per_hour(building.logs, ep)
-    plot_average_total_time_per_hour(building.logs, ep)
-    append_episode_stats(building.logs, ep)
+    analytics = EpisodeAnalytics(building.logs)
+    plot_wait_times_per_hour(analytics, ep)
+    plot_travel_times_per_hour(analytics, ep)
+    plot_total_travel_times_per_hour(analytics, ep)
+    plot_guest_counts_per_hour(analytics, ep)
+    plot_average_total_time_per_hour(analytics, ep)
+    append_episode_stats(analytics, ep)
     # 5) Cleanup
     pygame.quit()
     sys.exit()
@@ -2,4 +2,8 @@ class RideRequest:
     def __init__(self, guest):
         self.guest         = guest
         self.boarded_event = guest.env.event()
-        self.arrived_event = guest.env.event()
\ No newline at end of file
+        self.arrived_event = guest.env.event()
+        # Set by the elevator that collects the call (see HallCalls)
+        self.floor         = None
+        self.direction     = None
+        self.elevator      = None
@@ -0,0 +1,186 @@
+import numpy as np
+from RandomStreams import RandomStreams
+from ArrivalTrace import ArrivalTrace
+
+HOUR = 3600
+
+# (hour of day, rate from then on) of TrafficProfile.office_day; arrivals and
+# departures are relative, interfloor is in floor changes per guest and hour
+OFFICE_DAY = {
+    "arrivals": [(7, 2), (7.5, 6), (8, 10), (8.5, 8), (9, 4), (9.5, 2), (10, 1), (12, 0.5), (16, 0)],
+    "departures": [(7, 0.05), (11, 0.3), (15, 1), (16, 3), (16.5, 8), (17, 10), (17.5, 7), (18, 2), (18.5, 0.5)],
+    "interfloor": [(7, 1), (11.5, 3), (12, 5), (13, 3), (13.5, 1)],
+}  # fmt: skip
+
+
+class PiecewiseRate:
+    """
+    Rate per hour that is constant between breakpoints: rates[i] holds from
+    edges[i] to edges[i + 1] (seconds since the start of the simulation).
+    """
+
+    def __init__(self, edges, rates):
+        self.edges = np.asarray(edges, dtype=np.float64)
+        self.rates = np.asarray(rates, dtype=np.float64)
+        if len(self.edges) != len(self.rates) + 1 or np.any(np.diff(self.edges) <= 0):
+            raise ValueError("edges must be increasing and one longer than rates")
+        if np.any(self.rates < 0):
+            raise ValueError("rates must not be negative")
+        # Integrated rate at every edge
+        self.cumulative_at_edges = np.concatenate(
+            [[0.0], np.cumsum(self.rates * np.diff(self.edges) / HOUR)]
+        )
+
+    @classmethod
+    def from_steps(cls, steps, start_hour, end_hour):
+        """
+        steps: [(hour of day, rate from then on), ...]; 0 before the first
+        step. Time 0 of the simulation is start_hour.
+        """
+        edges, rates = [start_hour], [0.0]
+        for hour, rate in sorted(steps):
+            if hour <= start_hour:
+                rates[0] = rate
+            elif hour < end_hour:
+                edges.append(hour)
+                rates.append(rate)
+        edges.append(end_hour)
+        return cls((np.array(edges) - start_hour) * HOUR, rates)
+
+    @property
+    def end(self):
+        return self.edges[-1]
+
+    @property
+    def total(self):
+        return self.cumulative_at_edges[-1]
+
+    def at(self, t):
+        i = np.searchsorted(self.edges, t, side="right") - 1
+        return self.rates[np.clip(i, 0, len(self.rates) - 1)]
+
+    def cumulative(self, t):
+        """Expected number of events in [0, t]."""
+        return np.interp(t, self.edges, self.cumulative_at_edges)
+
+    def inverse(self, y):
+        """Inverse of cumulative() (first time it reaches y), for 0 <= y <= total."""
+        positive = self.rates > 0
+        starts = self.edges[:-1][positive]
+        low = self.cumulative_at_edges[:-1][positive]
+        rates = self.rates[positive]
+        i = np.clip(np.searchsorted(low, y, side="right") - 1, 0, len(low) - 1)
+        return starts[i] + (y - low[i]) / rates[i] * HOUR
+
+
+class TrafficProfile:
+    """
+    Time-varying traffic of one day, sampled as a whole into an ArrivalTrace
+    that the simulators replay (Building(profile=...), MultiElevatorEnv(profile=...)).
+
+    arrivals: rate of guests entering the building (shape only, a day has
+    exactly num_guests guests). departures: rate of leaving (shape only),
+    every guest leaves at least min_stay after arriving. interfloor: floor
+    changes per working guest and hour. entrances: {floor: weight} of the
+    floors guests enter on.
+    """
+
+    def __init__(self, arrivals, departures, interfloor, entrances=None, min_stay=HOUR):
+        self.arrivals = arrivals
+        self.departures = departures
+        self.interfloor = interfloor
+        self.entrances = entrances or {0: 1.0}
+        self.min_stay = min_stay
+
+    @classmethod
+    def office_day(cls, start_hour=7, end_hour=19, entrances=None):
+        """
+        Up-peak 8:00 to 9:00, inter-floor lunch traffic 11:30 to 13:30 and
+        down-peak 16:30 to 18:00. The default 12 hours fit into one
+        MultiElevatorEnv episode (45000 steps).
+        """
+        rates = [
+            PiecewiseRate.from_steps(OFFICE_DAY[name], start_hour, end_hour)
+            for name in ("arrivals", "departures", "interfloor")
+        ]
+        return cls(*rates, entrances)
+
+    def sample(self, num_guests, num_floors, random=None, no_floor_zero=False):
+        """
+        Draws one day of num_guests guests as an ArrivalTrace.
+        random: RandomStreams (e.g. of the simulation) or a seed.
+        Arrivals and departures are sampled by inversion of the integrated
+        rate, floor changes by thinning of a Poisson process at the peak rate.
+        """
+        if not isinstance(random, RandomStreams):
+            random = RandomStreams(random)
+        n = num_guests
+
+        # Arrivals: num_guests order statistics of the arrival density
+        u = np.sort(random.arrivals.random(n)) * self.arrivals.total
+        arrival_time = self.arrivals.inverse(u)
+
+        # Departures: departure density restricted to [arrival + min_stay, end]
+        low = self.departures.cumulative(arrival_time + self.min_stay)
+        high = self.departures.total
+        u = low + random.working_times.random(n) * np.maximum(high - low, 0)
+        departure = np.where(
+            high > low,
+            self.departures.inverse(u),
+            np.maximum(arrival_time + self.min_stay, self.departures.end),
+        )
+        working_time = np.maximum(np.rint(departure - arrival_time), 1).astype(np.int64)
+
+        # Entrance and target floors
+        floors = np.arange(1 if no_floor_zero else 0, num_floors)
+        entrance_floors = np.array(list(self.entrances), dtype=np.int64)
+        weights = np.cumsum(list(self.entrances.values()), dtype=np.float64)
+        pick = np.searchsorted(
+            weights, random.destinations.random(n) * weights[-1], side="right"
+        )
+        start_floor = entrance_floors[pick]
+        target = floors[random.destination(len(floors), n)]
+
+        # Floor changes: thinning, candidates at the peak rate over the stay
+        peak = self.interfloor.rates.max()
+        candidates = np.zeros(n, dtype=np.int64)
+        if len(floors) > 1 and peak > 0:
+            candidates = random.floor_changes.poisson(peak * working_time / HOUR)
+        guest = np.repeat(np.arange(n), candidates)
+        times = (
+            arrival_time[guest]
+            + random.floor_changes.random(guest.size) * working_time[guest]
+        )
+        accept = self.interfloor.at(times) / peak
+        keep = random.floor_changes.random(guest.size) < accept
+        guest, times = guest[keep], times[keep]
+        order = np.lexsort((times, guest))
+        guest, times = guest[order], times[order]
+
+        counts = np.bincount(guest, minlength=n)
+        change_offset = np.concatenate([[0], np.cumsum(counts)])
+        rank = np.arange(guest.size) - change_offset[guest]
+        previous_time = np.where(rank == 0, arrival_time[guest], np.roll(times, 1))
+        change_after = np.maximum(np.rint(times - previous_time), 1).astype(np.int64)
+
+        # Change targets round by round: the k-th change of every guest goes
+        # to another floor than the one the guest is on
+        change_target = np.zeros(guest.size, dtype=np.int64)
+        floor = target.copy()
+        for k in range(int(counts.max()) if guest.size else 0):
+            rows = np.flatnonzero(rank == k)
+            idx = random.floor_change_target(len(floors) - 1, rows.size)
+            position = floor[guest[rows]] - floors[0]
+            change_target[rows] = floors[idx + (idx >= position)]
+            floor[guest[rows]] = change_target[rows]
+
+        return ArrivalTrace.from_arrays(
+            num_floors,
+            arrival_time,
+            target,
+            working_time,
+            start_floor=start_floor,
+            change_offset=change_offset,
+            change_after=change_after,
+            change_target=change_target,
+        )
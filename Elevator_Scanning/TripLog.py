@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+
+# Mode codes of the "mode" column
+MODES = ("elevator_waiting", "elevator_drive", "stairs")
+MODE_CODES = {mode: code for code, mode in enumerate(MODES)}
+
+COLUMNS = ("time", "guest_id", "mode", "wait_time", "travel_time")
+DTYPES = {
+    "time": np.float64,
+    "guest_id": np.int64,
+    "mode": np.int8,
+    "wait_time": np.float64,  # NaN if not relevant
+    "travel_time": np.float64,  # NaN if not relevant
+}
+
+
+class TripLog:
+    """
+    Trip log stored column by column in preallocated NumPy arrays that double
+    when full. append() takes the same arguments as the old log dicts;
+    iterating still yields those dicts (None for missing times), while
+    columns() and to_dataframe() hand out views without copying.
+    """
+
+    def __init__(self, capacity=1024):
+        self._size = 0
+        self._data = {
+            name: np.empty(max(capacity, 1), dtype=dtype)
+            for name, dtype in DTYPES.items()
+        }
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for i in range(self._size):
+            yield self[i]
+
+    def __getitem__(self, i):
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("TripLog index out of range")
+        d = self._data
+        return {
+            "time": d["time"][i].item(),
+            "guest_id": d["guest_id"][i].item(),
+            "mode": MODES[d["mode"][i]],
+            "wait_time": _optional(d["wait_time"][i]),
+            "travel_time": _optional(d["travel_time"][i]),
+        }
+
+    def _reserve(self, extra):
+        needed = self._size + extra
+        capacity = len(self._data["time"])
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        for name, column in self._data.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[: self._size] = column[: self._size]
+            self._data[name] = grown
+
+    def append(self, time, guest_id, mode, wait_time, travel_time):
+        """Adds one entry. wait_time / travel_time may be None."""
+        self._reserve(1)
+        i = self._size
+        d = self._data
+        d["time"][i] = time
+        d["guest_id"][i] = guest_id
+        d["mode"][i] = MODE_CODES[mode]
+        d["wait_time"][i] = np.nan if wait_time is None else wait_time
+        d["travel_time"][i] = np.nan if travel_time is None else travel_time
+        self._size += 1
+
+    def extend(self, time, guest_id, mode, wait_time, travel_time):
+        """Adds many entries of one mode at once (array arguments, None allowed)."""
+        time = np.asarray(time)
+        n = time.size
+        self._reserve(n)
+        rows = slice(self._size, self._size + n)
+        d = self._data
+        d["time"][rows] = time
+        d["guest_id"][rows] = guest_id
+        d["mode"][rows] = MODE_CODES[mode]
+        d["wait_time"][rows] = np.nan if wait_time is None else wait_time
+        d["travel_time"][rows] = np.nan if travel_time is None else travel_time
+        self._size += n
+
+    def clear(self):
+        """Empties the log but keeps the allocated arrays."""
+        self._size = 0
+
+    def copy(self):
+        """Copy trimmed to the current length."""
+        log = TripLog(self._size)
+        for name, column in self._data.items():
+            log._data[name][: self._size] = column[: self._size]
+        log._size = self._size
+        return log
+
+    def columns(self):
+        """Views of the filled part of every column (no copy)."""
+        return {name: column[: self._size] for name, column in self._data.items()}
+
+    def mode_mask(self, mode):
+        return self._data["mode"][: self._size] == MODE_CODES[mode]
+
+    def to_dataframe(self):
+        """DataFrame over the column views; mode is categorical on the codes."""
+        columns = self.columns()
+        columns["mode"] = pd.Categorical.from_codes(columns["mode"], categories=MODES)
+        return pd.DataFrame(columns, columns=list(COLUMNS), copy=False)
+
+
+def _optional(value):
+    return None if np.isnan(value) else value.item()
+
+
+def to_dataframe(logs):
+    """DataFrame of a TripLog or of a list of log dicts."""
+    if isinstance(logs, TripLog):
+        return logs.to_dataframe()
+    return pd.DataFrame(logs, columns=list(COLUMNS))
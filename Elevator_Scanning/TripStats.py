@@ -0,0 +1,222 @@
+import math
+import numpy as np
+
+METRICS = ("wait_time", "travel_time", "total_time")
+QUANTILES = (0.5, 0.95, 0.99)
+
+
+class RunningStats:
+    """Count, mean, variance (Welford), min and max of a stream of values."""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (x - self.mean)
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+
+    def add_many(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        if values.size:
+            other = RunningStats()
+            other.count = values.size
+            other.mean = float(values.mean())
+            other._m2 = float(((values - other.mean) ** 2).sum())
+            other.min = float(values.min())
+            other.max = float(values.max())
+            self.merge(other)
+
+    def merge(self, other):
+        """Adds the values seen by other (Chan et al. parallel variance)."""
+        if other.count == 0:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self._m2 += other._m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self):
+        """Sample variance, 0 for fewer than two values."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self):
+        return math.sqrt(self.variance)
+
+
+class QuantileSketch:
+    """
+    DDSketch-style quantile sketch: values fall into logarithmic buckets, so
+    every quantile is returned with a relative error of at most
+    relative_accuracy. Values below min_value count as 0. If more than
+    max_buckets are in use, the lowest buckets are merged, which keeps the
+    memory constant and the upper quantiles exact to the accuracy.
+    """
+
+    def __init__(self, relative_accuracy=0.01, min_value=1e-3, max_buckets=2048):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.min_value = min_value
+        self.max_buckets = max_buckets
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def _index(self, x):
+        return math.ceil(math.log(x) / self._log_gamma)
+
+    def add(self, x):
+        self.count += 1
+        if x < self.min_value:
+            self.zero_count += 1
+            return
+        i = self._index(x)
+        self.buckets[i] = self.buckets.get(i, 0) + 1
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def add_many(self, values):
+        values = np.asarray(values, dtype=np.float64)
+        self.count += values.size
+        small = values < self.min_value
+        self.zero_count += int(small.sum())
+        indices = np.ceil(np.log(values[~small]) / self._log_gamma).astype(np.int64)
+        for i, n in zip(*np.unique(indices, return_counts=True)):
+            self.buckets[int(i)] = self.buckets.get(int(i), 0) + int(n)
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def merge(self, other):
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for i, n in other.buckets.items():
+            self.buckets[i] = self.buckets.get(i, 0) + n
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+
+    def _collapse(self):
+        indices = sorted(self.buckets)
+        excess = indices[: len(indices) - self.max_buckets + 1]
+        target = indices[len(excess)]
+        self.buckets[target] += sum(self.buckets.pop(i) for i in excess)
+
+    def quantile(self, q):
+        """Value at quantile q in [0, 1], NaN if nothing was added."""
+        if self.count == 0:
+            return math.nan
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for i in sorted(self.buckets):
+            seen += self.buckets[i]
+            if seen > rank:
+                # Midpoint of the bucket (gamma^(i-1), gamma^i] in relative terms
+                return 2 * self.gamma**i / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+
+class TripStats:
+    """
+    Online statistics of the trips of a run, fed while the simulation runs:
+    running mean and variance, streaming quantiles and hourly buckets for
+    waiting, travel and total time. Memory does not grow with the number of
+    trips (the hourly buckets grow with the simulated hours only).
+    Hours are counted from the time the guest started waiting.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.overall = {metric: RunningStats() for metric in METRICS}
+        self.sketches = {
+            metric: QuantileSketch(relative_accuracy) for metric in METRICS
+        }
+        # hour -> {metric: RunningStats}
+        self.hourly = {}
+
+    def _hour(self, hour):
+        buckets = self.hourly.get(hour)
+        if buckets is None:
+            buckets = self.hourly[hour] = {metric: RunningStats() for metric in METRICS}
+        return buckets
+
+    def _add(self, metric, hour, value):
+        self.overall[metric].add(value)
+        self.sketches[metric].add(value)
+        self._hour(hour)[metric].add(value)
+
+    def add_wait(self, time, wait_time):
+        """A guest started waiting at time and boarded wait_time later."""
+        self._add("wait_time", int(time // 3600), wait_time)
+
+    def add_ride(self, time, wait_time, travel_time):
+        """A guest who started waiting at time arrived after wait_time + travel_time."""
+        hour = int(time // 3600)
+        self._add("travel_time", hour, travel_time)
+        self._add("total_time", hour, wait_time + travel_time)
+
+    def _add_many(self, metric, times, values):
+        values = np.asarray(values, dtype=np.float64)
+        self.overall[metric].add_many(values)
+        self.sketches[metric].add_many(values)
+        hours = (np.asarray(times) // 3600).astype(np.int64)
+        for hour in np.unique(hours):
+            self._hour(int(hour))[metric].add_many(values[hours == hour])
+
+    def add_waits(self, times, wait_times):
+        """add_wait for arrays of trips."""
+        self._add_many("wait_time", times, wait_times)
+
+    def add_rides(self, times, wait_times, travel_times):
+        """add_ride for arrays of trips."""
+        travel_times = np.asarray(travel_times, dtype=np.float64)
+        self._add_many("travel_time", times, travel_times)
+        self._add_many("total_time", times, np.add(wait_times, travel_times))
+
+    def merge(self, other):
+        """Adds the trips of another TripStats, e.g. of a parallel run."""
+        for metric in METRICS:
+            self.overall[metric].merge(other.overall[metric])
+            self.sketches[metric].merge(other.sketches[metric])
+        for hour, buckets in other.hourly.items():
+            mine = self._hour(hour)
+            for metric in METRICS:
+                mine[metric].merge(buckets[metric])
+
+    def quantile(self, metric, q):
+        return self.sketches[metric].quantile(q)
+
+    def summary(self):
+        """Flat dict like {"wait_time_mean": ..., "wait_time_p95": ...}."""
+        result = {}
+        for metric in METRICS:
+            stats = self.overall[metric]
+            result[f"{metric}_count"] = stats.count
+            result[f"{metric}_mean"] = stats.mean if stats.count else math.nan
+            result[f"{metric}_std"] = stats.std
+            for q in QUANTILES:
+                result[f"{metric}_p{round(q * 100)}"] = self.quantile(metric, q)
+        return result
+
+    def hourly_means(self, metric):
+        """(hours, mean per hour, count per hour) of one metric, sorted by hour."""
+        hours = [h for h in sorted(self.hourly) if self.hourly[h][metric].count]
+        return (
+            np.array(hours, dtype=np.int64),
+            np.array([self.hourly[h][metric].mean for h in hours]),
+            np.array([self.hourly[h][metric].count for h in hours], dtype=np.int64),
+        )
@@ -0,0 +1,128 @@
+import os
+import sys
+import json
+import argparse
+import pandas as pd
+import simpy
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from Building import Building
+from Visualization import EpisodeAnalytics
+
+# Same defaults as the settings dialog in Main.py (simulation parameters only)
+DEFAULT_PARAMS = {
+    "num_floors": 10,
+    "num_elevators": 3,
+    "elevator_capacity": 5,
+    "door_time": 4.0,
+    "max_guests": 200,
+    "working_time": 480,
+    "no_floor_zero": "False",
+    "spawn_intervall": 7200,
+    "dispatch": "random",
+}
+
+# Guests whose call gets lost never leave, so a run also ends after one day
+DEFAULT_HORIZON = 24 * 3600
+
+
+def load_config(path):
+    """Reads simulation parameters from a JSON file, e.g. {"num_floors": 12}."""
+    with open(path) as f:
+        config = json.load(f)
+    unknown = set(config) - set(DEFAULT_PARAMS)
+    if unknown:
+        raise ValueError(f"Unknown parameters in {path}: {sorted(unknown)}")
+    return config
+
+
+def run_simulation(seed=None, horizon=DEFAULT_HORIZON, **params):
+    """
+    Runs one SCAN day without pygame at full speed.
+    Returns (building, finished): finished is False if the horizon was hit first.
+    """
+    params = {**DEFAULT_PARAMS, **params}
+    env = simpy.Environment()
+    building = Building(screen=None, env=env, seed=seed, **params)
+    env.run(until=env.any_of([building.stop_event, env.timeout(horizon)]))
+    return building, building.stop_event.triggered
+
+
+def summarize(logs):
+    """
+    Trips and average waiting, ride and total time like
+    Visualization.append_episode_stats (logs: a log or an EpisodeAnalytics).
+    """
+    analytics = EpisodeAnalytics.of(logs)
+    return {
+        "trips": analytics.trips,
+        "avg_wait_time": float(analytics.avg_wait_time),
+        "avg_travel_time": float(analytics.avg_travel_time),
+        "avg_total_time": float(analytics.avg_total_time),
+    }
+
+
+def run_batch(runs, seed=0, horizon=DEFAULT_HORIZON, out_dir=None, **params):
+    """
+    Runs `runs` seeded days (seed, seed + 1, ...) and returns one summary row
+    per run as a DataFrame. With out_dir, every log is written as
+    logs_seed<seed>.csv and the summaries as summary.csv.
+    """
+    if out_dir is not None:
+        os.makedirs(out_dir, exist_ok=True)
+    rows = []
+    for run_seed in range(seed, seed + runs):
+        building, finished = run_simulation(seed=run_seed, horizon=horizon, **params)
+        row = {
+            "seed": run_seed,
+            "finished": finished,
+            "sim_time": building.env.now,
+            "guests_left_building": building.people_left_building,
+            "capacity_exceeded": building.capacity_exceeded,
+            **summarize(building.logs),
+            "p95_wait_time": building.trip_stats.quantile("wait_time", 0.95),
+            "p99_wait_time": building.trip_stats.quantile("wait_time", 0.99),
+        }
+        rows.append(row)
+        if out_dir is not None:
+            building.logs.to_dataframe().to_csv(
+                os.path.join(out_dir, f"logs_seed{run_seed}.csv"), index=False
+            )
+    summary = pd.DataFrame(rows)
+    if out_dir is not None:
+        summary.to_csv(os.path.join(out_dir, "summary.csv"), index=False)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Runs the SCAN baseline headless and prints summary statistics."
+    )
+    parser.add_argument("--runs", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first run")
+    parser.add_argument("--config", help="JSON file with simulation parameters")
+    parser.add_argument("--out", help="directory for logs and summary.csv")
+    parser.add_argument("--horizon", type=float, default=DEFAULT_HORIZON)
+    for name, default in DEFAULT_PARAMS.items():
+        parser.add_argument(f"--{name}", type=type(default))
+    args = parser.parse_args(argv)
+
+    # Arguments override the config file, the config file overrides defaults
+    params = load_config(args.config) if args.config else {}
+    for name in DEFAULT_PARAMS:
+        if getattr(args, name) is not None:
+            params[name] = getattr(args, name)
+
+    summary = run_batch(
+        args.runs, seed=args.seed, horizon=args.horizon, out_dir=args.out, **params
+    )
+    print(summary.to_string(index=False))
+    stats = summary[["avg_wait_time", "avg_travel_time", "avg_total_time"]]
+    print()
+    print(pd.DataFrame({"mean": stats.mean(), "std": stats.std()}).round(2))
+    if not summary["finished"].all():
+        print(f"{(~summary['finished']).sum()} run(s) hit the horizon", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
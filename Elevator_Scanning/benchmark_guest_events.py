@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import numpy as np
+import simpy
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+from Building import Building
+from Guest import Guest
+
+
+class CountingEnvironment(simpy.Environment):
+    """SimPy environment that counts every event put on its heap."""
+
+    def __init__(self):
+        super().__init__()
+        self.event_count = 0
+
+    def schedule(self, event, priority=1, delay=0):
+        self.event_count += 1
+        super().schedule(event, priority, delay)
+
+
+def run_once(per_second, seed, max_guests, spawn_intervall, horizon=24 * 3600):
+    """
+    Runs one day until every guest has left (at most horizon seconds).
+    Returns (events, wall time, guests left, log entries, mean wait).
+    """
+    Guest.PerSecondWork = per_second
+    env = CountingEnvironment()
+    building = Building(
+        screen=None,
+        env=env,
+        door_time=4,
+        max_guests=max_guests,
+        spawn_intervall=spawn_intervall,
+        no_floor_zero="False",
+        seed=seed,
+    )
+    start = time.perf_counter()
+    # Guests whose call gets lost never leave, so stop_event alone may never fire
+    env.run(until=env.any_of([building.stop_event, env.timeout(horizon)]))
+    wall = time.perf_counter() - start
+    waits = building.logs.columns()["wait_time"][
+        building.logs.mode_mask("elevator_waiting")
+    ]
+    return (
+        env.event_count,
+        wall,
+        building.people_left_building,
+        len(building.logs),
+        float(np.mean(waits)),
+    )
+
+
+def main(seeds=3, max_guests=200, spawn_intervall=7200):
+    print(
+        f"{'guest loop':<12}{'seed':>6}{'events':>12}{'wall [s]':>10}{'left':>6}{'logs':>8}"
+        f"{'mean wait':>11}"
+    )
+    totals = {}
+    for per_second in (True, False):
+        name = "per second" if per_second else "scheduled"
+        for seed in range(seeds):
+            events, wall, left, logs, wait = run_once(
+                per_second, seed, max_guests, spawn_intervall
+            )
+            totals.setdefault(name, []).append((events, wall))
+            print(
+                f"{name:<12}{seed:>6}{events:>12}{wall:>10.2f}{left:>6}{logs:>8}{wait:>11.1f}"
+            )
+    before = np.mean(totals["per second"], axis=0)
+    after = np.mean(totals["scheduled"], axis=0)
+    print(
+        f"Events: {before[0] / after[0]:.0f}x fewer, "
+        f"wall time: {before[1] / after[1]:.1f}x faster"
+    )
+    Guest.PerSecondWork = False
+
+
+if __name__ == "__main__":
+    main(seeds=int(sys.argv[1]) if len(sys.argv) > 1 else 3)
@@ -0,0 +1,336 @@
+import os
+import sys
+import io
+import json
+import time
+import argparse
+import platform
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_BASELINE = os.path.join(ROOT, "benchmark_baseline.json")
+
+# A run slower than baseline * (1 + threshold) is a regression
+DEFAULT_THRESHOLD = 0.25
+
+
+def _env_workloads():
+    workloads = {}
+    for num_elevators in (1, 3, 8):
+        for max_guests in (50, 200, 2000):
+            workloads[f"env_e{num_elevators}_g{max_guests}"] = (
+                "env_steps",
+                {"num_elevators": num_elevators, "max_guests": max_guests},
+            )
+    return workloads
+
+
+# Name -> (function, parameters); every workload is seeded, so "check"
+# (trips, events, ...) must match the baseline, otherwise the simulation
+# changed and the times are not comparable
+WORKLOADS = {
+    **_env_workloads(),
+    "scan_default": ("scan_day", {"max_guests": 200, "spawn_intervall": 7200}),
+    "scan_peak": ("scan_day", {"max_guests": 600, "spawn_intervall": 3600}),
+    "model_default": ("model_episode", {"max_guests": 200}),
+    "stats_1m": ("stats_pipeline", {"trips": 1_000_000}),
+}
+
+
+def _use_folder(folder):
+    """Runs in a fresh worker: make the simulator in folder importable."""
+    path = os.path.join(ROOT, folder)
+    sys.path.insert(0, path)
+    os.chdir(path)
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+
+def _best_of(repeat, run):
+    """run() -> (seconds, check); the fastest of repeat runs."""
+    results = [run() for _ in range(repeat)]
+    return min(results, key=lambda result: result[0])
+
+
+def env_steps(repeat, num_elevators, max_guests, steps=20000, seed=0):
+    """
+    MultiElevatorEnv.step with fixed random actions after reset(seed); an
+    episode that ends is reset with the next seed.
+    """
+    _use_folder("Elevator_Reinforcement_Training")
+    from MultiElevatorEnv import MultiElevatorEnv
+
+    env = MultiElevatorEnv(num_elevators=num_elevators, max_guests=max_guests)
+    actions = np.random.default_rng(seed).integers(0, 3, (steps, num_elevators))
+
+    def run():
+        env.reset(seed=seed)
+        trips, episodes = 0, 1
+        start = time.perf_counter()
+        # The env prints a summary when an episode ends
+        with contextlib.redirect_stdout(io.StringIO()):
+            for action in actions:
+                _, _, done, _, _ = env.step(action)
+                if done:
+                    trips += len(env.logs)
+                    env.reset(seed=seed + episodes)
+                    episodes += 1
+        seconds = time.perf_counter() - start
+        return seconds, {"episodes": episodes, "trips": trips + len(env.logs)}
+
+    seconds, check = _best_of(repeat, run)
+    return {
+        "seconds": seconds,
+        "rate": steps / seconds,
+        "unit": "steps/s",
+        "check": check,
+    }
+
+
+def scan_day(repeat, max_guests, spawn_intervall, seed=0, horizon=24 * 3600):
+    """One headless SCAN day; counts the SimPy events."""
+    _use_folder("Elevator_Scanning")
+    from Building import Building
+    from benchmark_guest_events import CountingEnvironment
+
+    def run():
+        env = CountingEnvironment()
+        building = Building(
+            screen=None,
+            env=env,
+            door_time=4,
+            max_guests=max_guests,
+            spawn_intervall=spawn_intervall,
+            no_floor_zero="False",
+            seed=seed,
+        )
+        start = time.perf_counter()
+        env.run(until=env.any_of([building.stop_event, env.timeout(horizon)]))
+        seconds = time.perf_counter() - start
+        return seconds, {"events": env.event_count, "trips": len(building.logs)}
+
+    seconds, check = _best_of(repeat, run)
+    return {
+        "seconds": seconds,
+        "rate": check["events"] / seconds,
+        "unit": "events/s",
+        "check": check,
+    }
+
+
+def model_episode(repeat, max_guests, seed=0):
+    """Building.step of the model simulation driven by the NumPy policy export."""
+    _use_folder("Elevator_Modell_Simulation")
+    import evaluate
+
+    policy = evaluate.load_policy("modell/ppo_elevator_episode_1318.npz")
+
+    def run():
+        start = time.perf_counter()
+        building, _ = evaluate.run_episode(policy, seed=seed, max_guests=max_guests)
+        seconds = time.perf_counter() - start
+        return seconds, {"steps": building.episode_steps, "trips": len(building.logs)}
+
+    seconds, check = _best_of(repeat, run)
+    return {
+        "seconds": seconds,
+        "rate": check["steps"] / seconds,
+        "unit": "steps/s",
+        "check": check,
+    }
+
+
+def stats_pipeline(repeat, trips, seed=0):
+    """
+    Statistics of a large synthetic log: TripLog, EpisodeAnalytics (all
+    hourly aggregates behind the plots), TripStats and batch_run.summarize.
+    """
+    _use_folder("Elevator_Scanning")
+    from TripLog import TripLog
+    from TripStats import TripStats
+    from Visualization import EpisodeAnalytics
+    import batch_run
+
+    rng = np.random.default_rng(seed)
+    start_time = np.sort(rng.random(trips) * 12 * 3600)
+    guest_id = rng.integers(0, trips // 10, trips)
+    wait_time = rng.exponential(45, trips)
+    travel_time = rng.exponential(30, trips)
+
+    def run():
+        start = time.perf_counter()
+        log = TripLog()
+        log.extend(start_time, guest_id, "elevator_waiting", wait_time, None)
+        log.extend(start_time, guest_id, "elevator_drive", wait_time, travel_time)
+        analytics = EpisodeAnalytics(log)
+        stats = TripStats()
+        stats.add_waits(start_time, wait_time)
+        stats.add_rides(start_time, wait_time, travel_time)
+        summary = batch_run.summarize(log)
+        seconds = time.perf_counter() - start
+        check = {
+            "records": len(log),
+            "hours": len(analytics.wait_per_hour[0]),
+            "trips": summary["trips"],
+        }
+        return seconds, check
+
+    seconds, check = _best_of(repeat, run)
+    return {
+        "seconds": seconds,
+        "rate": check["records"] / seconds,
+        "unit": "records/s",
+        "check": check,
+    }
+
+
+def _run_workload(name, repeat):
+    function, params = WORKLOADS[name]
+    return globals()[function](repeat, **params)
+
+
+def run_benchmarks(names, repeat=5):
+    """
+    Runs the workloads one after the other, each in a fresh process (the
+    folders have modules with the same names, and no run warms up the next).
+    Returns {name: {"seconds", "rate", "unit", "check"}}.
+    """
+    results = {}
+    context = multiprocessing.get_context("spawn")
+    for name in names:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            results[name] = pool.submit(_run_workload, name, repeat).result()
+        row = results[name]
+        print(f"{name:<16}{row['seconds']:>9.3f} s{row['rate']:>14.0f} {row['unit']}")
+    return results
+
+
+def machine():
+    return {
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def load_baseline(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_baseline(path, results, threshold=DEFAULT_THRESHOLD):
+    """Writes results as the new baseline; keeps per-workload thresholds of the old one."""
+    thresholds = {}
+    if os.path.exists(path):
+        thresholds = load_baseline(path).get("thresholds", {})
+    with open(path, "w") as f:
+        json.dump(
+            {
+                "machine": machine(),
+                "threshold": threshold,
+                "thresholds": thresholds,
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+
+
+def compare(results, baseline, threshold=None):
+    """
+    One row per workload of results: status "regression" (slower than the
+    baseline by more than the threshold), "faster", "ok", "changed" (the
+    check differs, the workload is not the same any more) or "new".
+    """
+    default = threshold if threshold is not None else baseline.get("threshold")
+    rows = []
+    for name, result in results.items():
+        base = baseline["results"].get(name)
+        limit = baseline.get("thresholds", {}).get(name, default)
+        if limit is None:
+            limit = DEFAULT_THRESHOLD
+        row = {"workload": name, "seconds": result["seconds"], "threshold": limit}
+        if base is None:
+            row.update(baseline_seconds=None, ratio=None, status="new")
+        else:
+            ratio = result["seconds"] / base["seconds"]
+            status = "ok"
+            if result["check"] != base["check"]:
+                status = "changed"
+            elif ratio > 1 + limit:
+                status = "regression"
+            elif ratio < 1 - limit:
+                status = "faster"
+            row.update(baseline_seconds=base["seconds"], ratio=ratio, status=status)
+        rows.append(row)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Times fixed seeded workloads of all simulators against a JSON baseline."
+    )
+    parser.add_argument(
+        "-k", dest="select", help="only workloads whose name contains this"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="best of this many runs")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        help=f"allowed slowdown (default: from the baseline, else {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="write the results as the new baseline"
+    )
+    parser.add_argument("--out", help="also write the results to this JSON file")
+    parser.add_argument("--list", action="store_true", help="only list the workloads")
+    args = parser.parse_args(argv)
+
+    names = [name for name in WORKLOADS if not args.select or args.select in name]
+    if args.list:
+        for name in names:
+            function, params = WORKLOADS[name]
+            print(f"{name:<16}{function} {params}")
+        return
+    results = run_benchmarks(names, repeat=args.repeat)
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"machine": machine(), "results": results}, f, indent=2)
+    if args.save:
+        threshold = args.threshold if args.threshold is not None else DEFAULT_THRESHOLD
+        save_baseline(args.baseline, results, threshold)
+        print(f"Baseline written to {args.baseline}")
+        return
+    if not os.path.exists(args.baseline):
+        print(f"No baseline {args.baseline}, run with --save first", file=sys.stderr)
+        sys.exit(1)
+    baseline = load_baseline(args.baseline)
+    if baseline.get("machine") != machine():
+        print("Baseline was measured on another machine or setup", file=sys.stderr)
+    rows = compare(results, baseline, args.threshold)
+    print()
+    for row in rows:
+        ratio = "" if row["ratio"] is None else f"{row['ratio']:.2f}x"
+        print(f"{row['workload']:<16}{ratio:>8}  {row['status']}")
+    failed = [row["workload"] for row in rows if row["status"] == "regression"]
+    changed = [row["workload"] for row in rows if row["status"] == "changed"]
+    if changed:
+        # A behaviour change could hide a slowdown, so it fails too
+        print(
+            f"Seeded results changed, times not comparable: {', '.join(changed)}"
+            " (check the change, then write a new baseline with --save)",
+            file=sys.stderr,
+        )
+    if failed:
+        print(f"Regressions: {', '.join(failed)}", file=sys.stderr)
+    if changed or failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
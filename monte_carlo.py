@@ -0,0 +1,285 @@
+import os
+import sys
+import json
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from statistics import NormalDist
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Strategy -> folder with its simulator
+STRATEGIES = {
+    "scan": "Elevator_Scanning",
+    "ppo": "Elevator_Modell_Simulation",
+}
+
+# NumPy export of the checkpoint, workers then start without torch
+DEFAULT_MODEL = "modell/ppo_elevator_episode_1318.npz"
+
+# Parameters both simulators understand (defaults of the settings dialogs)
+DEFAULT_PARAMS = {
+    "num_floors": 10,
+    "num_elevators": 3,
+    "max_guests": 200,
+    "working_time": 480,
+    "spawn_intervall": 7200,
+}
+
+DEFAULT_HORIZON = 24 * 3600
+
+METRICS = ["avg_wait_time", "avg_travel_time", "avg_total_time", "p95_wait_time"]
+
+# 97.5 % quantiles of Student's t for 1..30 degrees of freedom
+T_975 = [
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+]  # fmt: skip
+
+# Per worker process: folder of the simulator currently imported, loaded policies
+_current_folder = None
+_policies = {}
+
+
+def _use_folder(folder):
+    """
+    Makes the simulator in folder importable. Both folders have modules with
+    the same names (Building, Guest, ...), so the modules of the other one
+    are dropped first.
+    """
+    global _current_folder
+    if folder == _current_folder:
+        return
+    path = os.path.join(ROOT, folder)
+    others = [os.path.join(ROOT, f) for f in STRATEGIES.values() if f != folder]
+    for name, module in list(sys.modules.items()):
+        module_file = getattr(module, "__file__", None) or ""
+        if any(module_file.startswith(other + os.sep) for other in others):
+            del sys.modules[name]
+    sys.path[:] = [p for p in sys.path if p not in others]
+    sys.path.insert(0, path)
+    # Checkpoints and output directories are relative to the folder
+    os.chdir(path)
+    _current_folder = folder
+
+
+def run_task(strategy, seed, horizon, params, model_path):
+    """
+    Runs one episode of a strategy in this process. Every kind of random
+    decision has its own stream of seed, so both strategies see the same
+    guests.
+    Returns one result row.
+    """
+    _use_folder(STRATEGIES[strategy])
+    start = time.perf_counter()
+    if strategy == "scan":
+        import batch_run
+
+        building, finished = batch_run.run_simulation(
+            seed=seed, horizon=horizon, **params
+        )
+        summary = batch_run.summarize(building.logs)
+        guests_left = building.people_left_building
+    else:
+        import evaluate
+
+        if model_path not in _policies:
+            _policies[model_path] = evaluate.load_policy(model_path)
+        building, finished = evaluate.run_episode(
+            _policies[model_path],
+            seed=seed,
+            horizon=horizon,
+            **params,
+        )
+        summary = evaluate.summarize(building.logs)
+        guests_left = building.guests_left_building
+    return {
+        "strategy": strategy,
+        "seed": seed,
+        "finished": finished,
+        "sim_time": building.env.now,
+        "guests_left_building": guests_left,
+        **summary,
+        "p95_wait_time": building.trip_stats.quantile("wait_time", 0.95),
+        "p99_wait_time": building.trip_stats.quantile("wait_time", 0.99),
+        "wall_time": time.perf_counter() - start,
+    }
+
+
+def confidence_interval(values):
+    """(mean, half width of the 95 % t confidence interval) of a sample."""
+    values = np.asarray(values, dtype=np.float64)
+    values = values[~np.isnan(values)]
+    if values.size == 0:
+        return np.nan, np.nan
+    if values.size == 1:
+        return float(values[0]), np.nan
+    df = values.size - 1
+    t = T_975[df - 1] if df <= len(T_975) else NormalDist().inv_cdf(0.975)
+    return float(values.mean()), float(t * values.std(ddof=1) / np.sqrt(values.size))
+
+
+def _load_done(out, settings):
+    """Rows already in out; refuses to mix results of different settings."""
+    settings_path = out + ".json"
+    if os.path.exists(settings_path):
+        with open(settings_path) as f:
+            previous = json.load(f)
+        if previous != settings:
+            raise ValueError(
+                f"{out} was written with other settings ({previous}), "
+                "use another --out"
+            )
+    else:
+        with open(settings_path, "w") as f:
+            json.dump(settings, f, indent=2)
+    if os.path.exists(out) and os.path.getsize(out) > 0:
+        return pd.read_csv(out)
+    return pd.DataFrame()
+
+
+def run_experiment(
+    episodes=20,
+    seed=0,
+    strategies=tuple(STRATEGIES),
+    out="monte_carlo.csv",
+    workers=None,
+    horizon=DEFAULT_HORIZON,
+    model_path=DEFAULT_MODEL,
+    **params,
+):
+    """
+    Runs `episodes` seeds (seed, seed + 1, ...) for every strategy on a process
+    pool (default: all cores). Every finished episode is appended to the CSV
+    `out` right away; a new call with the same settings skips those episodes,
+    so an interrupted experiment continues where it stopped.
+    Returns all rows of out as a DataFrame.
+    """
+    params = {**DEFAULT_PARAMS, **params}
+    out = os.path.abspath(out)
+    settings = {"horizon": horizon, "model": model_path, "params": params}
+    done = _load_done(out, settings)
+    finished = set()
+    if not done.empty:
+        finished = set(zip(done["strategy"], done["seed"]))
+    # Strategies interleaved per seed, so partial results stay paired
+    tasks = [
+        (strategy, s)
+        for s in range(seed, seed + episodes)
+        for strategy in strategies
+        if (strategy, s) not in finished
+    ]
+    if tasks:
+        print(f"{len(tasks)} episodes to run, {len(finished)} already done")
+        # spawn: every worker starts without simulator modules imported
+        with ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            futures = [
+                pool.submit(run_task, strategy, s, horizon, params, model_path)
+                for strategy, s in tasks
+            ]
+            for i, future in enumerate(as_completed(futures), 1):
+                row = future.result()
+                pd.DataFrame([row]).to_csv(
+                    out,
+                    mode="a",
+                    index=False,
+                    header=not os.path.exists(out) or os.path.getsize(out) == 0,
+                )
+                print(
+                    f"[{i}/{len(tasks)}] {row['strategy']} seed {row['seed']}: "
+                    f"avg wait {row['avg_wait_time']:.1f} s"
+                )
+    results = pd.read_csv(out)
+    selected = results["seed"].between(seed, seed + episodes - 1)
+    return results[selected & results["strategy"].isin(strategies)]
+
+
+def compare(results):
+    """
+    Mean and 95 % confidence interval per strategy and metric, plus the paired
+    difference (first strategy minus second) over seeds both strategies ran.
+    """
+    rows = []
+    for strategy, group in results.groupby("strategy", sort=False):
+        for metric in METRICS:
+            mean, half = confidence_interval(group[metric])
+            rows.append(
+                {
+                    "strategy": strategy,
+                    "metric": metric,
+                    "episodes": len(group),
+                    "mean": mean,
+                    "ci95": half,
+                }
+            )
+    strategies = [s for s in STRATEGIES if s in set(results["strategy"])]
+    if len(strategies) == 2:
+        first, second = (
+            results[results["strategy"] == s].set_index("seed") for s in strategies
+        )
+        seeds = first.index.intersection(second.index)
+        for metric in METRICS:
+            diff = first.loc[seeds, metric] - second.loc[seeds, metric]
+            mean, half = confidence_interval(diff)
+            rows.append(
+                {
+                    "strategy": f"{strategies[0]} - {strategies[1]}",
+                    "metric": metric,
+                    "episodes": len(seeds),
+                    "mean": mean,
+                    "ci95": half,
+                }
+            )
+    return pd.DataFrame(rows)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Compares SCAN and PPO over seeded episodes with common random numbers."
+    )
+    parser.add_argument("--episodes", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first episode")
+    parser.add_argument(
+        "--strategies", nargs="+", choices=list(STRATEGIES), default=list(STRATEGIES)
+    )
+    parser.add_argument(
+        "--out", default="monte_carlo.csv", help="result CSV, also used to resume"
+    )
+    parser.add_argument("--workers", type=int, help="processes (default: all cores)")
+    parser.add_argument("--horizon", type=float, default=DEFAULT_HORIZON)
+    parser.add_argument(
+        "--model",
+        default=DEFAULT_MODEL,
+        help="checkpoint or .npz export, relative to Elevator_Modell_Simulation",
+    )
+    for name, default in DEFAULT_PARAMS.items():
+        parser.add_argument(f"--{name}", type=type(default), default=default)
+    args = parser.parse_args(argv)
+
+    results = run_experiment(
+        episodes=args.episodes,
+        seed=args.seed,
+        strategies=args.strategies,
+        out=args.out,
+        workers=args.workers,
+        horizon=args.horizon,
+        model_path=args.model,
+        **{name: getattr(args, name) for name in DEFAULT_PARAMS},
+    )
+    print(compare(results).round(2).to_string(index=False))
+    if not results["finished"].all():
+        print(
+            f"{(~results['finished']).sum()} episode(s) hit the horizon",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()
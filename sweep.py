@@ -0,0 +1,255 @@
+import os
+import sys
+import glob
+import json
+import hashlib
+import argparse
+import itertools
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
+import pandas as pd
+from monte_carlo import STRATEGIES, DEFAULT_MODEL, DEFAULT_HORIZON, run_task
+
+# Building parameters a sweep can vary, with their defaults (settings dialog)
+SWEEP_PARAMS = {
+    "num_floors": 10,
+    "num_elevators": 3,
+    "elevator_capacity": 5,
+    "door_time": 4.0,
+    "max_guests": 200,
+    "spawn_intervall": 7200,
+    "dispatch": "random",
+}
+
+# The model simulation always uses the trained capacity and door time, and
+# the policy sees at most 10 floors; dispatch is the SCAN dispatch strategy
+PPO_FIXED = ("elevator_capacity", "door_time", "dispatch")
+PPO_MAX_FLOORS = 10
+
+
+def grid_configs(grid):
+    """All combinations of {"param": [values, ...]}."""
+    names = list(grid)
+    return [dict(zip(names, values)) for values in itertools.product(*grid.values())]
+
+
+def lhs_configs(ranges, samples, seed=0):
+    """
+    Latin hypercube sample of {"param": [low, high]}: every parameter range is
+    cut into `samples` equal strata and each stratum is used exactly once.
+    Integer parameters (integer default) are rounded.
+    """
+    rng = np.random.default_rng(seed)
+    columns = {}
+    for name, (low, high) in ranges.items():
+        strata = (rng.permutation(samples) + rng.random(samples)) / samples
+        values = low + strata * (high - low)
+        if isinstance(SWEEP_PARAMS[name], int):
+            values = np.rint(values).astype(int)
+        columns[name] = values.tolist()
+    return [{name: columns[name][i] for name in ranges} for i in range(samples)]
+
+
+def load_spec(path):
+    """
+    Reads a sweep spec, e.g.
+    {"strategy": "scan", "seeds": 3, "fixed": {"max_guests": 100},
+     "grid": {"num_elevators": [2, 3, 4], "elevator_capacity": [5, 8]}}
+    or with "lhs": {"samples": 200, "seed": 0, "ranges": {"door_time": [2, 8]}}.
+    """
+    with open(path) as f:
+        return json.load(f)
+
+
+def expand_spec(spec):
+    """List of (strategy, params, seed) runs of a spec."""
+    strategy = spec.get("strategy", "scan")
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy {strategy!r}")
+    if "grid" in spec:
+        configs = grid_configs(spec["grid"])
+    elif "lhs" in spec:
+        lhs = spec["lhs"]
+        configs = lhs_configs(lhs["ranges"], lhs["samples"], lhs.get("seed", 0))
+    else:
+        configs = [{}]
+    first_seed = spec.get("first_seed", 0)
+    runs = []
+    for config in configs:
+        params = {**SWEEP_PARAMS, **spec.get("fixed", {}), **config}
+        unknown = set(params) - set(SWEEP_PARAMS)
+        if unknown:
+            raise ValueError(f"Unknown parameters: {sorted(unknown)}")
+        if strategy == "ppo":
+            for name in PPO_FIXED:
+                if params[name] != SWEEP_PARAMS[name]:
+                    raise ValueError(f"The model simulation cannot vary {name}")
+                del params[name]
+            if params["num_floors"] > PPO_MAX_FLOORS:
+                raise ValueError(f"The policy supports at most {PPO_MAX_FLOORS} floors")
+        for seed in range(first_seed, first_seed + spec.get("seeds", 1)):
+            runs.append((strategy, params, seed))
+    return runs
+
+
+def run_key(strategy, params, seed, horizon, model_path):
+    """Stable id of one run, used to skip runs that are already stored."""
+    description = {
+        "strategy": strategy,
+        "params": params,
+        "seed": seed,
+        "horizon": horizon,
+        "model": model_path if strategy == "ppo" else None,
+    }
+    text = json.dumps(description, sort_keys=True)
+    return hashlib.sha1(text.encode()).hexdigest()[:16]
+
+
+class ResultStore:
+    """
+    Columnar result store: a directory of NPZ parts, one column per array.
+    Parts are written atomically and never changed, so an interrupted sweep
+    loses at most the rows that were not flushed yet.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+
+    def _parts(self):
+        return sorted(glob.glob(os.path.join(self.path, "part-*.npz")))
+
+    def keys(self):
+        keys = set()
+        for part in self._parts():
+            with np.load(part) as data:
+                keys.update(data["key"].tolist())
+        return keys
+
+    def append(self, rows):
+        if not rows:
+            return
+        df = pd.DataFrame(rows)
+        columns = {}
+        for name in df.columns:
+            values = df[name].to_numpy()
+            if values.dtype == object:
+                values = values.astype(str)
+            columns[name] = values
+        index = len(self._parts())
+        while os.path.exists(os.path.join(self.path, f"part-{index:05d}.npz")):
+            index += 1
+        target = os.path.join(self.path, f"part-{index:05d}.npz")
+        tmp = target + ".tmp.npz"
+        np.savez(tmp, **columns)
+        os.replace(tmp, target)
+
+    def to_dataframe(self):
+        frames = []
+        for part in self._parts():
+            with np.load(part) as data:
+                frames.append(pd.DataFrame({name: data[name] for name in data.files}))
+        if not frames:
+            return pd.DataFrame()
+        return pd.concat(frames, ignore_index=True)
+
+
+def run_sweep(
+    spec,
+    out="sweep_results",
+    workers=None,
+    horizon=DEFAULT_HORIZON,
+    model_path=DEFAULT_MODEL,
+    flush_every=16,
+):
+    """
+    Runs every configuration and seed of spec on a process pool (default: all
+    cores) and stores one row per run in the ResultStore out. Runs whose key
+    is already stored are skipped. Returns the rows of this spec as a DataFrame.
+    """
+    store = ResultStore(out)
+    runs = expand_spec(spec)
+    keyed = [
+        (run_key(strategy, params, seed, horizon, model_path), strategy, params, seed)
+        for strategy, params, seed in runs
+    ]
+    done = store.keys()
+    todo = [run for run in keyed if run[0] not in done]
+    print(f"{len(todo)} of {len(keyed)} runs to do")
+    if todo:
+        pending = []
+        # spawn: every worker starts without simulator modules imported
+        with ProcessPoolExecutor(
+            max_workers=workers or os.cpu_count(),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            futures = {}
+            for key, strategy, params, seed in todo:
+                future = pool.submit(
+                    run_task, strategy, seed, horizon, params, model_path
+                )
+                futures[future] = (key, params)
+            try:
+                for i, future in enumerate(as_completed(futures), 1):
+                    key, params = futures[future]
+                    pending.append({"key": key, **params, **future.result()})
+                    if len(pending) >= flush_every:
+                        store.append(pending)
+                        pending = []
+                    print(f"[{i}/{len(todo)}] {params}")
+            finally:
+                store.append(pending)
+    keys = {key for key, _, _, _ in keyed}
+    results = store.to_dataframe()
+    return results[results["key"].isin(keys)].reset_index(drop=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Runs grid or Latin-hypercube sweeps over building configurations."
+    )
+    parser.add_argument("spec", help="JSON sweep spec (see load_spec)")
+    parser.add_argument("--out", default="sweep_results", help="result store directory")
+    parser.add_argument("--workers", type=int, help="processes (default: all cores)")
+    parser.add_argument("--horizon", type=float, default=DEFAULT_HORIZON)
+    parser.add_argument(
+        "--model", default=DEFAULT_MODEL, help="policy for strategy ppo"
+    )
+    parser.add_argument(
+        "--dry-run", action="store_true", help="only list the configurations"
+    )
+    args = parser.parse_args(argv)
+
+    spec = load_spec(args.spec)
+    if args.dry_run:
+        runs = expand_spec(spec)
+        print(pd.DataFrame([{**params, "seed": seed} for _, params, seed in runs]))
+        return
+    results = run_sweep(
+        spec,
+        out=args.out,
+        workers=args.workers,
+        horizon=args.horizon,
+        model_path=args.model,
+    )
+    # Parameters a policy does not use are NaN in its rows (e.g. dispatch for
+    # ppo); keep those rows and leave out parameters no row has
+    names = [
+        name
+        for name in SWEEP_PARAMS
+        if name in results.columns and results[name].notna().any()
+    ]
+    table = results.groupby(names, dropna=False)[
+        ["avg_wait_time", "avg_total_time", "p95_wait_time", "finished"]
+    ].mean()
+    print(table.round(2).to_string())
+    if not results["finished"].all():
+        print(
+            f"{(~results['finished'].astype(bool)).sum()} run(s) hit the horizon",
+            file=sys.stderr,
+        )
+
+
+if __name__ == "__main__":
+    main()